@@ -12,7 +12,17 @@ from ...core.config import settings
 from ...core.log_buffer import get_log_items
 from ...db.models import ConversionJob, Plan, User, PaymentOrder, PlanAssignment
 from ._payment_utils import compute_subscription_expiry
-from ...utils.files import which
+from ...services.cache.result_cache import get_result_cache
+from ...services.pdf.adobe_client import adobe_client_stats
+from ...services.pdf.adobe_runner import adobe_runner_stats
+from ...services.pdf.aspose_fonts import font_settings_stats
+from ...services.pdf.aspose_pool import aspose_pool_stats
+from ...services.pdf.circuit_breaker import breaker_stats
+from ...services.pdf.hedging import hedge_stats
+from ...services.pdf.libreoffice_pool import libreoffice_pool_stats
+from ...services.pdf.routing import get_engine_router, routing_table
+from ...services.pdf.toolchain import get_toolchain
+from ...utils.cpu_slots import cpu_slot_stats
 
 # Protect the entire admin router by default.
 router = APIRouter(
@@ -524,13 +534,8 @@ def system_status(request: Request, db: Session = Depends(get_db)):
 
     users_count = db.query(User).count()
 
-    # Conversion tool availability (same logic as /health/conversion)
-    soffice = (
-        which("soffice.com", settings.libreoffice_path)
-        or which("soffice.exe", settings.libreoffice_path)
-        or which("soffice", settings.libreoffice_path)
-    )
-    ocrmypdf = which("ocrmypdf", settings.ocrmypdf_path)
+    # Conversion tool availability (cached toolchain probe, same as /health/conversion)
+    toolchain = get_toolchain()
 
     started_at = getattr(request.app.state, "started_at", None)
 
@@ -543,19 +548,53 @@ def system_status(request: Request, db: Session = Depends(get_db)):
         conversion={
             "prefer_editable": settings.prefer_editable,
             "libreoffice": {
-                "available": bool(soffice),
-                "resolved_path": soffice,
+                "available": bool(toolchain.soffice),
+                "resolved_path": toolchain.soffice,
+                "pool": libreoffice_pool_stats(),
             },
             "ocr": {
                 "enabled": settings.ocr_enabled,
-                "available": bool(ocrmypdf),
-                "resolved_ocrmypdf": ocrmypdf,
+                "available": bool(toolchain.ocrmypdf),
+                "resolved_ocrmypdf": toolchain.ocrmypdf,
                 "lang": settings.ocr_lang,
             },
+            "toolchain_probed_at": toolchain.probed_at.isoformat(),
+            "aspose_pool": aspose_pool_stats(),
+            # In-process Aspose font settings (only used when ASPOSE_POOL_SIZE=0).
+            "aspose_fonts": font_settings_stats(),
+            "result_cache": get_result_cache().stats(),
+            "adobe_client": adobe_client_stats(),
+            "adobe_runner": adobe_runner_stats(),
+            "cpu_slots": cpu_slot_stats(),
+            "breakers": breaker_stats(),
+            "hedging": hedge_stats(),
         },
     )
 
 
+class RoutingOverrideRequest(BaseModel):
+    # A bucket from the routing table ("1-4|text|digital", ...) or "*" for every bucket.
+    bucket: str = "*"
+    # Engines to try first, e.g. ["aspose", "adobe"]; null/empty removes the override.
+    order: list[str] | None = None
+
+
+@router.get("/routing")
+def get_routing():
+    """Current Tier A routing table: per-bucket engine models, chosen order and overrides."""
+
+    return routing_table()
+
+
+@router.put("/routing")
+def override_routing(body: RoutingOverrideRequest):
+    try:
+        get_engine_router().set_override(body.bucket.strip(), body.order)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    return routing_table()
+
+
 class SystemLogItemResponse(BaseModel):
     id: int
     time: str
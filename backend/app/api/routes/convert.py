@@ -8,9 +8,11 @@ from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPExcepti
 from fastapi.responses import FileResponse, JSONResponse
 from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
+import hashlib
+import json
 import shutil
 import os
-from ..db.session import SessionLocal
+from ...db.session import SessionLocal
 from fastapi.concurrency import run_in_threadpool  # run heavy sync tasks without blocking the event loop
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
@@ -18,22 +20,54 @@ from sqlalchemy.orm import Session
 from ..deps import get_db
 from ..deps import get_current_user, get_optional_user
 from ...core.config import settings
+from ...services.cache.result_cache import get_result_cache
 from ...services.image.jpg_to_png import JpgToPngError, convert_jpg_to_png
 from ...services.pdf.libreoffice import LibreOfficeConvertError, LibreOfficeNotFoundError, convert_word_to_pdf
-from ...services.pdf.pipeline import EditableConversionUnavailable, convert_pdf_to_docx_pipeline
+from ...services.pdf.docx_optimize import OUTPUT_PROFILES
+from ...services.pdf.pipeline import EditableConversionUnavailable, convert_pdf_to_docx_optimized
+from ...services.pdf.routing import RoutingTrace, tier_a_engines, track_routing
+from ...services.pdf.stages import StageTrace, track_stages
+from ...services.pdf.toolchain import get_toolchain
 from ...db.models import ConversionJob, Plan, User
+from ...utils.cpu_slots import cpu_slot
 from ...utils.files import make_work_dir, remove_tree, safe_filename
 
 router = APIRouter()
 
-# In-process conversion executor and bookkeeping
-CONVERSION_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.environ.get("CONVERSION_WORKERS", "2")))
+# In-process conversion executor and bookkeeping.
+# Threads are cheap here: local engine work is bounded by CPU slots (CONVERSION_WORKERS),
+# and jobs waiting on Adobe don't hold one.
+CONVERSION_EXECUTOR = ThreadPoolExecutor(max_workers=max(settings.conversion_threads, settings.conversion_workers, 1))
 JOB_FUTURES: dict[int, "concurrent.futures.Future"] = {}
 JOB_FUTURES_LOCK = Lock()
 RESULT_DIR = Path(os.environ.get("CONVERT_RESULT_DIR", "/tmp/convert_results"))
 RESULT_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _store_routing_trace(job: ConversionJob, trace: RoutingTrace) -> None:
+    """Persist the document features and Tier A attempts the engine router learns from."""
+
+    job.page_count = trace.page_count
+    job.is_scanned = None if trace.is_scanned is None else (1 if trace.is_scanned else 0)
+    job.engine = trace.engine
+    job.engine_attempts_json = trace.attempts_json()
+
+
+def _cacheable(trace: RoutingTrace) -> bool:
+    """Whether a pdf-word result may be served to later uploads of the same PDF.
+
+    Only output of the first-choice Tier A engine that passed the quality gates is
+    cached. Fallbacks (image-only Tier B, text-only DOCX, a local hedge or engine that
+    ran because Adobe failed or its breaker was open) reflect an outage at the time and
+    would keep being served after it recovers.
+    """
+
+    toolchain = get_toolchain()
+    installed = {"adobe": True, "aspose": toolchain.aspose_words, "pdf2docx": toolchain.pdf2docx}
+    first_choice = next((e for e in tier_a_engines() if installed[e]), None)
+    return first_choice is not None and trace.engine == first_choice
+
+
 @router.get("/convert/usage")
 def get_my_usage(
     current_user: User = Depends(get_current_user),
@@ -225,6 +259,7 @@ async def convert(
     file: UploadFile = File(...),
     type: str = Form(...),
     mode: str | None = Form(None),
+    output_profile: str | None = Form(None),
     current_user: User | None = Depends(get_optional_user),
     db: Session = Depends(get_db),
 ):
@@ -349,6 +384,7 @@ async def convert(
 
         max_bytes = settings.max_upload_mb * 1024 * 1024
         size = 0
+        hasher = hashlib.sha256()
         try:
             with in_pdf.open("wb") as f:
                 while True:
@@ -361,6 +397,7 @@ async def convert(
                             status_code=413,
                             detail=f"File too large. Max {settings.max_upload_mb}MB",
                         )
+                    hasher.update(chunk)
                     f.write(chunk)
         finally:
             await file.close()
@@ -385,6 +422,10 @@ async def convert(
             if mode == "ocr" and not bool(settings.adobe_client_id and settings.adobe_client_secret):
                 raise HTTPException(status_code=503, detail="Chế độ OCR yêu cầu Adobe PDF Services được cấu hình trên server")
 
+            profile = output_profile or "standard"
+            if profile not in OUTPUT_PROFILES:
+                raise HTTPException(status_code=400, detail=f"Unsupported output_profile: {output_profile}")
+
             prefer_tier_a = False
             force_ocr = False
             if mode and mode.startswith("tier-a"):
@@ -394,29 +435,57 @@ async def convert(
                 # User explicitly requested OCR-first local processing
                 force_ocr = True
 
+            # Same input + tool + mode + engine settings => serve the cached artifact.
+            cache_key: str | None = None
+            if settings.result_cache_enabled:
+                cache = get_result_cache()
+                cache_key = cache.make_key(sha256=hasher.hexdigest(), tool_type=type, mode=mode, profile=profile)
+                cached = cache.get(cache_key, RESULT_DIR / f"{job.id}.docx")
+                if cached is not None:
+                    try:
+                        job.status = "completed"
+                        job.mode = cached.mode
+                        job.has_text_layer = 1 if cached.has_text_layer else 0
+                        job.finished_at = datetime.now(timezone.utc)
+                        job.duration_ms = int((time.perf_counter() - t0) * 1000)
+                        db.add(job)
+                        db.commit()
+                    except Exception:
+                        db.rollback()
+                    return JSONResponse(status_code=202, content={"job_id": job.id}, headers={"Location": f"/convert/status/{job.id}"})
+
             # --- NEW: schedule conversion as an asynchronous job in the executor ---
-            def _run_job(job_id: int, in_pdf_path: str, work_dir_path: str, prefer_tier_a: bool, force_ocr: bool, user_id: int | None, client_ip: str | None):
+            def _run_job(job_id: int, in_pdf_path: str, work_dir_path: str, prefer_tier_a: bool, force_ocr: bool, output_profile: str, user_id: int | None, client_ip: str | None, cache_key: str | None):
                 # Each thread creates its own DB session
                 db = SessionLocal()
                 t0_inner = time.perf_counter()
+                trace = RoutingTrace()
+                stages = StageTrace()
                 try:
                     # Re-fetch job inside thread/session
                     job_inner = db.get(ConversionJob, job_id)
 
                     # Use the pipeline (sync) inside the worker thread
-                    result = convert_pdf_to_docx_pipeline(
-                        pdf_path=Path(in_pdf_path),
-                        work_dir=Path(work_dir_path),
-                        prefer_tier_a=prefer_tier_a,
-                        force_ocr=force_ocr,
-                    )
+                    with cpu_slot(), track_routing() as trace, track_stages() as stages:
+                        result = convert_pdf_to_docx_optimized(
+                            pdf_path=Path(in_pdf_path),
+                            work_dir=Path(work_dir_path),
+                            prefer_tier_a=prefer_tier_a,
+                            force_ocr=force_ocr,
+                            output_profile=output_profile,
+                        )
 
                     # Move docx to a shared results folder
                     dest = RESULT_DIR / f"{job_id}.docx"
                     shutil.copy(result.docx_path, dest)
+                    if cache_key and _cacheable(trace):
+                        get_result_cache().put(cache_key, dest, mode=result.mode, has_text_layer=result.has_text_layer)
 
                     job_inner.mode = result.mode
                     job_inner.has_text_layer = 1 if result.has_text_layer else 0
+                    job_inner.output_bytes_saved = result.bytes_saved
+                    _store_routing_trace(job_inner, trace)
+                    job_inner.stages_json = stages.stages_json()
                     job_inner.finished_at = datetime.now(timezone.utc)
                     job_inner.duration_ms = int((time.perf_counter() - t0_inner) * 1000)
                     job_inner.status = "completed"
@@ -427,6 +496,8 @@ async def convert(
                         job_inner = db.get(ConversionJob, job_id)
                         job_inner.status = "failed"
                         job_inner.error = str(e)
+                        _store_routing_trace(job_inner, trace)
+                        job_inner.stages_json = stages.stages_json()
                         job_inner.finished_at = datetime.now(timezone.utc)
                         job_inner.duration_ms = int((time.perf_counter() - t0_inner) * 1000)
                         db.add(job_inner)
@@ -446,8 +517,10 @@ async def convert(
                 str(work_dir),
                 prefer_tier_a,
                 force_ocr,
+                profile,
                 (current_user.id if current_user else None),
                 getattr(getattr(request, 'client', None), 'host', None),
+                cache_key,
             )
             with JOB_FUTURES_LOCK:
                 JOB_FUTURES[job.id] = future
@@ -542,6 +615,7 @@ async def convert(
 
         max_bytes = settings.max_upload_mb * 1024 * 1024
         size = 0
+        hasher = hashlib.sha256()
         try:
             with in_jpg.open("wb") as f:
                 while True:
@@ -554,6 +628,7 @@ async def convert(
                             status_code=413,
                             detail=f"File too large. Max {settings.max_upload_mb}MB",
                         )
+                    hasher.update(chunk)
                     f.write(chunk)
         finally:
             await file.close()
@@ -565,6 +640,31 @@ async def convert(
         except Exception:
             db.rollback()
 
+        cache_key: str | None = None
+        if settings.result_cache_enabled:
+            cache = get_result_cache()
+            cache_key = cache.make_key(sha256=hasher.hexdigest(), tool_type=type, mode="pillow")
+            cached = cache.get(cache_key, Path(work_dir) / "cache" / "result.png")
+            if cached is not None:
+                try:
+                    job.status = "completed"
+                    job.mode = "pillow"
+                    job.finished_at = datetime.now(timezone.utc)
+                    job.duration_ms = int((time.perf_counter() - t0) * 1000)
+                    db.add(job)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                return FileResponse(
+                    path=str(cached.path),
+                    media_type="image/png",
+                    filename=safe_filename(Path(filename).stem, fallback="image") + ".png",
+                    headers={
+                        "X-Conversion-Mode": "pillow",
+                        "X-Conversion-Cache": "hit",
+                    },
+                )
+
         try:
             result = convert_jpg_to_png(jpg_path=in_jpg, out_dir=Path(work_dir) / "image")
         except JpgToPngError as e:
@@ -590,6 +690,9 @@ async def convert(
                 db.rollback()
             raise HTTPException(status_code=500, detail=str(e)) from e
 
+        if cache_key:
+            get_result_cache().put(cache_key, result.png_path, mode="pillow")
+
         try:
             job.status = "completed"
             job.mode = "pillow"
@@ -616,7 +719,9 @@ async def convert(
         if not (lower.endswith(".doc") or lower.endswith(".docx")):
             raise HTTPException(status_code=400, detail="Only .doc/.docx is supported for word-pdf")
 
-        if not settings.libreoffice_path:
+        # LIBREOFFICE_PATH (binary or install directory) or soffice on PATH.
+        soffice_path = get_toolchain().soffice
+        if not soffice_path:
             raise HTTPException(status_code=503, detail="LibreOffice is not configured on the server")
 
         job = ConversionJob(
@@ -638,6 +743,7 @@ async def convert(
 
         max_bytes = settings.max_upload_mb * 1024 * 1024
         size = 0
+        hasher = hashlib.sha256()
         try:
             with in_word.open("wb") as f:
                 while True:
@@ -650,6 +756,7 @@ async def convert(
                             status_code=413,
                             detail=f"File too large. Max {settings.max_upload_mb}MB",
                         )
+                    hasher.update(chunk)
                     f.write(chunk)
         finally:
             await file.close()
@@ -661,12 +768,37 @@ async def convert(
         except Exception:
             db.rollback()
 
+        cache_key: str | None = None
+        if settings.result_cache_enabled:
+            cache = get_result_cache()
+            cache_key = cache.make_key(sha256=hasher.hexdigest(), tool_type=type, mode="libreoffice")
+            cached = cache.get(cache_key, Path(work_dir) / "cache" / "result.pdf")
+            if cached is not None:
+                try:
+                    job.status = "completed"
+                    job.mode = "libreoffice"
+                    job.finished_at = datetime.now(timezone.utc)
+                    job.duration_ms = int((time.perf_counter() - t0) * 1000)
+                    db.add(job)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                return FileResponse(
+                    path=str(cached.path),
+                    media_type="application/pdf",
+                    filename=safe_filename(Path(filename).stem, fallback="document") + ".pdf",
+                    headers={
+                        "X-Conversion-Mode": "libreoffice",
+                        "X-Conversion-Cache": "hit",
+                    },
+                )
+
         try:
             out_dir = Path(work_dir) / "pdf"
             result_pdf = convert_word_to_pdf(
                 word_path=in_word,
                 out_dir=out_dir,
-                soffice_path=settings.libreoffice_path,
+                soffice_path=soffice_path,
                 timeout_sec=settings.conversion_timeout_sec,
                 user_install_dir=Path(work_dir) / "lo-profile",
             )
@@ -704,6 +836,9 @@ async def convert(
                 db.rollback()
             raise HTTPException(status_code=500, detail=str(e)) from e
 
+        if cache_key:
+            get_result_cache().put(cache_key, result_pdf, mode="libreoffice")
+
         try:
             job.status = "completed"
             job.mode = "libreoffice"
@@ -728,7 +863,11 @@ async def convert(
 
 
 @router.get("/convert/status/{job_id}")
-def get_convert_status(job_id: int, db: Session = Depends(get_db)):
+def get_convert_status(
+    job_id: int,
+    current_user: User | None = Depends(get_optional_user),
+    db: Session = Depends(get_db),
+):
     job = db.get(ConversionJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -737,16 +876,26 @@ def get_convert_status(job_id: int, db: Session = Depends(get_db)):
     if result_path.exists() and job.status == "completed":
         result_url = f"/convert/result/{job.id}"
 
-    return {
+    status = {
         "id": job.id,
         "status": job.status,
         "mode": job.mode,
         "has_text_layer": bool(job.has_text_layer),
+        "output_bytes_saved": job.output_bytes_saved,
         "error": job.error,
         "created_at": job.created_at.isoformat() if job.created_at else None,
         "finished_at": job.finished_at.isoformat() if job.finished_at else None,
         "result_url": result_url,
     }
+    if current_user is not None and current_user.role == "admin":
+        # Where the time went: engine attempts and per-stage timings (admins only).
+        status.update(
+            duration_ms=job.duration_ms,
+            engine=job.engine,
+            engine_attempts=json.loads(job.engine_attempts_json) if job.engine_attempts_json else None,
+            stages=json.loads(job.stages_json) if job.stages_json else None,
+        )
+    return status
 
 
 @router.get("/convert/result/{job_id}")
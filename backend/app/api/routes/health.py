@@ -3,55 +3,20 @@ from __future__ import annotations
 from fastapi import APIRouter
 
 from ...core.config import settings
-from ...utils.files import which
+from ...services.pdf.toolchain import get_toolchain
 
 router = APIRouter(prefix="/health", tags=["health"])
 
 
 @router.get("/conversion")
 def conversion_health():
-    soffice = (
-        which("soffice.com", settings.libreoffice_path)
-        or which("soffice.exe", settings.libreoffice_path)
-        or which("soffice", settings.libreoffice_path)
-    )
-
-    ocrmypdf = which("ocrmypdf", settings.ocrmypdf_path)
-
-    try:
-        import fitz  # noqa: F401
-
-        pymupdf_available = True
-    except Exception:  # noqa: BLE001
-        pymupdf_available = False
-
-    try:
-        import pdf2docx  # noqa: F401
-
-        pdf2docx_available = True
-    except Exception:  # noqa: BLE001
-        pdf2docx_available = False
-
-    try:
-        import aspose.words  # noqa: F401
-
-        aspose_words_available = True
-    except Exception:  # noqa: BLE001
-        aspose_words_available = False
-
-    try:
-        import httpx  # noqa: F401
-
-        httpx_available = True
-    except Exception:  # noqa: BLE001
-        httpx_available = False
-
-
-    # Ghostscript (gs) is required by ocrmypdf on Windows and for PDF raster ops
-    gs = which("gs") or which("gswin64c") or which("gswin32c")
-    tesseract = which("tesseract", settings.tesseract_path)
-
-    ocr_available = bool(ocrmypdf and tesseract and gs)
+    # Served from the cached toolchain probe: no subprocesses or engine imports per request.
+    toolchain = get_toolchain()
+    soffice = toolchain.soffice
+    ocrmypdf = toolchain.ocrmypdf
+    gs = toolchain.ghostscript
+    tesseract = toolchain.tesseract
+    ocr_available = toolchain.ocr_available
 
     ocr_hints = []
     if not ocrmypdf:
@@ -62,23 +27,25 @@ def conversion_health():
         ocr_hints.append("Ghostscript (gs) not found on PATH. On Windows: 'choco install ghostscript' or install from https://www.ghostscript.com/download/gsdnld.html")
 
     return {
+        "toolchain_probed_at": toolchain.probed_at.isoformat(),
         "prefer_editable": settings.prefer_editable,
         "adobe_pdf_services": {
             "configured": bool(settings.adobe_client_id and settings.adobe_client_secret),
             "base_url": settings.adobe_base_url,
             "ocr_lang": settings.adobe_ocr_lang,
-            "httpx_available": httpx_available,
+            "httpx_available": toolchain.httpx,
         },
         "pdf2docx": {
-            "available": pdf2docx_available,
-            "pymupdf_available": pymupdf_available,
+            "available": toolchain.pdf2docx,
+            "pymupdf_available": toolchain.pymupdf,
         },
         "aspose_words": {
-            "available": aspose_words_available,
+            "available": toolchain.aspose_words,
         },
         "libreoffice": {
             "configured_path": settings.libreoffice_path,
             "resolved_path": soffice,
+            "version": toolchain.soffice_version,
             "available": bool(soffice),
         },
         "ocr": {
@@ -87,6 +54,9 @@ def conversion_health():
             "resolved_ocrmypdf": ocrmypdf,
             "resolved_tesseract": tesseract,
             "resolved_ghostscript": gs,
+            "ocrmypdf_version": toolchain.ocrmypdf_version,
+            "tesseract_version": toolchain.tesseract_version,
+            "tesseract_langs": sorted(toolchain.tesseract_langs),
             "available": ocr_available,
             "hints": ocr_hints,
         },
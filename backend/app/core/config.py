@@ -34,6 +34,20 @@ class Settings:
     # PDF_MAX_PAGES=0 means no limit (convert all pages).
     max_pages: int = int(os.getenv("PDF_MAX_PAGES", "300"))
     prefer_editable: bool = os.getenv("PREFER_EDITABLE", "true").lower() in ("1", "true", "yes")
+    # CONVERSION_WORKERS bounds jobs running local engines at once (CPU slots); jobs waiting
+    # on Adobe give their slot back, so up to CONVERSION_THREADS jobs can be in flight.
+    conversion_workers: int = int(os.getenv("CONVERSION_WORKERS", "2"))
+    conversion_threads: int = int(os.getenv("CONVERSION_THREADS", "32"))
+
+    # DOCX output slimming (media dedup + image downsampling; "lightweight" also drops embedded fonts).
+    docx_optimize_enabled: bool = os.getenv("DOCX_OPTIMIZE_ENABLED", "true").lower() in ("1", "true", "yes")
+    docx_target_dpi: int = int(os.getenv("DOCX_TARGET_DPI", "220"))
+    docx_lightweight_dpi: int = int(os.getenv("DOCX_LIGHTWEIGHT_DPI", "150"))
+
+    # Content-addressed cache of conversion results (same input + tool + mode => reuse).
+    result_cache_enabled: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    result_cache_dir: str = os.getenv("RESULT_CACHE_DIR", "/tmp/convert_cache")
+    result_cache_max_mb: int = int(os.getenv("RESULT_CACHE_MAX_MB", "1024"))
 
     # Free plan gating (server-side source of truth)
     # Comma-separated tool keys: pdf-word,jpg-png,word-pdf
@@ -49,9 +63,96 @@ class Settings:
     adobe_poll_interval_ms: int = int(os.getenv("ADOBE_POLL_INTERVAL_MS", "1500"))
     # OCR language (Adobe expects locale-style strings like vi-VN, en-US)
     adobe_ocr_lang: str = os.getenv("ADOBE_OCR_LANG", "vi-VN")
+    # One pooled HTTP client per process; the token is renewed this long before it expires.
+    adobe_max_connections: int = int(os.getenv("ADOBE_MAX_CONNECTIONS", "20"))
+    adobe_token_renew_margin_sec: int = int(os.getenv("ADOBE_TOKEN_RENEW_MARGIN_SEC", "300"))
+    # Job status polling backs off from ADOBE_POLL_INTERVAL_MS up to this interval.
+    adobe_poll_max_interval_ms: int = int(os.getenv("ADOBE_POLL_MAX_INTERVAL_MS", "10000"))
+    # Outbound limits: export jobs in flight (others queue without holding a CPU slot),
+    # API calls per second (token bucket; 0 => unlimited) and retries after a 429.
+    adobe_max_inflight: int = int(os.getenv("ADOBE_MAX_INFLIGHT", "10"))
+    adobe_queue_timeout_sec: int = int(os.getenv("ADOBE_QUEUE_TIMEOUT_SEC", "120"))
+    adobe_rate_per_sec: float = float(os.getenv("ADOBE_RATE_PER_SEC", "10"))
+    adobe_rate_burst: int = int(os.getenv("ADOBE_RATE_BURST", "20"))
+    adobe_throttle_retries: int = int(os.getenv("ADOBE_THROTTLE_RETRIES", "3"))
+    # Transient failures (5xx, connection errors) are retried with full-jitter backoff.
+    adobe_http_retries: int = int(os.getenv("ADOBE_HTTP_RETRIES", "2"))
+    adobe_retry_base_ms: int = int(os.getenv("ADOBE_RETRY_BASE_MS", "300"))
+
+    # Aspose.Words runs in prewarmed worker processes (ASPOSE_POOL_SIZE=0 => in-process, no timeout).
+    aspose_pool_size: int = int(os.getenv("ASPOSE_POOL_SIZE", "2"))
+    aspose_timeout_sec: int = int(os.getenv("ASPOSE_TIMEOUT_SEC", "300"))
+    aspose_pool_max_docs: int = int(os.getenv("ASPOSE_POOL_MAX_DOCS", "50"))
+    aspose_pool_max_rss_mb: int = int(os.getenv("ASPOSE_POOL_MAX_RSS_MB", "2048"))
+    aspose_pool_startup_sec: int = int(os.getenv("ASPOSE_POOL_STARTUP_SEC", "120"))
+    # Extra font folders (os.pathsep-separated) on top of the system fonts (e.g. Vietnamese
+    # faces missing from slim images), plus a persistent font search cache shared by all
+    # Aspose processes.
+    aspose_font_dirs: str | None = os.getenv("ASPOSE_FONT_DIRS")
+    aspose_font_cache_path: str | None = os.getenv("ASPOSE_FONT_CACHE_PATH", "/tmp/docuflow-aspose-fonts.cache")
+
+    # pdf2docx: large documents are parsed as page ranges in worker processes and the
+    # part DOCX files merged (PDF2DOCX_WORKERS=0 => one per core, 1 => whole document in-process).
+    pdf2docx_workers: int = int(os.getenv("PDF2DOCX_WORKERS", "0"))
+    pdf2docx_pages_per_task: int = int(os.getenv("PDF2DOCX_PAGES_PER_TASK", "20"))
+    pdf2docx_parallel_min_pages: int = int(os.getenv("PDF2DOCX_PARALLEL_MIN_PAGES", "30"))
+    # Virtual memory cap per worker (RLIMIT_AS); 0 disables it.
+    pdf2docx_worker_max_mem_mb: int = int(os.getenv("PDF2DOCX_WORKER_MAX_MEM_MB", "2048"))
+    # Large PDFs go to Adobe/Aspose as page-range chunks converted concurrently, then the
+    # DOCX parts are merged; a failed chunk is retried alone. PDF_CHUNK_MIN_PAGES=0 disables it.
+    pdf_chunk_min_pages: int = int(os.getenv("PDF_CHUNK_MIN_PAGES", "80"))
+    pdf_chunk_pages: int = int(os.getenv("PDF_CHUNK_PAGES", "40"))
+    pdf_chunk_workers: int = int(os.getenv("PDF_CHUNK_WORKERS", "4"))
+    pdf_chunk_retries: int = int(os.getenv("PDF_CHUNK_RETRIES", "2"))
+
+    # Per-engine circuit breakers (Adobe, Aspose, pdf2docx): over the last BREAKER_WINDOW_SEC,
+    # once BREAKER_MIN_CALLS calls were seen, an engine whose failure rate or slow-call rate
+    # (>= BREAKER_SLOW_CALL_SEC) crosses the threshold is skipped for BREAKER_OPEN_SEC
+    # (doubling after a failed half-open probe, up to BREAKER_MAX_OPEN_SEC).
+    breaker_enabled: bool = os.getenv("BREAKER_ENABLED", "true").lower() in ("1", "true", "yes")
+    breaker_window_sec: int = int(os.getenv("BREAKER_WINDOW_SEC", "300"))
+    breaker_min_calls: int = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+    breaker_failure_rate: float = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+    breaker_slow_call_sec: float = float(os.getenv("BREAKER_SLOW_CALL_SEC", "180"))
+    breaker_slow_rate: float = float(os.getenv("BREAKER_SLOW_RATE", "0.8"))
+    breaker_open_sec: int = int(os.getenv("BREAKER_OPEN_SEC", "60"))
+    breaker_max_open_sec: int = int(os.getenv("BREAKER_MAX_OPEN_SEC", "600"))
+
+    # Hedged Tier A: when Adobe hasn't finished by the HEDGE_PERCENTILE of its recent latency
+    # (same page-count bucket; HEDGE_DEFAULT_DELAY_SEC until HEDGE_MIN_SAMPLES are known), a
+    # local engine starts in parallel. The first result passing the quality gates wins.
+    hedge_enabled: bool = os.getenv("HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+    hedge_percentile: float = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+    hedge_min_samples: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    hedge_default_delay_sec: float = float(os.getenv("HEDGE_DEFAULT_DELAY_SEC", "60"))
+    hedge_min_delay_sec: float = float(os.getenv("HEDGE_MIN_DELAY_SEC", "5"))
+
+    # Adaptive Tier A engine order: per page-count / text-layer / scanned bucket, engines are
+    # tried in the order with the lowest expected time to a good result, learned from the last
+    # ROUTING_HISTORY_JOBS pdf-word jobs and recomputed every ROUTING_REFRESH_SEC. Engines with
+    # fewer than ROUTING_MIN_SAMPLES attempts keep the default order (Adobe, Aspose, pdf2docx).
+    routing_enabled: bool = os.getenv("ROUTING_ENABLED", "true").lower() in ("1", "true", "yes")
+    routing_refresh_sec: int = int(os.getenv("ROUTING_REFRESH_SEC", "600"))
+    routing_history_jobs: int = int(os.getenv("ROUTING_HISTORY_JOBS", "5000"))
+    routing_min_samples: int = int(os.getenv("ROUTING_MIN_SAMPLES", "20"))
+    # The first engine keeps its place unless more than this share of its attempts fail or are
+    # rejected; ROUTING_EXPLORE_RATE of jobs run the default order to keep its samples fresh.
+    routing_primary_max_failure_rate: float = float(os.getenv("ROUTING_PRIMARY_MAX_FAILURE_RATE", "0.5"))
+    routing_explore_rate: float = float(os.getenv("ROUTING_EXPLORE_RATE", "0.05"))
 
     # Tier A (LibreOffice)
     libreoffice_path: str | None = os.getenv("LIBREOFFICE_PATH")
+    # Long-lived headless instances (LIBREOFFICE_POOL_SIZE=0: one soffice process per
+    # conversion). Documents are dispatched over UNO by a small helper process running under
+    # a Python that can import `uno` (LIBREOFFICE_UNO_PYTHON; default: the first of the app's
+    # Python, /usr/bin/python3 with Debian's python3-uno, LibreOffice's bundled Python).
+    # Without one the pool only keeps a warmed profile per instance and still starts soffice
+    # per conversion.
+    libreoffice_pool_size: int = int(os.getenv("LIBREOFFICE_POOL_SIZE", "2"))
+    libreoffice_uno_python: str | None = os.getenv("LIBREOFFICE_UNO_PYTHON")
+    libreoffice_pool_max_docs: int = int(os.getenv("LIBREOFFICE_POOL_MAX_DOCS", "200"))
+    libreoffice_pool_dir: str = os.getenv("LIBREOFFICE_POOL_DIR", "/tmp/docuflow-lo-pool")
+    libreoffice_pool_startup_sec: int = int(os.getenv("LIBREOFFICE_POOL_STARTUP_SEC", "60"))
 
     # Optional OCR (for scanned PDFs)
     ocrmypdf_path: str | None = os.getenv("OCR_MY_PDF_PATH")
@@ -59,9 +160,20 @@ class Settings:
     ocr_lang: str = os.getenv("OCR_LANG", "vie+eng")
     ocr_timeout_sec: int = int(os.getenv("OCR_TIMEOUT_SEC", "180"))
     tesseract_path: str | None = os.getenv("TESSERACT_PATH")
+    # Large scans are OCRed as page-range chunks in parallel (one OCRmyPDF process per chunk).
+    # OCR_PARALLEL_WORKERS=0 means one worker per CPU core; 1 disables chunking.
+    ocr_parallel_workers: int = int(os.getenv("OCR_PARALLEL_WORKERS", "0"))
+    ocr_pages_per_chunk: int = int(os.getenv("OCR_PAGES_PER_CHUNK", "8"))
+    ocr_parallel_min_pages: int = int(os.getenv("OCR_PARALLEL_MIN_PAGES", "16"))
+    # Binaries/engines/Tesseract languages are probed at startup and re-probed in the background.
+    toolchain_refresh_sec: int = int(os.getenv("TOOLCHAIN_REFRESH_SEC", "300"))
 
     # Tier B (Image fallback)
     pdf_image_dpi: int = int(os.getenv("PDF_IMAGE_DPI", "250"))
+    # Pages are rendered by a process pool in page-range tasks (PDF_RASTER_WORKERS=0 => one per core).
+    pdf_raster_workers: int = int(os.getenv("PDF_RASTER_WORKERS", "0"))
+    pdf_raster_pages_per_task: int = int(os.getenv("PDF_RASTER_PAGES_PER_TASK", "4"))
+    pdf_raster_min_pages: int = int(os.getenv("PDF_RASTER_MIN_PAGES", "4"))
 
     # Payments (SePay VA)
     # These are used to generate VietQR links and validate webhook calls.
@@ -52,6 +52,17 @@ class ConversionJob(Base):
     has_text_layer: Mapped[int | None] = mapped_column(Integer, nullable=True)
     size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
     duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Bytes removed from the result by the DOCX optimizer (pdf-word only).
+    output_bytes_saved: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Routing features/outcomes (pdf-word only): what the engine router learns from.
+    page_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    is_scanned: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    engine: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # [{"engine": "adobe", "outcome": "ok|failed|rejected|cancelled", "ms": 1234, "error": ...}]
+    engine_attempts_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Per-stage timings (see services/pdf/stages):
+    # [{"stage": "adobe.poll", "start_ms": 812, "ms": 5400, "outcome": "ok|failed|rejected|cancelled", ...}]
+    stages_json: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
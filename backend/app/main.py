@@ -9,6 +9,13 @@ from .db.base import Base
 from .db.session import engine
 from .db import models as _models  # noqa: F401
 from .core.log_buffer import install_log_buffer
+from .services.pdf.adobe_client import shutdown_adobe_client
+from .services.pdf.adobe_runner import shutdown_adobe_runner
+from .services.pdf.aspose_pool import shutdown_aspose_pool, start_aspose_pool
+from .services.pdf.libreoffice_pool import shutdown_libreoffice_pool, start_libreoffice_pool
+from .services.pdf.routing import start_routing_refresher, stop_routing_refresher
+from .services.pdf.toolchain import start_toolchain_refresher, stop_toolchain_refresher
+from .utils.process_pool import shutdown_process_pools
 from sqlalchemy import inspect, text
 
 # CHÚ Ý: Biến này BẮT BUỘC phải tên là 'app' (vì lệnh chạy là :app)
@@ -27,6 +34,7 @@ if origins:
         expose_headers=[
             "X-Conversion-Mode",
             "X-PDF-Has-Text",
+            "X-Conversion-Cache",
             "Content-Disposition",
         ],
     )
@@ -38,7 +46,15 @@ app.include_router(api_router)
 def _init_db() -> None:
     install_log_buffer()
     app.state.started_at = datetime.now(timezone.utc)
-    Base.metadata.create_all(bind=engine)
+    start_toolchain_refresher()
+    start_libreoffice_pool()
+    start_aspose_pool()
+
+    # create_all probes every table one by one; only run it when something is missing.
+    existing_tables = set(inspect(engine).get_table_names())
+    missing_tables = [t for name, t in Base.metadata.tables.items() if name not in existing_tables]
+    if missing_tables:
+        Base.metadata.create_all(bind=engine, tables=missing_tables)
 
     # Lightweight migration (no Alembic in this project).
     # Ensure new columns exist for existing databases.
@@ -66,6 +82,19 @@ def _init_db() -> None:
         if "user_id" not in job_cols:
             with engine.begin() as conn:
                 conn.execute(text("ALTER TABLE conversion_jobs ADD COLUMN user_id INTEGER"))
+        if "output_bytes_saved" not in job_cols:
+            with engine.begin() as conn:
+                conn.execute(text("ALTER TABLE conversion_jobs ADD COLUMN output_bytes_saved INTEGER"))
+        for col, ddl in (
+            ("page_count", "INTEGER"),
+            ("is_scanned", "INTEGER"),
+            ("engine", "VARCHAR(32)"),
+            ("engine_attempts_json", "TEXT"),
+            ("stages_json", "TEXT"),
+        ):
+            if col not in job_cols:
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE conversion_jobs ADD COLUMN {col} {ddl}"))
 
         # Payments tables/columns (SQLite/Postgres friendly, best-effort)
         try:
@@ -120,6 +149,21 @@ def _init_db() -> None:
         # (Admin/user flows will surface issues in logs.)
         pass
 
+    # Needs the routing columns above.
+    start_routing_refresher()
+
+
+@app.on_event("shutdown")
+def _shutdown_workers() -> None:
+    stop_toolchain_refresher()
+    stop_routing_refresher()
+    shutdown_libreoffice_pool()
+    shutdown_aspose_pool()
+    # Runner first: it drains pending asset cleanups, which still need the client.
+    shutdown_adobe_runner()
+    shutdown_adobe_client()
+    shutdown_process_pools()
+
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,282 @@
+"""Local stand-in for the Adobe PDF Services endpoints used by adobe_pdf_services_convert.
+
+Usage:
+    python app/scripts/adobe_standin.py [--port 8790] [--engine text|pdf2docx]
+        [--latency-ms 40] [--jitter-ms 20] [--fail-rate 0.0] [--throttle-rate 0.0]
+        [--job-fail-rate 0.0] [--job-duration lognormal:1.0,0.6] [--token-ttl 3600]
+
+Then point the backend at it:
+    ADOBE_PDF_SERVICES_BASE_URL=http://127.0.0.1:8790 ADOBE_CLIENT_ID=local ADOBE_CLIENT_SECRET=local
+
+Implements POST /token, POST /assets, PUT <uploadUri>, POST /operation/exportpdf,
+GET <Location> (job status), GET /assets/{id} and GET <downloadUri>, DELETE /assets/{id}.
+The DOCX is produced by a local engine so the pipeline's quality gates see real output.
+GET /_stats returns request counters for load tests.
+
+Job durations: "fixed:S", "uniform:A,B", "exp:MEAN" or "lognormal:MU,SIGMA" (seconds;
+lognormal parameters are of the underlying normal, so the median is e**MU).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse, JSONResponse, Response
+
+# Ensure app package is importable (local engines produce the DOCX)
+BASE_DIR = Path(__file__).resolve().parents[2]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+
+@dataclass
+class StandinConfig:
+    public_url: str = "http://127.0.0.1:8790"
+    engine: str = "text"  # "text" (fast, text only) | "pdf2docx"
+    latency_ms: float = 40.0
+    jitter_ms: float = 20.0
+    fail_rate: float = 0.0  # HTTP 500 on any API call
+    throttle_rate: float = 0.0  # HTTP 429 + Retry-After on API calls (not upload/download)
+    job_fail_rate: float = 0.0  # export job ends with status "failed"
+    job_duration: str = "lognormal:0.5,0.6"
+    token_ttl_sec: int = 3600
+    seed: int | None = None
+    work_dir: Path = field(default_factory=lambda: Path(tempfile.mkdtemp(prefix="adobe-standin-")))
+
+
+def parse_duration(spec: str, rng: random.Random) -> float:
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+    if kind == "fixed":
+        return values[0]
+    if kind == "uniform":
+        return rng.uniform(values[0], values[1])
+    if kind == "exp":
+        return rng.expovariate(1.0 / values[0])
+    if kind == "lognormal":
+        return rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown duration distribution: {spec}")
+
+
+def _convert(engine: str, pdf_path: Path, out_dir: Path) -> Path:
+    if engine == "pdf2docx":
+        from app.services.pdf.pdf2docx_convert import convert_pdf_to_docx_pdf2docx
+
+        return convert_pdf_to_docx_pdf2docx(pdf_path=pdf_path, out_dir=out_dir, max_pages=0).docx_path
+    from app.services.pdf.pdf_text_docx import convert_pdf_text_to_docx
+
+    return convert_pdf_text_to_docx(pdf_path=pdf_path, out_dir=out_dir, max_pages=0)
+
+
+def create_app(config: StandinConfig) -> FastAPI:
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+    assets: dict[str, Path | None] = {}
+    jobs: dict[str, dict] = {}
+    counters: Counter[str] = Counter()
+    peak = {"jobs_running": 0}
+    running_tasks: set[asyncio.Task] = set()
+    config.work_dir.mkdir(parents=True, exist_ok=True)
+
+    app = FastAPI(title="Adobe PDF Services stand-in")
+
+    def roll(rate: float) -> bool:
+        with rng_lock:
+            return rate > 0 and rng.random() < rate
+
+    async def simulate(endpoint: str, *, api: bool = True) -> Response | None:
+        """Per-call latency plus injected throttling/failures (None => proceed).
+
+        Upload/download URLs are storage, not the rate-limited API: no 429s there.
+        """
+
+        counters[endpoint] += 1
+        with rng_lock:
+            delay = max(config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms), 0.0)
+        await asyncio.sleep(delay / 1000.0)
+        if api and roll(config.throttle_rate):
+            counters[f"{endpoint}:429"] += 1
+            return JSONResponse({"error": {"code": "TooManyRequests"}}, status_code=429, headers={"Retry-After": "1"})
+        if roll(config.fail_rate):
+            counters[f"{endpoint}:500"] += 1
+            return JSONResponse({"error": {"code": "InternalError"}}, status_code=500)
+        return None
+
+    def asset_file(asset_id: str) -> Path:
+        return config.work_dir / asset_id.replace(":", "_")
+
+    @app.post("/token")
+    async def token():
+        if (resp := await simulate("token")) is not None:
+            return resp
+        return {"access_token": uuid.uuid4().hex, "token_type": "bearer", "expires_in": config.token_ttl_sec}
+
+    @app.post("/assets")
+    async def create_asset():
+        if (resp := await simulate("asset_create")) is not None:
+            return resp
+        asset_id = f"urn:aaid:AS:standin:{uuid.uuid4()}"
+        assets[asset_id] = None
+        return {"assetID": asset_id, "uploadUri": f"{config.public_url}/_upload/{asset_id}"}
+
+    @app.put("/_upload/{asset_id}")
+    async def upload(asset_id: str, request: Request):
+        if (resp := await simulate("upload", api=False)) is not None:
+            return resp
+        if asset_id not in assets:
+            return JSONResponse({"error": "NoSuchKey"}, status_code=404)
+        path = asset_file(asset_id)
+        size = 0
+        with path.open("wb") as f:
+            async for chunk in request.stream():
+                f.write(chunk)
+                size += len(chunk)
+        counters["upload_bytes"] += size
+        assets[asset_id] = path
+        return Response(status_code=200)
+
+    async def run_job(job_id: str, input_path: Path, duration: float, fail: bool) -> None:
+        job = jobs[job_id]
+        running = sum(1 for j in jobs.values() if j["status"] == "in progress")
+        peak["jobs_running"] = max(peak["jobs_running"], running)
+        t0 = time.monotonic()
+        try:
+            out_dir = config.work_dir / f"job-{job_id}"
+            docx = await asyncio.to_thread(_convert, config.engine, input_path, out_dir)
+            await asyncio.sleep(max(duration - (time.monotonic() - t0), 0.0))
+            if fail:
+                raise RuntimeError("injected job failure")
+            asset_id = f"urn:aaid:AS:standin:{uuid.uuid4()}"
+            shutil.move(str(docx), asset_file(asset_id))
+            shutil.rmtree(out_dir, ignore_errors=True)
+            assets[asset_id] = asset_file(asset_id)
+            job.update(status="done", asset_id=asset_id)
+            counters["jobs_done"] += 1
+        except Exception as e:  # noqa: BLE001
+            job.update(status="failed", error=str(e))
+            counters["jobs_failed"] += 1
+
+    @app.post("/operation/exportpdf")
+    async def export_pdf(request: Request):
+        if (resp := await simulate("export_start")) is not None:
+            return resp
+        body = await request.json()
+        input_path = assets.get(str(body.get("assetID")))
+        if input_path is None:
+            return JSONResponse({"error": {"code": "InvalidInput", "message": "unknown assetID"}}, status_code=400)
+        if body.get("targetFormat") != "docx":
+            return JSONResponse({"error": {"code": "InvalidInput", "message": "targetFormat"}}, status_code=400)
+        job_id = uuid.uuid4().hex
+        with rng_lock:
+            duration = parse_duration(config.job_duration, rng)
+        jobs[job_id] = {"status": "in progress", "ocr_lang": body.get("ocrLang")}
+        counters["jobs_started"] += 1
+        task = asyncio.get_running_loop().create_task(run_job(job_id, input_path, duration, roll(config.job_fail_rate)))
+        running_tasks.add(task)
+        task.add_done_callback(running_tasks.discard)
+        return Response(
+            status_code=201,
+            headers={"Location": f"{config.public_url}/operation/exportpdf/{job_id}/status", "x-request-id": job_id},
+        )
+
+    @app.get("/operation/exportpdf/{job_id}/status")
+    async def job_status(job_id: str):
+        if (resp := await simulate("poll")) is not None:
+            return resp
+        job = jobs.get(job_id)
+        if job is None:
+            return JSONResponse({"error": {"code": "NotFound"}}, status_code=404)
+        if job["status"] == "done":
+            return {"status": "done", "asset": {"assetID": job["asset_id"], "metadata": {"type": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}}}
+        if job["status"] == "failed":
+            return {"status": "failed", "error": {"code": "ERROR", "message": job.get("error")}}
+        return {"status": "in progress"}
+
+    @app.get("/assets/{asset_id}")
+    async def get_asset(asset_id: str):
+        if (resp := await simulate("asset_get")) is not None:
+            return resp
+        if assets.get(asset_id) is None:
+            return JSONResponse({"error": {"code": "NotFound"}}, status_code=404)
+        return {"downloadUri": f"{config.public_url}/_download/{asset_id}"}
+
+    @app.get("/_download/{asset_id}")
+    async def download(asset_id: str):
+        if (resp := await simulate("download", api=False)) is not None:
+            return resp
+        path = assets.get(asset_id)
+        if path is None or not path.exists():
+            return JSONResponse({"error": "NoSuchKey"}, status_code=404)
+        return FileResponse(path, media_type="application/octet-stream")
+
+    @app.delete("/assets/{asset_id}")
+    async def delete_asset(asset_id: str):
+        counters["asset_delete"] += 1
+        path = assets.pop(asset_id, None)
+        if path is not None:
+            path.unlink(missing_ok=True)
+        return Response(status_code=204)
+
+    @app.get("/_stats")
+    async def stats():
+        return {
+            "requests": dict(counters),
+            "assets_live": len(assets),
+            "jobs_running": sum(1 for j in jobs.values() if j["status"] == "in progress"),
+            "jobs_running_peak": peak["jobs_running"],
+        }
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--engine", choices=("text", "pdf2docx"), default="text")
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--job-fail-rate", type=float, default=0.0)
+    parser.add_argument("--job-duration", default="lognormal:0.5,0.6")
+    parser.add_argument("--token-ttl", type=int, default=3600)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    parse_duration(args.job_duration, random.Random())  # validate early
+
+    import uvicorn
+
+    config = StandinConfig(
+        public_url=f"http://{args.host}:{args.port}",
+        engine=args.engine,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        fail_rate=args.fail_rate,
+        throttle_rate=args.throttle_rate,
+        job_fail_rate=args.job_fail_rate,
+        job_duration=args.job_duration,
+        token_ttl_sec=args.token_ttl,
+        seed=args.seed,
+    )
+    try:
+        uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+    finally:
+        shutil.rmtree(config.work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Load-test the Adobe conversion path offline against the local stand-in.
+
+Usage:
+    python app/scripts/bench_adobe.py --pdf sample.pdf [--jobs 50] [--concurrency 20]
+        [--mode adobe|pipeline] [--base-url http://127.0.0.1:8790]
+        [--standin "--job-duration lognormal:1.0,0.6 --fail-rate 0.02"]
+
+Without --base-url a stand-in (app/scripts/adobe_standin.py) is started on a free
+port with the --standin arguments and stopped afterwards. "adobe" mode calls
+convert_pdf_to_docx_adobe_pdf_services directly; "pipeline" runs
+convert_pdf_to_docx_pipeline, so the Adobe branch's quality gates run too.
+Env overrides (e.g. ADOBE_JOB_TIMEOUT_SEC) apply as usual.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url: str, timeout_sec: float = 20.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout_sec
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/_stats", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise SystemExit(f"Stand-in at {base_url} did not come up")
+
+
+def _pct(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf", type=Path, required=True)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mode", choices=("adobe", "pipeline"), default="adobe")
+    parser.add_argument("--base-url", default=None, help="use a running stand-in instead of starting one")
+    parser.add_argument("--standin", default="", help="extra arguments for adobe_standin.py")
+    args = parser.parse_args()
+
+    proc: subprocess.Popen | None = None
+    base_url = args.base_url
+    if base_url is None:
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        proc = subprocess.Popen(
+            [sys.executable, str(Path(__file__).with_name("adobe_standin.py")), "--port", str(port), *shlex.split(args.standin)],
+            cwd=BASE_DIR,
+        )
+    base_url = base_url.rstrip("/")
+
+    # Settings are read at import time: point them at the stand-in before importing app.
+    os.environ["ADOBE_PDF_SERVICES_BASE_URL"] = base_url
+    os.environ.setdefault("ADOBE_CLIENT_ID", "standin")
+    os.environ.setdefault("ADOBE_CLIENT_SECRET", "standin")
+    os.environ.setdefault("CONVERSION_WORKERS", str(args.concurrency))
+
+    try:
+        _wait_ready(base_url)
+
+        import httpx
+
+        from app.core.config import settings
+        from app.services.pdf.adobe_client import adobe_client_stats, shutdown_adobe_client
+        from app.services.pdf.adobe_pdf_services_convert import convert_pdf_to_docx_adobe_pdf_services
+        from app.services.pdf.adobe_runner import adobe_runner_stats, shutdown_adobe_runner
+        from app.services.pdf.hedging import hedge_stats
+        from app.services.pdf.pipeline import convert_pdf_to_docx_pipeline
+
+        work_root = Path(tempfile.mkdtemp(prefix="bench-adobe-"))
+
+        def one(i: int) -> tuple[float, str]:
+            work_dir = work_root / f"job{i}"
+            t0 = time.perf_counter()
+            try:
+                if args.mode == "pipeline":
+                    result = convert_pdf_to_docx_pipeline(pdf_path=args.pdf, work_dir=work_dir)
+                    outcome = f"ok:{result.mode}"
+                else:
+                    convert_pdf_to_docx_adobe_pdf_services(
+                        pdf_path=args.pdf,
+                        out_dir=work_dir,
+                        base_url=settings.adobe_base_url,
+                        client_id=str(settings.adobe_client_id),
+                        client_secret=str(settings.adobe_client_secret),
+                        job_timeout_sec=settings.adobe_job_timeout_sec,
+                        poll_interval_ms=settings.adobe_poll_interval_ms,
+                        ocr_lang=None,
+                    )
+                    outcome = "ok"
+            except Exception as e:  # noqa: BLE001
+                outcome = f"{type(e).__name__}: {str(e)[:60]}"
+            return time.perf_counter() - t0, outcome
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(args.concurrency, 1)) as pool:
+            results = list(pool.map(one, range(args.jobs)))
+        wall = time.perf_counter() - t0
+
+        latencies = [lat for lat, outcome in results if outcome.startswith("ok")]
+        print(f"{args.jobs} jobs, concurrency {args.concurrency}, mode {args.mode}: {wall:.2f}s wall, "
+              f"{args.jobs / wall:.2f} jobs/s")
+        if latencies:
+            print(f"latency ok (s): p50 {_pct(latencies, 0.5):.2f}  p95 {_pct(latencies, 0.95):.2f}  "
+                  f"max {max(latencies):.2f}  mean {statistics.mean(latencies):.2f}")
+        print("outcomes:")
+        for outcome, n in Counter(o for _lat, o in results).most_common():
+            print(f"  {n:5d}  {outcome}")
+        print("client:", json.dumps(adobe_client_stats(), indent=1))
+        print("runner:", json.dumps(adobe_runner_stats()))
+        if args.mode == "pipeline":
+            print("hedging:", json.dumps(hedge_stats()))
+        shutdown_adobe_runner()
+        shutdown_adobe_client()
+        print("stand-in:", json.dumps(httpx.get(f"{base_url}/_stats", timeout=5).json()))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Measure API cold-start cost: import time per module and (optionally) startup hooks.
+
+Usage:
+    python app/scripts/bench_startup.py [--top 25] [--runs 3] [--startup]
+
+Each run is a fresh interpreter (`python -X importtime -c "import app.main"`), so the
+numbers match what a new worker pays during a rolling deploy or scale-out.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+# Conversion engines must load on first use (or in worker processes), never at import.
+ENGINE_MODULES = ("fitz", "pdf2docx", "docx", "aspose", "httpx", "PIL", "numpy", "uno")
+
+_STARTUP_SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app):
+    t2 = time.perf_counter()
+print(f"{(t1 - t0) * 1000:.1f} {(t2 - t1) * 1000:.1f}")
+"""
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(BASE_DIR) + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    return env
+
+
+def _importtime() -> tuple[list[tuple[str, int, int, int]], float, set[str]]:
+    """Return ([(module, self_us, cumulative_us, depth)], wall_ms, loaded engine modules)."""
+
+    probe = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {ENGINE_MODULES!r} if m in sys.modules))"
+    )
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=BASE_DIR,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr[-4000:])
+
+    rows: list[tuple[str, int, int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:   self |   cumulative | <indent>module"
+        try:
+            head, cum_us, raw_name = line.split("|", 2)
+            self_us = int(head.split(":", 1)[1])
+            depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+            rows.append((raw_name.strip(), self_us, int(cum_us), depth))
+        except ValueError:
+            continue
+    loaded = {m for m in proc.stdout.strip().split(",") if m}
+    return rows, wall_ms, loaded
+
+
+def _startup_ms() -> tuple[float, float]:
+    proc = subprocess.run(
+        [sys.executable, "-c", _STARTUP_SNIPPET],
+        cwd=BASE_DIR,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr[-4000:])
+    import_ms, startup_ms = proc.stdout.strip().splitlines()[-1].split()
+    return float(import_ms), float(startup_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=25, help="modules to list")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to average over")
+    parser.add_argument("--startup", action="store_true", help="also time FastAPI startup hooks")
+    args = parser.parse_args()
+
+    walls: list[float] = []
+    cum_by_module: dict[str, list[int]] = defaultdict(list)
+    self_by_package: dict[str, list[int]] = defaultdict(list)
+    loaded_engines: set[str] = set()
+    total_us: list[int] = []
+    for _ in range(max(args.runs, 1)):
+        rows, wall_ms, loaded = _importtime()
+        walls.append(wall_ms)
+        loaded_engines |= loaded
+        per_package: dict[str, int] = defaultdict(int)
+        for name, self_us, cum_us, _depth in rows:
+            cum_by_module[name].append(cum_us)
+            per_package[name.split(".")[0]] += self_us
+        for pkg, us in per_package.items():
+            self_by_package[pkg].append(us)
+        app_main = [cum for name, _s, cum, _d in rows if name == "app.main"]
+        if app_main:
+            total_us.append(app_main[-1])
+
+    def med(values: list[int]) -> float:
+        return statistics.median(values) / 1000
+
+    print(f"import app.main: {med(total_us):.1f} ms (median of {len(total_us)}), "
+          f"interpreter wall {statistics.median(walls):.1f} ms")
+
+    print(f"\nTop {args.top} modules by cumulative import time (ms):")
+    for name, values in sorted(cum_by_module.items(), key=lambda kv: -med(kv[1]))[: args.top]:
+        print(f"  {med(values):9.1f}  {name}")
+
+    print(f"\nTop {args.top} packages by self import time (ms):")
+    for pkg, values in sorted(self_by_package.items(), key=lambda kv: -med(kv[1]))[: args.top]:
+        print(f"  {med(values):9.1f}  {pkg}")
+
+    if loaded_engines:
+        print(f"\nWARNING: engine modules imported at startup: {', '.join(sorted(loaded_engines))}")
+    else:
+        print("\nNo conversion engine modules imported at startup.")
+
+    if args.startup:
+        import_ms, startup_ms = _startup_ms()
+        print(f"\nimport: {import_ms:.1f} ms, startup hooks: {startup_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
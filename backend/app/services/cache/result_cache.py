@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+from ...core.config import settings
+
+
+# Bump when a pipeline change should invalidate every cached artifact.
+RESULT_CACHE_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    path: Path
+    mode: str | None
+    has_text_layer: bool | None
+
+
+@dataclass
+class _Entry:
+    size: int
+    suffix: str
+
+
+def engine_fingerprint(tool_type: str) -> str:
+    """Short hash of the settings that influence a tool's output.
+
+    Changing any of them (e.g. OCR language, DPI, Adobe on/off) yields new cache keys
+    instead of serving artifacts produced with the old configuration.
+    """
+
+    if tool_type == "pdf-word":
+        parts = [
+            bool(settings.adobe_client_id and settings.adobe_client_secret),
+            settings.adobe_ocr_lang,
+            settings.ocr_enabled,
+            settings.ocr_lang,
+            settings.prefer_editable,
+            settings.max_pages,
+            settings.pdf_image_dpi,
+            settings.docx_optimize_enabled,
+            settings.docx_target_dpi,
+            settings.docx_lightweight_dpi,
+        ]
+    elif tool_type == "word-pdf":
+        parts = [settings.libreoffice_path]
+    else:
+        parts = []
+    raw = json.dumps([RESULT_CACHE_VERSION, tool_type, *parts], default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class ResultCache:
+    """Content-addressed cache of conversion artifacts with an LRU size cap.
+
+    Layout: `<root>/<key><suffix>` (artifact) + `<root>/<key>.json` (metadata). The meta
+    file's mtime is the LRU timestamp, so recency survives restarts.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max(int(max_bytes), 0)
+        self._lock = Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(*, sha256: str, tool_type: str, mode: str | None, profile: str | None = None) -> str:
+        raw = f"{sha256}:{tool_type}:{mode or 'auto'}:{profile or 'standard'}:{engine_fingerprint(tool_type)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load(self) -> None:
+        # Caller holds the lock.
+        if self._loaded:
+            return
+        self._loaded = True
+        self.root.mkdir(parents=True, exist_ok=True)
+        found: list[tuple[float, str, _Entry]] = []
+        for meta_path in self.root.glob("*.json"):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                suffix = str(meta.get("suffix") or "")
+                artifact = self.root / f"{meta_path.stem}{suffix}"
+                found.append((meta_path.stat().st_mtime, meta_path.stem, _Entry(artifact.stat().st_size, suffix)))
+            except Exception:  # noqa: BLE001
+                # Orphaned/corrupt entry: drop it.
+                self._remove_files(meta_path.stem, None)
+        for _mtime, key, entry in sorted(found, key=lambda x: x[0]):
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+
+    def _remove_files(self, key: str, suffix: str | None) -> None:
+        paths = [self.root / f"{key}.json"]
+        if suffix:
+            paths.append(self.root / f"{key}{suffix}")
+        for p in paths:
+            try:
+                p.unlink()
+            except Exception:  # noqa: BLE001
+                # best-effort cleanup
+                pass
+
+    def get(self, key: str, dest: Path) -> CachedResult | None:
+        """Copy the cached artifact for `key` to `dest`; None on miss."""
+
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        meta_path = self.root / f"{key}.json"
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self.root / f"{key}{entry.suffix}", dest)
+            os.utime(meta_path, None)
+        except Exception:  # noqa: BLE001
+            # Evicted concurrently or unreadable: treat as a miss.
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        has_text = meta.get("has_text_layer")
+        return CachedResult(
+            path=dest,
+            mode=meta.get("mode"),
+            has_text_layer=None if has_text is None else bool(has_text),
+        )
+
+    def put(self, key: str, src: Path, *, mode: str | None, has_text_layer: bool | None = None) -> None:
+        """Store a copy of `src` under `key`, evicting least-recently-used entries."""
+
+        try:
+            size = src.stat().st_size
+        except OSError:
+            return
+        if size <= 0 or (self.max_bytes and size > self.max_bytes):
+            return
+
+        suffix = src.suffix
+        with self._lock:
+            self._load()
+
+        tmp = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            shutil.copyfile(src, tmp)
+            tmp.replace(self.root / f"{key}{suffix}")
+            meta = {"mode": mode, "has_text_layer": has_text_layer, "suffix": suffix}
+            (self.root / f"{key}.json").write_text(json.dumps(meta), encoding="utf-8")
+        except Exception:  # noqa: BLE001
+            try:
+                tmp.unlink()
+            except Exception:  # noqa: BLE001
+                pass
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.size
+            self._entries[key] = _Entry(size, suffix)
+            self._total_bytes += size
+            self.stores += 1
+            while self.max_bytes and self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self._total_bytes -= old_entry.size
+                self.evictions += 1
+                self._remove_files(old_key, old_entry.suffix)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.result_cache_enabled,
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
+
+
+_cache: ResultCache | None = None
+_cache_lock = Lock()
+
+
+def get_result_cache() -> ResultCache:
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(
+                root=Path(settings.result_cache_dir),
+                max_bytes=settings.result_cache_max_mb * 1024 * 1024,
+            )
+        return _cache
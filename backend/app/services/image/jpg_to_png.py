@@ -3,8 +3,6 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-from PIL import Image, ImageOps
-
 from ...utils.files import safe_filename
 
 
@@ -18,6 +16,8 @@ class JpgToPngResult:
 
 
 def convert_jpg_to_png(*, jpg_path: Path, out_dir: Path) -> JpgToPngResult:
+    from PIL import Image, ImageOps
+
     if not jpg_path.exists():
         raise FileNotFoundError(str(jpg_path))
 
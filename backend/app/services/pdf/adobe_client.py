@@ -0,0 +1,504 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from ...core.config import settings
+from .adobe_governor import AdobeGovernor
+from .circuit_breaker import backoff_delay
+
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_WINDOW = 256
+_TRANSIENT_STATUS = {500, 502, 503, 504}
+
+
+class AdobeAuthError(RuntimeError):
+    pass
+
+
+def retry_after_sec(resp: Any) -> float | None:
+    """Seconds from a numeric Retry-After header (None if absent/unparseable)."""
+
+    try:
+        value = float(resp.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
+class _OpStats:
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "recent")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self.recent)
+
+        def pct(p: float) -> float | None:
+            return round(recent[min(int(len(recent) * p), len(recent) - 1)], 1) if recent else None
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class AdobeClient:
+    """Long-lived, thread-safe client for Adobe PDF Services.
+
+    - One `httpx.Client` (connection pool + keep-alive) shared by all jobs, so TLS
+      handshakes happen once per connection instead of once per request.
+    - Access token refresh is single-flight: concurrent callers wait for the one
+      in-progress refresh. A background thread renews the token `renew_margin_sec`
+      before it expires, so jobs normally never wait for a refresh.
+    - Latency per operation and new-vs-reused connection counts are recorded
+      (connection events come from httpx's "trace" extension).
+    - The `a*` methods use an `httpx.AsyncClient` bound to the event loop that first
+      calls them (the Adobe runner loop); they share the token and the metrics.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        client_id: str,
+        client_secret: str,
+        max_connections: int = 20,
+        renew_margin_sec: int = 300,
+        governor: AdobeGovernor | None = None,
+        throttle_retries: int = 3,
+        http_retries: int = 2,
+        retry_base_ms: int = 300,
+    ) -> None:
+        import httpx
+
+        self.base_url = base_url.rstrip("/")
+        self.client_id = client_id
+        self._client_secret = client_secret
+        self.renew_margin_sec = max(int(renew_margin_sec), 60)
+        self._max_connections = max(int(max_connections), 1)
+        self._http = httpx.Client(limits=self._limits(), timeout=httpx.Timeout(60.0, connect=15.0))
+        self._ahttp = None  # httpx.AsyncClient, created on the runner loop
+        self.governor = governor or AdobeGovernor(max_inflight=max_connections, rate_per_sec=0, burst=1)
+        self.throttle_retries = max(int(throttle_retries), 0)
+        self.http_retries = max(int(http_retries), 0)
+        self.retry_base_sec = max(int(retry_base_ms), 1) / 1000.0
+        self._aloop: asyncio.AbstractEventLoop | None = None
+        self._token: str | None = None
+        self._expires_at = 0.0  # monotonic
+        self._token_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._ops: dict[str, _OpStats] = {}
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.token_refreshes = 0
+        self.token_failures = 0
+        self._stop = threading.Event()
+        self._renewer: threading.Thread | None = None
+
+    def _limits(self):
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self._max_connections,
+            max_keepalive_connections=self._max_connections,
+            keepalive_expiry=60,
+        )
+
+    # ---- token -------------------------------------------------------------
+
+    def cached_token(self) -> str | None:
+        return self._token if self._token_valid(60) else None
+
+    def _token_valid(self, margin: float) -> bool:
+        return self._token is not None and time.monotonic() < self._expires_at - margin
+
+    def access_token(self, *, force_refresh: bool = False) -> str:
+        if not force_refresh and self._token_valid(60):
+            return str(self._token)
+        stale = self._token
+        with self._token_lock:
+            # Another thread may have refreshed while we waited for the lock.
+            if self._token_valid(60) and not (force_refresh and self._token == stale):
+                return str(self._token)
+            self._refresh_token_locked()
+            return str(self._token)
+
+    def _refresh_token_locked(self) -> None:
+        try:
+            resp = self.request(
+                "POST",
+                f"{self.base_url}/token",
+                op="token",
+                auth=False,
+                data={"client_id": self.client_id, "client_secret": self._client_secret},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception as e:  # noqa: BLE001
+            with self._stats_lock:
+                self.token_failures += 1
+            raise AdobeAuthError(f"Adobe token request failed: {e}") from e
+
+        token = data.get("access_token")
+        if not token:
+            raise AdobeAuthError("Adobe token response missing access_token")
+        try:
+            expires_in = float(data.get("expires_in") if data.get("expires_in") is not None else 3600)
+        except (TypeError, ValueError):
+            expires_in = 3600.0
+        self._token = str(token)
+        self._expires_at = time.monotonic() + expires_in
+        with self._stats_lock:
+            self.token_refreshes += 1
+        self._ensure_renewer()
+
+    def _ensure_renewer(self) -> None:
+        if self._renewer is not None and self._renewer.is_alive():
+            return
+        self._renewer = threading.Thread(target=self._renew_loop, name="adobe-token-renew", daemon=True)
+        self._renewer.start()
+
+    def _renew_loop(self) -> None:
+        while not self._stop.is_set():
+            wait = max(self._expires_at - self.renew_margin_sec - time.monotonic(), 1.0)
+            if self._stop.wait(wait):
+                return
+            if self._token_valid(self.renew_margin_sec):
+                continue  # refreshed by a caller in the meantime
+            try:
+                with self._token_lock:
+                    if not self._token_valid(self.renew_margin_sec):
+                        self._refresh_token_locked()
+            except Exception:  # noqa: BLE001
+                logger.warning("Background Adobe token renewal failed; retrying in 30s")
+                if self._stop.wait(30):
+                    return
+
+    def auth_headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token()}", "x-api-key": self.client_id}
+
+    # ---- requests ----------------------------------------------------------
+
+    def _record(self, op: str, elapsed_ms: float, *, error: bool, new_connection: bool | None) -> None:
+        with self._stats_lock:
+            stats = self._ops.setdefault(op, _OpStats())
+            stats.count += 1
+            stats.errors += int(error)
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.recent.append(elapsed_ms)
+            if new_connection is True:
+                self.new_connections += 1
+            elif new_connection is False:
+                self.reused_connections += 1
+
+    def request(self, method: str, url: str, *, op: str, auth: bool = True, headers: dict | None = None, **kwargs: Any):
+        """Send a request through the shared pool; `auth` adds Bearer/x-api-key headers.
+
+        A 401 on an authenticated call refreshes the token once and retries; 5xx and
+        connection errors are retried `http_retries` times with jittered backoff.
+        """
+
+        import httpx
+
+        refreshed = False
+        failed = 0
+        while True:
+            all_headers = {**(self.auth_headers() if auth else {}), **(headers or {})}
+            try:
+                resp = self._send(method, url, op=op, headers=all_headers, **kwargs)
+            except httpx.TransportError:
+                if failed >= self.http_retries:
+                    raise
+                failed += 1
+                time.sleep(backoff_delay(failed - 1, base_sec=self.retry_base_sec, cap_sec=10.0))
+                continue
+            if resp.status_code in _TRANSIENT_STATUS and failed < self.http_retries:
+                failed += 1
+                resp.close()
+                time.sleep(backoff_delay(failed - 1, base_sec=self.retry_base_sec, cap_sec=10.0))
+                continue
+            if resp.status_code == 401 and auth and not refreshed:
+                refreshed = True
+                resp.close()
+                self.access_token(force_refresh=True)
+                continue
+            return resp
+
+    def _send(self, method: str, url: str, *, op: str, **kwargs: Any):
+        connected: list[bool] = []
+
+        def trace(event_name: str, _info: dict) -> None:
+            if event_name.startswith("connection.connect_tcp.started"):
+                connected.append(True)
+
+        t0 = time.perf_counter()
+        try:
+            resp = self._http.request(method, url, extensions={"trace": trace}, **kwargs)
+        except Exception:
+            self._record(op, (time.perf_counter() - t0) * 1000, error=True, new_connection=bool(connected) or None)
+            raise
+        self._record(op, (time.perf_counter() - t0) * 1000, error=resp.is_error, new_connection=bool(connected))
+        return resp
+
+    def download(self, url: str, dest: Path, *, timeout_sec: float) -> int:
+        """Stream `url` into `dest` (via a temp file); returns bytes written."""
+
+        connected: list[bool] = []
+
+        def trace(event_name: str, _info: dict) -> None:
+            if event_name.startswith("connection.connect_tcp.started"):
+                connected.append(True)
+
+        tmp = dest.with_suffix(dest.suffix + ".part")
+        written = 0
+        t0 = time.perf_counter()
+        try:
+            with self._http.stream("GET", url, timeout=timeout_sec, extensions={"trace": trace}) as resp:
+                resp.raise_for_status()
+                with tmp.open("wb") as f:
+                    for chunk in resp.iter_bytes(1024 * 1024):
+                        f.write(chunk)
+                        written += len(chunk)
+            tmp.replace(dest)
+        except Exception:
+            self._record("download", (time.perf_counter() - t0) * 1000, error=True, new_connection=bool(connected) or None)
+            try:
+                tmp.unlink()
+            except FileNotFoundError:
+                pass
+            raise
+        self._record("download", (time.perf_counter() - t0) * 1000, error=False, new_connection=bool(connected))
+        return written
+
+    # ---- async (runner loop) -----------------------------------------------
+
+    def _async_http(self):
+        if self._ahttp is None:
+            import httpx
+
+            self._ahttp = httpx.AsyncClient(limits=self._limits(), timeout=httpx.Timeout(60.0, connect=15.0))
+            self._aloop = asyncio.get_running_loop()
+        return self._ahttp
+
+    async def _aauth_headers(self, *, force_refresh: bool = False) -> dict[str, str]:
+        token = None if force_refresh else self.cached_token()
+        if token is None:
+            # Rare (the renewal thread keeps the token fresh); don't block the loop on it.
+            loop = asyncio.get_running_loop()
+            token = await loop.run_in_executor(None, functools.partial(self.access_token, force_refresh=force_refresh))
+        return {"Authorization": f"Bearer {token}", "x-api-key": self.client_id}
+
+    async def arequest(
+        self, method: str, url: str, *, op: str, auth: bool = True, headers: dict | None = None, **kwargs: Any
+    ):
+        """Async `request`: same auth headers, 401 retry and metrics.
+
+        Also retries 5xx/connection errors (`http_retries`, full-jitter backoff) and
+        429s (`throttle_retries`, after the governor's shared pause).
+        """
+
+        import httpx
+
+        refreshed = force_refresh = False
+        throttled = failed = 0
+        # Streaming bodies (the upload) can't be replayed, so they aren't retried on 5xx.
+        content = kwargs.get("content")
+        replayable = content is None or isinstance(content, (bytes, str))
+        while True:
+            auth_headers: dict[str, str] = {}
+            if auth:
+                # API calls go through the governor (rate + 429 pause); pre-signed
+                # upload/download URLs are storage, not the Adobe API.
+                await self.governor.before_request()
+                auth_headers = await self._aauth_headers(force_refresh=force_refresh)
+                force_refresh = False
+            try:
+                resp = await self._asend(method, url, op=op, headers={**auth_headers, **(headers or {})}, **kwargs)
+            except httpx.TransportError:
+                if not replayable or failed >= self.http_retries:
+                    raise
+                failed += 1
+                await asyncio.sleep(backoff_delay(failed - 1, base_sec=self.retry_base_sec, cap_sec=10.0))
+                continue
+            if resp.status_code in _TRANSIENT_STATUS and replayable and failed < self.http_retries:
+                failed += 1
+                await resp.aclose()
+                await asyncio.sleep(backoff_delay(failed - 1, base_sec=self.retry_base_sec, cap_sec=10.0))
+                continue
+            if resp.status_code == 401 and auth and not refreshed:
+                await resp.aclose()
+                refreshed = force_refresh = True
+                continue
+            if resp.status_code == 429 and auth and throttled < self.throttle_retries:
+                throttled += 1
+                pause = self.governor.on_throttled(retry_after_sec(resp))
+                logger.info("Adobe %s throttled (429); pausing Adobe calls for %.1fs", op, pause)
+                await resp.aclose()
+                continue
+            return resp
+
+    async def _asend(self, method: str, url: str, *, op: str, **kwargs: Any):
+        connected: list[bool] = []
+
+        async def trace(event_name: str, _info: dict) -> None:
+            if event_name.startswith("connection.connect_tcp.started"):
+                connected.append(True)
+
+        t0 = time.perf_counter()
+        try:
+            resp = await self._async_http().request(method, url, extensions={"trace": trace}, **kwargs)
+        except Exception:
+            self._record(op, (time.perf_counter() - t0) * 1000, error=True, new_connection=bool(connected) or None)
+            raise
+        self._record(op, (time.perf_counter() - t0) * 1000, error=resp.is_error, new_connection=bool(connected))
+        return resp
+
+    async def adownload(self, url: str, dest: Path, *, timeout_sec: float) -> int:
+        """Async `download`: stream `url` into `dest` via a temp file (5xx/connection
+        errors are retried like `arequest`)."""
+
+        import httpx
+
+        failed = 0
+        while True:
+            try:
+                return await self._adownload_once(url, dest, timeout_sec=timeout_sec)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                transient = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code in _TRANSIENT_STATUS
+                if not transient or failed >= self.http_retries:
+                    raise
+                failed += 1
+                await asyncio.sleep(backoff_delay(failed - 1, base_sec=self.retry_base_sec, cap_sec=10.0))
+
+    async def _adownload_once(self, url: str, dest: Path, *, timeout_sec: float) -> int:
+        connected: list[bool] = []
+
+        async def trace(event_name: str, _info: dict) -> None:
+            if event_name.startswith("connection.connect_tcp.started"):
+                connected.append(True)
+
+        tmp = dest.with_suffix(dest.suffix + ".part")
+        written = 0
+        t0 = time.perf_counter()
+        try:
+            async with self._async_http().stream("GET", url, timeout=timeout_sec, extensions={"trace": trace}) as resp:
+                resp.raise_for_status()
+                with tmp.open("wb") as f:
+                    async for chunk in resp.aiter_bytes(1024 * 1024):
+                        f.write(chunk)
+                        written += len(chunk)
+            tmp.replace(dest)
+        except BaseException:
+            self._record("download", (time.perf_counter() - t0) * 1000, error=True, new_connection=bool(connected) or None)
+            try:
+                tmp.unlink()
+            except FileNotFoundError:
+                pass
+            raise
+        self._record("download", (time.perf_counter() - t0) * 1000, error=False, new_connection=bool(connected))
+        return written
+
+    # ---- lifecycle / metrics -----------------------------------------------
+
+    def close(self) -> None:
+        self._stop.set()
+        self._http.close()
+        ahttp, loop = self._ahttp, self._aloop
+        self._ahttp = self._aloop = None
+        if ahttp is not None and loop is not None and loop.is_running():
+            fut = asyncio.run_coroutine_threadsafe(ahttp.aclose(), loop)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # Called from a plain thread: wait so connections close before the loop stops.
+                try:
+                    fut.result(timeout=5)
+                except Exception:  # noqa: BLE001
+                    pass
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            total = self.new_connections + self.reused_connections
+            return {
+                "base_url": self.base_url,
+                "token_valid_for_sec": max(int(self._expires_at - time.monotonic()), 0) if self._token else 0,
+                "token_refreshes": self.token_refreshes,
+                "token_failures": self.token_failures,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "connection_reuse_ratio": round(self.reused_connections / total, 3) if total else None,
+                "operations": {op: s.snapshot() for op, s in sorted(self._ops.items())},
+                "governor": self.governor.stats(),
+            }
+
+
+_client: AdobeClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_adobe_client(*, base_url: str, client_id: str, client_secret: str) -> AdobeClient:
+    """Process-wide client; recreated only if the endpoint or credentials change."""
+
+    global _client
+
+    with _client_lock:
+        current = _client
+        if (
+            current is not None
+            and current.base_url == base_url.rstrip("/")
+            and current.client_id == client_id
+            and current._client_secret == client_secret
+        ):
+            return current
+        _client = AdobeClient(
+            base_url=base_url,
+            client_id=client_id,
+            client_secret=client_secret,
+            max_connections=settings.adobe_max_connections,
+            renew_margin_sec=settings.adobe_token_renew_margin_sec,
+            governor=AdobeGovernor(
+                max_inflight=settings.adobe_max_inflight,
+                rate_per_sec=settings.adobe_rate_per_sec,
+                burst=settings.adobe_rate_burst,
+            ),
+            throttle_retries=settings.adobe_throttle_retries,
+            http_retries=settings.adobe_http_retries,
+            retry_base_ms=settings.adobe_retry_base_ms,
+        )
+    if current is not None:
+        current.close()
+    return _client
+
+
+def adobe_client_stats() -> dict | None:
+    with _client_lock:
+        return _client.stats() if _client is not None else None
+
+
+def shutdown_adobe_client() -> None:
+    global _client
+
+    with _client_lock:
+        current, _client = _client, None
+    if current is not None:
+        current.close()
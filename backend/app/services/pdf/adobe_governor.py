@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+_WAIT_WINDOW = 256
+
+
+class AdobeQueueTimeout(RuntimeError):
+    pass
+
+
+class AdobeGovernor:
+    """Outbound limits for Adobe PDF Services, enforced on the Adobe runner loop.
+
+    - `job_slot()`: at most `max_inflight` export jobs at once; the rest queue on
+      the loop (their conversion threads already gave their CPU slot back).
+    - `before_request()`: token bucket of `rate_per_sec` API calls (burst `burst`),
+      plus a shared pause after a 429 so every caller backs off, not just the one
+      that was throttled.
+    Queue wait times are kept so the limit can be sized from admin status.
+    """
+
+    def __init__(self, *, max_inflight: int, rate_per_sec: float, burst: int) -> None:
+        self.max_inflight = max(int(max_inflight), 1)
+        self.rate_per_sec = max(float(rate_per_sec), 0.0)  # 0 => unlimited
+        self.burst = max(int(burst), 1)
+        self._slots: asyncio.Semaphore | None = None
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._stats_lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=_WAIT_WINDOW)
+        self.in_flight = 0
+        self.queued = 0
+        self.queue_timeouts = 0
+        self.jobs = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.throttled = 0
+        self.request_wait_ms = 0.0
+
+    @asynccontextmanager
+    async def job_slot(self, *, timeout_sec: float) -> AsyncIterator[None]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_inflight)
+        with self._stats_lock:
+            self.queued += 1
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=max(timeout_sec, 0.001))
+        except asyncio.TimeoutError as e:
+            with self._stats_lock:
+                self.queue_timeouts += 1
+            raise AdobeQueueTimeout(
+                f"Adobe queue wait exceeded {timeout_sec:.0f}s ({self.max_inflight} jobs in flight)"
+            ) from e
+        finally:
+            with self._stats_lock:
+                self.queued -= 1
+        waited_ms = (time.perf_counter() - t0) * 1000
+        with self._stats_lock:
+            self.jobs += 1
+            self.in_flight += 1
+            self.total_wait_ms += waited_ms
+            self.max_wait_ms = max(self.max_wait_ms, waited_ms)
+            self._waits.append(waited_ms)
+        try:
+            yield
+        finally:
+            with self._stats_lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    async def before_request(self) -> None:
+        t0 = time.monotonic()
+        pause = self._paused_until - t0
+        if pause > 0:
+            await asyncio.sleep(pause)
+        if self.rate_per_sec > 0:
+            # Single event loop: no lock needed around the bucket.
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_sec)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_sec)
+        waited = time.monotonic() - t0
+        if waited > 0.001:
+            with self._stats_lock:
+                self.request_wait_ms += waited * 1000
+
+    def on_throttled(self, retry_after_sec: float | None) -> float:
+        """Record a 429 and pause all callers; returns the pause length."""
+
+        pause = retry_after_sec if retry_after_sec is not None else 2.0
+        pause = min(max(pause, 0.5), 60.0)
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        # Drain the bucket so requests resume at the configured rate, not in a burst.
+        self._tokens = 0.0
+        with self._stats_lock:
+            self.throttled += 1
+        return pause
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            waits = sorted(self._waits)
+
+            def pct(p: float) -> float | None:
+                return round(waits[min(int(len(waits) * p), len(waits) - 1)], 1) if waits else None
+
+            return {
+                "max_inflight": self.max_inflight,
+                "rate_per_sec": self.rate_per_sec,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "jobs": self.jobs,
+                "queue_timeouts": self.queue_timeouts,
+                "queue_wait_avg_ms": round(self.total_wait_ms / self.jobs, 1) if self.jobs else None,
+                "queue_wait_p50_ms": pct(0.50),
+                "queue_wait_p95_ms": pct(0.95),
+                "queue_wait_max_ms": round(self.max_wait_ms, 1),
+                "throttled_429": self.throttled,
+                "request_wait_ms": round(self.request_wait_ms, 1),
+                "paused_for_sec": round(max(self._paused_until - time.monotonic(), 0.0), 1),
+            }
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import hashlib
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import httpx
-
 from ...utils.files import safe_filename
+from ...core.config import settings
+from .adobe_client import AdobeAuthError, AdobeClient, get_adobe_client, retry_after_sec
+from .adobe_governor import AdobeQueueTimeout
+from .adobe_runner import get_adobe_runner
+from .circuit_breaker import backoff_delay
+from .stages import mark_stage, record_stage, stage
 
 
 class AdobePdfServicesConvertError(RuntimeError):
@@ -19,60 +27,67 @@ class AdobePdfServicesConvertResult:
     docx_path: Path
 
 
-_TOKEN_CACHE: dict[str, Any] = {
-    "token": None,
-    "expires_at": 0.0,
-}
-
-
-def _now() -> float:
-    return time.time()
-
-
-def _get_access_token(*, base_url: str, client_id: str, client_secret: str, timeout_sec: int) -> str:
-    cached = _TOKEN_CACHE.get("token")
-    expires_at = float(_TOKEN_CACHE.get("expires_at") or 0.0)
-    if cached and _now() < (expires_at - 60):
-        return str(cached)
-
-    url = f"{base_url}/token"
-    try:
-        with httpx.Client(timeout=timeout_sec) as client:
-            resp = client.post(
-                url,
-                data={
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                },
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-            )
-            resp.raise_for_status()
-            data = resp.json()
-    except Exception as e:  # noqa: BLE001
-        raise AdobePdfServicesConvertError(f"Adobe token request failed: {e}") from e
-
-    token = data.get("access_token")
-    expires_in = data.get("expires_in")
-    if not token:
-        raise AdobePdfServicesConvertError("Adobe token response missing access_token")
-
-    try:
-        expires_in_s = int(expires_in) if expires_in is not None else 3600
-    except Exception:  # noqa: BLE001
-        expires_in_s = 3600
-
-    _TOKEN_CACHE["token"] = token
-    _TOKEN_CACHE["expires_at"] = _now() + float(expires_in_s)
-    return str(token)
-
-
-def _auth_headers(*, token: str, client_id: str) -> dict[str, str]:
-    return {
-        "Authorization": f"Bearer {token}",
-        "x-api-key": client_id,
-    }
+class AdobeAssetSession:
+    """Input assets uploaded during one conversion job.
+
+    Re-submitting the same PDF content (the OCR retry, other export options, chunks
+    re-split from the same PDF) reuses the uploaded asset instead of uploading it
+    again. The input assets are deleted when the session is closed, not after each
+    export; output assets are still deleted right away.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._assets: dict[str, str] = {}  # sha256 of the PDF -> assetID
+        self._owner: tuple[AdobeClient, str] | None = None  # (client, base_url)
+        self._closed = False
+        self.uploads = 0
+        self.reuses = 0
+
+    def __enter__(self) -> AdobeAssetSession:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def lookup(self, key: str) -> str | None:
+        with self._lock:
+            asset_id = self._assets.get(key)
+            if asset_id is not None:
+                self.reuses += 1
+            return asset_id
+
+    def remember(self, key: str, asset_id: str, *, client: AdobeClient, base_url: str) -> None:
+        with self._lock:
+            self.uploads += 1
+            closed = self._closed
+            if not closed:
+                self._assets[key] = asset_id
+                self._owner = (client, base_url)
+        if closed:
+            # A cancelled export finished its upload after the job moved on.
+            get_adobe_runner().fire_and_forget(_delete_assets(client, base_url, [asset_id]), what="asset cleanup")
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._assets.pop(key, None)
+
+    def close(self) -> None:
+        with self._lock:
+            asset_ids, self._assets = list(self._assets.values()), {}
+            owner = self._owner
+            self._closed = True
+        if asset_ids and owner is not None:
+            client, base_url = owner
+            get_adobe_runner().fire_and_forget(_delete_assets(client, base_url, asset_ids), what="asset cleanup")
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
 
 def _find_asset_id(obj: Any) -> str | None:
@@ -92,166 +107,314 @@ def _find_asset_id(obj: Any) -> str | None:
     return None
 
 
-def convert_pdf_to_docx_adobe_pdf_services(
+async def _read_file_chunks(path: Path, chunk_size: int = 1024 * 1024):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def _delete_assets(client: AdobeClient, base_url: str, asset_ids: list[str]) -> None:
+    for asset_id in asset_ids:
+        try:
+            await client.arequest("DELETE", f"{base_url}/assets/{asset_id}", op="asset_delete", timeout=30)
+        except Exception:  # noqa: BLE001
+            pass
+
+
+async def _upload_input(*, client: AdobeClient, pdf_path: Path, base_url: str, timeout_sec: int) -> str:
+    import httpx
+
+    # 1) Create asset (get uploadUri)
+    try:
+        resp = await client.arequest(
+            "POST",
+            f"{base_url}/assets",
+            op="asset_create",
+            headers={"Content-Type": "application/json"},
+            json={"mediaType": "application/pdf"},
+            timeout=timeout_sec,
+        )
+        resp.raise_for_status()
+        asset_info = resp.json()
+        input_asset_id = asset_info.get("assetID")
+        upload_uri = asset_info.get("uploadUri")
+        if not input_asset_id or not upload_uri:
+            raise AdobePdfServicesConvertError("Adobe assets response missing assetID/uploadUri")
+    except Exception as e:  # noqa: BLE001
+        raise AdobePdfServicesConvertError(f"Adobe asset create failed: {e}") from e
+
+    # 2) Upload the PDF bytes to uploadUri (pre-signed URL: no auth headers). The body
+    # is streamed, so transient failures are retried here with a fresh stream.
+    try:
+        for attempt in range(client.http_retries + 1):
+            if attempt:
+                await asyncio.sleep(backoff_delay(attempt - 1, base_sec=client.retry_base_sec, cap_sec=10.0))
+            try:
+                put = await client.arequest(
+                    "PUT",
+                    upload_uri,
+                    op="upload",
+                    auth=False,
+                    content=_read_file_chunks(pdf_path),
+                    headers={"Content-Type": "application/pdf", "Content-Length": str(pdf_path.stat().st_size)},
+                    timeout=timeout_sec,
+                )
+            except httpx.TransportError:
+                if attempt >= client.http_retries:
+                    raise
+                continue
+            if put.status_code < 500 or attempt >= client.http_retries:
+                break
+        put.raise_for_status()
+    except asyncio.CancelledError:
+        get_adobe_runner().fire_and_forget(_delete_assets(client, base_url, [str(input_asset_id)]), what="asset cleanup")
+        raise
+    except Exception as e:  # noqa: BLE001
+        get_adobe_runner().fire_and_forget(_delete_assets(client, base_url, [str(input_asset_id)]), what="asset cleanup")
+        raise AdobePdfServicesConvertError(f"Adobe asset upload failed: {e}") from e
+
+    return str(input_asset_id)
+
+
+async def _export_pdf_to_docx(
     *,
+    client: AdobeClient,
     pdf_path: Path,
-    out_dir: Path,
+    out_docx: Path,
     base_url: str,
-    client_id: str,
-    client_secret: str,
     job_timeout_sec: int,
     poll_interval_ms: int,
     ocr_lang: str | None,
-) -> AdobePdfServicesConvertResult:
-    if not pdf_path.exists():
-        raise FileNotFoundError(str(pdf_path))
-
-    out_dir.mkdir(parents=True, exist_ok=True)
-    stem = safe_filename(pdf_path.stem, fallback="document")
-    out_docx = out_dir / f"{stem}.docx"
-
-    token = _get_access_token(
-        base_url=base_url,
-        client_id=client_id,
-        client_secret=client_secret,
-        timeout_sec=min(max(job_timeout_sec, 30), 300),
-    )
+    session: AdobeAssetSession | None = None,
+    content_key: str | None = None,
+) -> None:
+    """Upload -> export job -> poll -> download, awaited on the Adobe runner loop."""
 
     input_asset_id: str | None = None
     output_asset_id: str | None = None
 
     try:
-        with httpx.Client(timeout=job_timeout_sec) as client:
-            # 1) Create asset (get uploadUri)
-            try:
-                resp = client.post(
-                    f"{base_url}/assets",
-                    headers={
-                        **_auth_headers(token=token, client_id=client_id),
-                        "Content-Type": "application/json",
-                    },
-                    json={"mediaType": "application/pdf"},
+        if session is not None and content_key is not None:
+            input_asset_id = session.lookup(content_key)
+        reused = input_asset_id is not None
+        if reused:
+            mark_stage("adobe.upload", outcome="reused")
+        else:
+            with stage("adobe.upload", bytes=pdf_path.stat().st_size):
+                input_asset_id = await _upload_input(
+                    client=client, pdf_path=pdf_path, base_url=base_url, timeout_sec=job_timeout_sec
                 )
-                resp.raise_for_status()
-                asset_info = resp.json()
-                input_asset_id = asset_info.get("assetID")
-                upload_uri = asset_info.get("uploadUri")
-                if not input_asset_id or not upload_uri:
-                    raise AdobePdfServicesConvertError("Adobe assets response missing assetID/uploadUri")
-            except Exception as e:  # noqa: BLE001
-                raise AdobePdfServicesConvertError(f"Adobe asset create failed: {e}") from e
-
-            # 2) Upload the PDF bytes to uploadUri
+            if session is not None and content_key is not None:
+                session.remember(content_key, input_asset_id, client=client, base_url=base_url)
+
+        # 3) Start export job
+        payload: dict[str, Any] = {
+            "assetID": input_asset_id,
+            "targetFormat": "docx",
+        }
+        if ocr_lang:
+            payload["ocrLang"] = ocr_lang
+
+        with stage("adobe.start"):
+            start = None
             try:
-                with open(pdf_path, "rb") as f:
-                    put = client.put(
-                        upload_uri,
-                        content=f,
-                        headers={
-                            "Content-Type": "application/pdf",
-                        },
-                    )
-                put.raise_for_status()
-            except Exception as e:  # noqa: BLE001
-                raise AdobePdfServicesConvertError(f"Adobe asset upload failed: {e}") from e
-
-            # 3) Start export job
-            payload: dict[str, Any] = {
-                "assetID": input_asset_id,
-                "targetFormat": "docx",
-            }
-            if ocr_lang:
-                payload["ocrLang"] = ocr_lang
-
-            try:
-                start = client.post(
+                start = await client.arequest(
+                    "POST",
                     f"{base_url}/operation/exportpdf",
-                    headers={
-                        **_auth_headers(token=token, client_id=client_id),
-                        "Content-Type": "application/json",
-                    },
+                    op="export_start",
+                    headers={"Content-Type": "application/json"},
                     json=payload,
+                    timeout=job_timeout_sec,
                 )
+                if reused and start.status_code in {400, 404, 410}:
+                    # The reused asset is gone (expired/deleted): upload once more.
+                    session.forget(content_key)
+                    with stage("adobe.upload", bytes=pdf_path.stat().st_size, reason="reused asset gone"):
+                        input_asset_id = await _upload_input(
+                            client=client, pdf_path=pdf_path, base_url=base_url, timeout_sec=job_timeout_sec
+                        )
+                    session.remember(content_key, input_asset_id, client=client, base_url=base_url)
+                    payload["assetID"] = input_asset_id
+                    start = await client.arequest(
+                        "POST",
+                        f"{base_url}/operation/exportpdf",
+                        op="export_start",
+                        headers={"Content-Type": "application/json"},
+                        json=payload,
+                        timeout=job_timeout_sec,
+                    )
                 start.raise_for_status()
             except Exception as e:  # noqa: BLE001
                 detail = None
                 try:
-                    detail = start.text  # type: ignore[name-defined]
+                    detail = start.text if start is not None else None
                 except Exception:  # noqa: BLE001
                     pass
                 raise AdobePdfServicesConvertError(
                     f"Adobe export job create failed: {e}" + (f"; detail={detail}" if detail else "")
                 ) from e
 
-            status_url = start.headers.get("location")
-            if not status_url:
-                raise AdobePdfServicesConvertError("Adobe export job response missing Location header")
-            if status_url.startswith("/"):
-                status_url = f"{base_url}{status_url}"
-
-            # 4) Poll status
-            deadline = time.monotonic() + float(job_timeout_sec)
-            last_status = None
-            status_body: Any = None
+        status_url = start.headers.get("location")
+        if not status_url:
+            raise AdobePdfServicesConvertError("Adobe export job response missing Location header")
+        if status_url.startswith("/"):
+            status_url = f"{base_url}{status_url}"
+
+        # 4) Poll status with adaptive backoff: start at poll_interval_ms, grow x1.5 per
+        # "still running" answer up to ADOBE_POLL_MAX_INTERVAL_MS; Retry-After wins.
+        deadline = time.monotonic() + float(job_timeout_sec)
+        interval = max(poll_interval_ms, 200) / 1000.0
+        max_interval = max(settings.adobe_poll_max_interval_ms / 1000.0, interval)
+        last_status = None
+        status_body: Any = None
+        with stage("adobe.poll") as poll_stage:
             while True:
                 if time.monotonic() > deadline:
                     raise AdobePdfServicesConvertError(
                         f"Adobe export job timed out after {job_timeout_sec}s (last_status={last_status})"
                     )
 
-                r = client.get(
-                    status_url,
-                    headers=_auth_headers(token=token, client_id=client_id),
-                )
-                r.raise_for_status()
-                status_body = r.json()
-
-                status_val = str(status_body.get("status") or "").strip().lower()
-                last_status = status_val or "unknown"
-                if status_val in {"done", "succeeded", "success"}:
-                    break
-                if status_val in {"failed", "error"}:
-                    raise AdobePdfServicesConvertError(f"Adobe export job failed: {status_body}")
-
-                time.sleep(max(poll_interval_ms, 200) / 1000.0)
-
-            # 5) Get output asset ID
-            output_asset_id = _find_asset_id(status_body)
-            if not output_asset_id:
-                raise AdobePdfServicesConvertError(f"Adobe export job finished but no output assetID found: {status_body}")
-
-            # 6) Get downloadUri for the output asset, then download DOCX
+                r = await client.arequest("GET", status_url, op="poll", timeout=job_timeout_sec)
+                poll_stage["polls"] = poll_stage.get("polls", 0) + 1
+                if r.status_code == 429 or r.status_code >= 500:
+                    # Throttled / transient: wait and poll again instead of failing the job.
+                    last_status = f"http-{r.status_code}"
+                    status_body = None
+                else:
+                    r.raise_for_status()
+                    status_body = r.json()
+                    status_val = str(status_body.get("status") or "").strip().lower()
+                    last_status = status_val or "unknown"
+                    if status_val in {"done", "succeeded", "success"}:
+                        break
+                    if status_val in {"failed", "error"}:
+                        raise AdobePdfServicesConvertError(f"Adobe export job failed: {status_body}")
+
+                wait = retry_after_sec(r)
+                if wait is None:
+                    wait = interval
+                    interval = min(interval * 1.5, max_interval)
+                await asyncio.sleep(min(wait, max(deadline - time.monotonic(), 0.0) + 0.05))
+
+        # 5) Get output asset ID
+        output_asset_id = _find_asset_id(status_body)
+        if not output_asset_id:
+            raise AdobePdfServicesConvertError(f"Adobe export job finished but no output assetID found: {status_body}")
+
+        # 6) Get downloadUri for the output asset, then stream the DOCX to disk
+        with stage("adobe.download"):
             try:
-                meta = client.get(
-                    f"{base_url}/assets/{output_asset_id}",
-                    headers=_auth_headers(token=token, client_id=client_id),
+                meta = await client.arequest(
+                    "GET", f"{base_url}/assets/{output_asset_id}", op="asset_get", timeout=job_timeout_sec
                 )
                 meta.raise_for_status()
                 download_uri = meta.json().get("downloadUri")
                 if not download_uri:
                     raise AdobePdfServicesConvertError("Adobe asset get missing downloadUri")
 
-                docx_resp = client.get(download_uri)
-                docx_resp.raise_for_status()
-                out_docx.write_bytes(docx_resp.content)
+                await client.adownload(download_uri, out_docx, timeout_sec=job_timeout_sec)
             except Exception as e:  # noqa: BLE001
                 raise AdobePdfServicesConvertError(f"Adobe download failed: {e}") from e
-
-        return AdobePdfServicesConvertResult(docx_path=out_docx)
     finally:
-        # Best-effort cleanup of transient assets
+        # Best-effort cleanup of transient assets, off the critical path. Session-owned
+        # inputs are deleted when the session closes.
+        asset_ids = [a for a in (None if session is not None else input_asset_id, output_asset_id) if a]
+        if asset_ids:
+            get_adobe_runner().fire_and_forget(_delete_assets(client, base_url, asset_ids), what="asset cleanup")
+
+
+def _wait_for_job(future: concurrent.futures.Future, *, timeout_sec: float, cancel: threading.Event | None) -> None:
+    """`future.result(timeout_sec)` that also cancels the job once `cancel` is set."""
+
+    if cancel is None:
+        future.result(timeout=timeout_sec)
+        return
+    deadline = time.monotonic() + timeout_sec
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise concurrent.futures.TimeoutError()
         try:
-            cleanup_token = _get_access_token(
+            future.result(timeout=min(remaining, 0.2))
+            return
+        except concurrent.futures.TimeoutError:
+            if cancel.is_set():
+                future.cancel()
+                raise concurrent.futures.CancelledError() from None
+
+
+def convert_pdf_to_docx_adobe_pdf_services(
+    *,
+    pdf_path: Path,
+    out_dir: Path,
+    base_url: str,
+    client_id: str,
+    client_secret: str,
+    job_timeout_sec: int,
+    poll_interval_ms: int,
+    ocr_lang: str | None,
+    session: AdobeAssetSession | None = None,
+    cancel: threading.Event | None = None,
+) -> AdobePdfServicesConvertResult:
+    """Blocking entry point; the HTTP work runs on the shared Adobe runner loop.
+
+    With a `session`, an input asset already uploaded for the same PDF content is
+    reused and left for the session to delete. Setting `cancel` abandons the job
+    (the coroutine is cancelled and its assets cleaned up).
+    """
+
+    if not pdf_path.exists():
+        raise FileNotFoundError(str(pdf_path))
+    if cancel is not None and cancel.is_set():
+        raise AdobePdfServicesConvertError("Adobe export cancelled")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = safe_filename(pdf_path.stem, fallback="document")
+    out_docx = out_dir / f"{stem}.docx"
+
+    # Shared pooled client: keep-alive connections and one token for all jobs.
+    client = get_adobe_client(base_url=base_url, client_id=client_id, client_secret=client_secret)
+    try:
+        client.access_token()
+    except AdobeAuthError as e:
+        raise AdobePdfServicesConvertError(str(e)) from e
+
+    content_key = _sha256_file(pdf_path) if session is not None else None
+    queue_timeout_sec = float(settings.adobe_queue_timeout_sec)
+
+    async def _governed() -> None:
+        # Wait for an Adobe job slot on the loop; the caller's thread holds no CPU slot.
+        t_queue = time.perf_counter()
+        async with client.governor.job_slot(timeout_sec=queue_timeout_sec):
+            record_stage("adobe.queue", t_queue)
+            await _export_pdf_to_docx(
+                client=client,
+                pdf_path=pdf_path,
+                out_docx=out_docx,
                 base_url=base_url,
-                client_id=client_id,
-                client_secret=client_secret,
-                timeout_sec=30,
+                job_timeout_sec=job_timeout_sec,
+                poll_interval_ms=poll_interval_ms,
+                ocr_lang=ocr_lang,
+                session=session,
+                content_key=content_key,
             )
-            headers = _auth_headers(token=cleanup_token, client_id=client_id)
-            with httpx.Client(timeout=30) as c:
-                if input_asset_id:
-                    c.delete(f"{base_url}/assets/{input_asset_id}", headers=headers)
-                if output_asset_id:
-                    c.delete(f"{base_url}/assets/{output_asset_id}", headers=headers)
-        except Exception:  # noqa: BLE001
-            pass
+
+    future = get_adobe_runner().submit(_governed)
+    try:
+        # The coroutine enforces job_timeout_sec per phase; this only guards a stuck loop.
+        _wait_for_job(future, timeout_sec=queue_timeout_sec + float(job_timeout_sec) * 3 + 30, cancel=cancel)
+    except concurrent.futures.CancelledError as e:
+        raise AdobePdfServicesConvertError("Adobe export cancelled") from e
+    except concurrent.futures.TimeoutError as e:
+        future.cancel()
+        raise AdobePdfServicesConvertError(f"Adobe export job timed out after {job_timeout_sec}s") from e
+    except (AdobeAuthError, AdobeQueueTimeout) as e:
+        raise AdobePdfServicesConvertError(str(e)) from e
+    except AdobePdfServicesConvertError:
+        raise
+    except Exception as e:  # noqa: BLE001
+        raise AdobePdfServicesConvertError(f"Adobe export job failed: {e}") from e
+    return AdobePdfServicesConvertResult(docx_path=out_docx)
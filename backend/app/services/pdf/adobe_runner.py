@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Coroutine
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdobeRunner:
+    """One daemon thread running an asyncio loop for all Adobe job I/O.
+
+    Upload/poll/download are awaited on this loop, so hundreds of Adobe jobs in
+    flight cost one thread instead of one blocked conversion worker each. Callers
+    get a `concurrent.futures.Future`; background work (asset cleanup) is scheduled
+    with `fire_and_forget` and never delays a result.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._background: set[asyncio.Task] = set()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.background_failures = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, name="adobe-runner", daemon=True)
+            self._thread.start()
+            ready.wait(10)
+            self._loop = loop
+            return loop
+
+    def submit(self, coro_fn: Callable[[], Coroutine[Any, Any, Any]]) -> concurrent.futures.Future:
+        """Run `coro_fn()` on the runner loop; cancel the returned future to cancel it."""
+
+        loop = self._ensure_loop()
+        with self._lock:
+            self.submitted += 1
+
+        async def _tracked() -> Any:
+            with self._lock:
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                result = await coro_fn()
+            except BaseException:
+                with self._lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+            with self._lock:
+                self.completed += 1
+            return result
+
+        return asyncio.run_coroutine_threadsafe(_tracked(), loop)
+
+    def fire_and_forget(self, coro: Awaitable[Any], *, what: str) -> None:
+        """Schedule `coro` on the loop (from any thread); failures are only logged."""
+
+        async def _guarded() -> None:
+            try:
+                await coro
+            except Exception as e:  # noqa: BLE001
+                with self._lock:
+                    self.background_failures += 1
+                logger.debug("Adobe background task %s failed: %s", what, e)
+
+        def _schedule() -> None:
+            task = loop.create_task(_guarded())
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        loop = self._ensure_loop()
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            _schedule()
+        else:
+            loop.call_soon_threadsafe(_schedule)
+
+    def shutdown(self, timeout_sec: float = 5.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+
+        async def _drain() -> None:
+            # Give pending cleanups a moment, then cancel whatever is left.
+            if self._background:
+                await asyncio.wait(set(self._background), timeout=timeout_sec)
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_drain(), loop).result(timeout=timeout_sec + 1)
+        except Exception:  # noqa: BLE001
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout_sec)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "background_pending": len(self._background),
+                "background_failures": self.background_failures,
+            }
+
+
+_runner = AdobeRunner()
+
+
+def get_adobe_runner() -> AdobeRunner:
+    return _runner
+
+
+def adobe_runner_stats() -> dict:
+    return _runner.stats()
+
+
+def shutdown_adobe_runner() -> None:
+    _runner.shutdown()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import io
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from ...core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_font_settings = None
+_stats: dict = {
+    "load_ms": None,
+    "sources": 0,
+    "font_dirs": [],
+    "search_cache": "disabled",  # hit | miss | error | disabled
+    "uses": 0,
+}
+
+
+def font_dirs() -> list[Path]:
+    dirs: list[Path] = []
+    for raw in (settings.aspose_font_dirs or "").split(os.pathsep):
+        raw = raw.strip()
+        if raw:
+            dirs.append(Path(raw))
+    seen: set[Path] = set()
+    out: list[Path] = []
+    for d in dirs:
+        if d.is_dir() and d not in seen:
+            seen.add(d)
+            out.append(d)
+    return out
+
+
+def _build():
+    import aspose.words as aw
+
+    t0 = time.perf_counter()
+    dirs = font_dirs()
+    sources = [aw.fonts.SystemFontSource()]
+    sources += [aw.fonts.FolderFontSource(str(d), True) for d in dirs]
+
+    fs = aw.fonts.FontSettings()
+    cache_path = Path(settings.aspose_font_cache_path) if settings.aspose_font_cache_path else None
+    cache_state = "disabled"
+    if cache_path is not None:
+        cache_state = "miss"
+        if cache_path.exists():
+            try:
+                # The search cache lets Aspose skip re-scanning unchanged font files.
+                with cache_path.open("rb") as f:
+                    fs.set_fonts_sources(sources, io.BytesIO(f.read()))
+                cache_state = "hit"
+            except Exception:  # noqa: BLE001
+                logger.warning("Ignoring unreadable Aspose font cache %s", cache_path)
+                cache_state = "error"
+    if cache_state != "hit":
+        fs.set_fonts_sources(sources)
+        if cache_path is not None:
+            try:
+                cache_buf = io.BytesIO()
+                fs.save_search_cache(cache_buf)
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = cache_path.with_suffix(cache_path.suffix + f".{os.getpid()}.tmp")
+                tmp.write_bytes(cache_buf.getvalue())
+                tmp.replace(cache_path)
+            except Exception:  # noqa: BLE001
+                logger.warning("Could not write Aspose font cache %s", cache_path)
+                cache_state = "error"
+
+    _stats.update(
+        load_ms=int((time.perf_counter() - t0) * 1000),
+        sources=len(sources),
+        font_dirs=[str(d) for d in dirs],
+        search_cache=cache_state,
+    )
+    return fs
+
+
+def get_font_settings():
+    """Process-wide Aspose FontSettings, built once (font scan + search cache)."""
+
+    global _font_settings
+
+    with _lock:
+        if _font_settings is None:
+            _font_settings = _build()
+        _stats["uses"] += 1
+        return _font_settings
+
+
+def font_settings_stats() -> dict:
+    with _lock:
+        return dict(_stats)
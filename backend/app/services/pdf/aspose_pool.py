@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from pathlib import Path
+
+from ...core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsposePoolError(RuntimeError):
+    pass
+
+
+class AsposePoolTimeout(AsposePoolError):
+    pass
+
+
+class AsposePoolCancelled(AsposePoolError):
+    pass
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        import resource
+
+        # ru_maxrss is KiB on Linux.
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) * 1024
+    except Exception:  # noqa: BLE001
+        # Not available on Windows; RSS-based recycling is then disabled.
+        return 0
+
+
+def _worker_main(conn) -> None:
+    """Worker process: import Aspose once, then convert jobs received over the pipe.
+
+    Protocol: parent sends (pdf_path, out_docx) or None (exit); worker replies
+    ("ready", font_stats, rss) once, then ("ok", font_stats, rss) /
+    ("error", message, rss) per job.
+    """
+
+    try:
+        import aspose.words  # noqa: F401  (warm import + .NET runtime start)
+
+        from .aspose_fonts import font_settings_stats, get_font_settings
+        from .aspose_words_convert import convert_with_aspose
+    except Exception as e:  # noqa: BLE001
+        conn.send(("error", f"Aspose.Words unavailable: {e}", 0))
+        return
+    try:
+        # Scan fonts before the first job instead of during it.
+        get_font_settings()
+    except Exception:  # noqa: BLE001
+        logger.exception("Aspose font settings failed to load")
+    conn.send(("ready", font_settings_stats(), _peak_rss_bytes()))
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        pdf_path, out_docx = job
+        try:
+            convert_with_aspose(pdf_path=Path(pdf_path), out_docx=Path(out_docx))
+            conn.send(("ok", font_settings_stats(), _peak_rss_bytes()))
+        except Exception as e:  # noqa: BLE001
+            conn.send(("error", str(e), _peak_rss_bytes()))
+
+
+class _Worker:
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.proc: multiprocessing.Process | None = None
+        self.conn = None
+        self.docs_done = 0
+        self.rss_bytes = 0
+        self.font_stats: dict | None = None
+
+    def start(self, startup_timeout_sec: int) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe(duplex=True)
+        proc = ctx.Process(target=_worker_main, args=(child_conn,), name=f"aspose-worker-{self.index}", daemon=True)
+        proc.start()
+        child_conn.close()
+        self.proc, self.conn = proc, parent_conn
+        self.docs_done = 0
+
+        if not parent_conn.poll(startup_timeout_sec):
+            self.kill()
+            raise AsposePoolError(f"Aspose worker {self.index} did not start in {startup_timeout_sec}s")
+        try:
+            msg = parent_conn.recv()
+        except (EOFError, OSError) as e:
+            self.kill()
+            raise AsposePoolError(f"Aspose worker {self.index} died during startup") from e
+        if msg[0] != "ready":
+            self.kill()
+            raise AsposePoolError(msg[1])
+        self.font_stats, self.rss_bytes = msg[1], msg[2]
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.is_alive()
+
+    def kill(self) -> None:
+        if self.proc is not None:
+            try:
+                self.proc.kill()
+                self.proc.join(timeout=5)
+            except Exception:  # noqa: BLE001
+                pass
+        self._close_conn()
+        self.proc = None
+
+    def stop(self) -> None:
+        if self.proc is not None and self.proc.is_alive():
+            try:
+                self.conn.send(None)
+                self.proc.join(timeout=10)
+            except Exception:  # noqa: BLE001
+                pass
+        self.kill()
+
+    def _close_conn(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:  # noqa: BLE001
+                pass
+            self.conn = None
+
+
+class AsposeWorkerPool:
+    """Pool of prewarmed Aspose.Words worker processes.
+
+    - Workers import aspose.words at start, so jobs skip the import/.NET startup.
+    - Each conversion has a hard timeout; a stuck worker is killed and respawned.
+    - Workers are recycled after `max_docs` conversions or when their peak RSS
+      exceeds `max_rss_mb` (Aspose doesn't return memory to the OS).
+    - Respawns and the initial warm-up run on background threads; a job only boots a
+      worker itself when the one it checked out is not running.
+    """
+
+    def __init__(self, *, size: int, max_docs: int, max_rss_mb: int, startup_timeout_sec: int = 120) -> None:
+        self.size = max(int(size), 1)
+        self.max_docs = max(int(max_docs), 1)
+        self.max_rss_bytes = max(int(max_rss_mb), 0) * 1024 * 1024
+        self.startup_timeout_sec = startup_timeout_sec
+        self._workers = [_Worker(i) for i in range(self.size)]
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        for w in self._workers:
+            self._idle.put(w)
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self.conversions = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.recycles = 0
+        self.respawns = 0
+        self.startup_ms: int | None = None
+
+    def start(self) -> None:
+        """Boot the idle workers ahead of the first jobs (startup thread, not a request)."""
+
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        t0 = time.perf_counter()
+        for _ in range(self.size):
+            try:
+                # Workers already checked out are booted by their job.
+                w = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                if not w.alive() and not self._closed:
+                    w.start(self.startup_timeout_sec)
+            except Exception:  # noqa: BLE001
+                # Checkout retries the start; keep the slot in rotation.
+                logger.exception("Aspose worker %s failed to start", w.index)
+            finally:
+                self._idle.put(w)
+        with self._lock:
+            self.startup_ms = int((time.perf_counter() - t0) * 1000)
+
+    def _respawn(self, w: _Worker) -> None:
+        w.stop()
+        with self._lock:
+            self.respawns += 1
+        w.start(self.startup_timeout_sec)
+
+    def _respawn_in_background(self, w: _Worker) -> None:
+        """Respawn `w` off the caller's thread (which may hold a CPU slot), then hand it back."""
+
+        def _run() -> None:
+            try:
+                if not self._closed:
+                    self._respawn(w)
+                if self._closed:
+                    w.stop()
+            except Exception:  # noqa: BLE001
+                # Left dead; the next checkout respawns it.
+                logger.exception("Aspose worker %s failed to respawn", w.index)
+            finally:
+                self._idle.put(w)
+
+        threading.Thread(target=_run, name=f"aspose-respawn-{w.index}", daemon=True).start()
+
+    @staticmethod
+    def _wait_reply(w: _Worker, *, timeout_sec: float, cancel: threading.Event | None) -> str:
+        """Wait for the worker's reply: "ready", "timeout" or "cancelled"."""
+
+        if cancel is None:
+            return "ready" if w.conn.poll(timeout_sec) else "timeout"
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "timeout"
+            if w.conn.poll(min(remaining, 0.2)):
+                return "ready"
+            if cancel.is_set():
+                return "cancelled"
+
+    def convert(self, *, pdf_path: Path, out_docx: Path, timeout_sec: int, cancel: threading.Event | None = None) -> None:
+        """Convert in a worker; setting `cancel` kills the worker mid-job (it is respawned)."""
+
+        if self._closed:
+            raise AsposePoolError("Aspose pool is shut down")
+        if cancel is not None and cancel.is_set():
+            raise AsposePoolCancelled("Aspose.Words conversion cancelled")
+        try:
+            w = self._idle.get(timeout=max(int(timeout_sec), 1))
+        except queue.Empty as e:
+            raise AsposePoolTimeout("No Aspose worker available") from e
+
+        broken = False
+        try:
+            if not w.alive():
+                self._respawn(w)
+            w.conn.send((str(pdf_path), str(out_docx)))
+            reply = self._wait_reply(w, timeout_sec=max(int(timeout_sec), 1), cancel=cancel)
+            if reply == "cancelled":
+                broken = True
+                with self._lock:
+                    self.cancelled += 1
+                raise AsposePoolCancelled("Aspose.Words conversion cancelled")
+            if reply == "timeout":
+                broken = True
+                with self._lock:
+                    self.timeouts += 1
+                raise AsposePoolTimeout(f"Aspose.Words conversion timed out after {timeout_sec}s")
+            try:
+                msg = w.conn.recv()
+            except (EOFError, OSError) as e:
+                broken = True
+                raise AsposePoolError("Aspose worker crashed during conversion") from e
+
+            w.docs_done += 1
+            w.rss_bytes = msg[-1]
+            if msg[0] != "ok":
+                raise AsposePoolError(msg[1])
+            w.font_stats = msg[1]
+            with self._lock:
+                self.conversions += 1
+        except AsposePoolCancelled:
+            raise
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            self._checkin(w, broken=broken)
+
+    def _checkin(self, w: _Worker, *, broken: bool) -> None:
+        if self._closed:
+            w.stop()
+        elif broken:
+            # Stop the stuck/cancelled job now; the new worker boots in the background.
+            w.kill()
+            self._respawn_in_background(w)
+            return
+        elif w.docs_done >= self.max_docs or (self.max_rss_bytes and w.rss_bytes > self.max_rss_bytes):
+            with self._lock:
+                self.recycles += 1
+            self._respawn_in_background(w)
+            return
+        self._idle.put(w)
+
+    def shutdown(self) -> None:
+        self._closed = True
+        for w in self._workers:
+            w.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": self._idle.qsize(),
+                "max_docs": self.max_docs,
+                "max_rss_mb": self.max_rss_bytes // (1024 * 1024),
+                "startup_ms": self.startup_ms,
+                "conversions": self.conversions,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "cancelled": self.cancelled,
+                "recycles": self.recycles,
+                "respawns": self.respawns,
+                "worker_rss_mb": [round(w.rss_bytes / (1024 * 1024), 1) for w in self._workers],
+                "worker_fonts": [w.font_stats for w in self._workers],
+            }
+
+
+_pool: AsposeWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_aspose_pool() -> AsposeWorkerPool:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = AsposeWorkerPool(
+                size=settings.aspose_pool_size,
+                max_docs=settings.aspose_pool_max_docs,
+                max_rss_mb=settings.aspose_pool_max_rss_mb,
+                startup_timeout_sec=settings.aspose_pool_startup_sec,
+            )
+        return _pool
+
+
+def aspose_pool_stats() -> dict | None:
+    with _pool_lock:
+        return _pool.stats() if _pool is not None else None
+
+
+def start_aspose_pool() -> None:
+    """Prewarm workers in the background (only if Aspose.Words is installed)."""
+
+    if settings.aspose_pool_size <= 0:
+        return
+
+    def _start() -> None:
+        from .toolchain import get_toolchain
+
+        if get_toolchain().aspose_words:
+            get_aspose_pool().start()
+
+    threading.Thread(target=_start, name="aspose-pool-start", daemon=True).start()
+
+
+def shutdown_aspose_pool() -> None:
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 
+from ...core.config import settings
 from ...utils.files import safe_filename
+from .docx_postprocess import postprocess_docx
 
 
 class AsposeWordsConvertError(RuntimeError):
@@ -22,53 +25,63 @@ def remove_aspose_watermark(docx_path: str | Path) -> None:
     - "Created with an evaluation copy of Aspose.Words..."
     - "Evaluation Only"
     - Các phần khác của text watermark
+
+    Pipeline gọi `postprocess_docx(remove_watermark=True)` trực tiếp để gộp bước này
+    với chuẩn hoá ngắt trang trong một lần ghi file.
     """
     try:
-        from docx import Document
-        
-        doc = Document(str(docx_path))
-        paragraphs_to_delete = []
-        
-        # Tìm các paragraph chứa watermark
-        watermark_keywords = [
-            "Evaluation Only",
-            "Aspose.Words",
-            "evaluation copy",
-            "temporary-license",
-            "products.aspose.com",
-            "Created with an evaluation copy",
-        ]
-        
-        for para in doc.paragraphs:
-            para_text = para.text.lower()
-            # Kiểm tra nếu paragraph chứa bất kỳ keyword nào
-            if any(keyword.lower() in para_text for keyword in watermark_keywords):
-                paragraphs_to_delete.append(para)
-        
-        # Xóa các paragraph chứa watermark
-        for para in paragraphs_to_delete:
-            p = para._element
-            parent = p.getparent()
-            if parent is not None:
-                parent.remove(p)
-                para._p = None
-                para._element = None
-        
-        # Lưu file sau khi xóa watermark
-        doc.save(str(docx_path))
+        postprocess_docx(docx_path=Path(docx_path), remove_watermark=True)
     except Exception:  # noqa: BLE001
         # Nếu có lỗi khi xóa watermark, không làm gián đoạn quá trình chuyển đổi
         pass
 
 
-def convert_pdf_to_docx_aspose_words(*, pdf_path: Path, out_dir: Path) -> AsposeWordsConvertResult:
+def convert_with_aspose(*, pdf_path: Path, out_docx: Path) -> None:
+    """Run the Aspose.Words conversion in the current process."""
+
+    import aspose.words as aw
+
+    from .aspose_fonts import get_font_settings
+
+    # Dùng chung FontSettings (đã quét font sẵn) thay vì quét lại cho mỗi tài liệu
+    font_settings = get_font_settings()
+
+    # Load PDF với options
+    load_options = aw.loading.PdfLoadOptions()
+    load_options.skip_pdf_images = False
+    load_options.font_settings = font_settings
+    doc = aw.Document(str(pdf_path), load_options)
+    doc.font_settings = font_settings
+
+    # Cấu hình nhúng font (embed fonts) để đảm bảo hiển thị đúng
+    font_infos = doc.font_infos
+    font_infos.embed_true_type_fonts = True
+    font_infos.embed_system_fonts = True
+    font_infos.save_subset_fonts = True  # Chỉ nhúng các ký tự được dùng để giảm dung lượng
+
+    # Tối ưu layout
+    doc.update_page_layout()
+
+    # Lưu file DOCX
+    doc.save(str(out_docx), aw.SaveFormat.DOCX)
+
+
+def convert_pdf_to_docx_aspose_words(
+    *,
+    pdf_path: Path,
+    out_dir: Path,
+    remove_watermark: bool = True,
+    cancel: threading.Event | None = None,
+) -> AsposeWordsConvertResult:
     """Convert PDF → DOCX using Aspose.Words.
 
     Notes:
     - Aspose.Words is commercial. Without a license it may add evaluation watermarks.
     - It does NOT perform OCR by itself; for scanned PDFs, run OCR first.
-    - Watermarks are automatically removed after conversion.
+    - Watermarks are removed after conversion unless remove_watermark=False (the
+      caller then removes them in its own post-processing pass).
     - Fonts are embedded in the output DOCX for better compatibility.
+    - Setting `cancel` stops a pooled conversion early (in-process runs can't be stopped).
     """
 
     if not pdf_path.exists():
@@ -79,30 +92,22 @@ def convert_pdf_to_docx_aspose_words(*, pdf_path: Path, out_dir: Path) -> Aspose
     out_docx = out_dir / f"{stem}.docx"
 
     try:
-        import aspose.words as aw
-
-        # Load PDF với options
-        load_options = aw.loading.PdfLoadOptions()
-        load_options.skip_pdf_images = False
-        doc = aw.Document(str(pdf_path), load_options)
-
-        # Cấu hình nhúng font (embed fonts) để đảm bảo hiển thị đúng
-        font_infos = doc.font_infos
-        font_infos.embed_true_type_fonts = True
-        font_infos.embed_system_fonts = True
-        font_infos.save_subset_fonts = True  # Chỉ nhúng các ký tự được dùng để giảm dung lượng
-
-        # Tối ưu layout
-        doc.update_page_layout()
+        if settings.aspose_pool_size > 0:
+            # Prewarmed worker processes (hard timeout, recycling); see aspose_pool.
+            from .aspose_pool import get_aspose_pool
 
-        # Lưu file DOCX
-        doc.save(str(out_docx), aw.SaveFormat.DOCX)
+            get_aspose_pool().convert(
+                pdf_path=pdf_path, out_docx=out_docx, timeout_sec=settings.aspose_timeout_sec, cancel=cancel
+            )
+        else:
+            convert_with_aspose(pdf_path=pdf_path, out_docx=out_docx)
 
         if not out_docx.exists():
             raise AsposeWordsConvertError("Aspose.Words did not produce a DOCX output")
 
         # Xóa watermark tự động sau khi chuyển đổi
-        remove_aspose_watermark(out_docx)
+        if remove_watermark:
+            remove_aspose_watermark(out_docx)
 
         return AsposeWordsConvertResult(docx_path=out_docx)
 
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import shutil
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from ...utils.files import safe_filename
+from .docx_merge import merge_docx_parts
+from .stages import stage
+
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkedConversionError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class PdfChunk:
+    index: int
+    start_page: int  # 0-based, inclusive
+    end_page: int  # exclusive
+    pdf_path: Path
+
+    @property
+    def label(self) -> str:
+        return f"pages {self.start_page + 1}-{self.end_page}"
+
+
+@dataclass(frozen=True)
+class ChunkedConversionResult:
+    docx_path: Path
+    chunks: int
+    retries: int
+
+
+def split_pdf(*, pdf_path: Path, out_dir: Path, pages_per_chunk: int) -> list[PdfChunk]:
+    """Write consecutive page ranges of `pdf_path` as standalone PDFs."""
+
+    import fitz  # PyMuPDF
+
+    per_chunk = max(int(pages_per_chunk), 1)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    chunks: list[PdfChunk] = []
+    src = fitz.open(str(pdf_path))
+    try:
+        for index, start in enumerate(range(0, src.page_count, per_chunk)):
+            end = min(start + per_chunk, src.page_count)
+            dst = fitz.open()
+            try:
+                dst.insert_pdf(src, from_page=start, to_page=end - 1)
+                chunk_path = out_dir / f"chunk{index:04d}.pdf"
+                # no_new_id: re-splitting yields byte-identical chunks, so uploaded
+                # Adobe input assets can be reused by content hash.
+                dst.save(str(chunk_path), garbage=3, deflate=True, no_new_id=True)
+            finally:
+                dst.close()
+            chunks.append(PdfChunk(index=index, start_page=start, end_page=end, pdf_path=chunk_path))
+    finally:
+        src.close()
+    return chunks
+
+
+def convert_pdf_in_chunks(
+    *,
+    pdf_path: Path,
+    work_dir: Path,
+    convert_chunk: Callable[[Path, Path], Path],
+    pages_per_chunk: int,
+    workers: int,
+    retries: int,
+) -> ChunkedConversionResult:
+    """Convert `pdf_path` chunk by chunk with any engine and merge the DOCX parts.
+
+    `convert_chunk(chunk_pdf, out_dir)` converts one chunk and returns its DOCX. Chunks
+    run concurrently on `workers` threads (engines here are HTTP calls or worker
+    processes, so threads are enough). A failing chunk is retried on its own up to
+    `retries` times; only when it keeps failing is the whole conversion abandoned.
+    Parts are merged with docx_merge (raises DocxMergeError if they can't be).
+    """
+
+    stem = safe_filename(pdf_path.stem, fallback="document")
+    chunks_dir = work_dir / f".{stem}.chunks"
+    out_docx = work_dir / f"{stem}.docx"
+    retried: list[int] = []  # one entry per retry (list.append is thread-safe)
+
+    def run(chunk: PdfChunk) -> Path:
+        last_error: Exception | None = None
+        for attempt in range(max(int(retries), 0) + 1):
+            if attempt:
+                retried.append(chunk.index)
+                time.sleep(min(2 ** (attempt - 1), 10))
+            try:
+                out_dir = chunks_dir / f"out{chunk.index:04d}-{attempt}"
+                with stage("chunk", pages=chunk.label, attempt=attempt + 1):
+                    docx_path = convert_chunk(chunk.pdf_path, out_dir)
+                    if not docx_path.exists():
+                        raise ChunkedConversionError(f"No DOCX for {chunk.label}")
+                return docx_path
+            except Exception as e:  # noqa: BLE001
+                last_error = e
+                logger.warning("Chunk %s (%s) failed on attempt %s: %s", chunk.index, chunk.label, attempt + 1, e)
+        raise ChunkedConversionError(f"{chunk.label} failed after {int(retries) + 1} attempts: {last_error}") from last_error
+
+    try:
+        try:
+            with stage("chunk-split"):
+                chunks = split_pdf(pdf_path=pdf_path, out_dir=chunks_dir, pages_per_chunk=pages_per_chunk)
+        except Exception as e:  # noqa: BLE001
+            raise ChunkedConversionError(f"Cannot split PDF: {e}") from e
+        if not chunks:
+            raise ChunkedConversionError("PDF has 0 pages")
+
+        with ThreadPoolExecutor(max_workers=max(min(int(workers), len(chunks)), 1), thread_name_prefix="pdf-chunk") as pool:
+            # Each chunk runs in a copy of the job's context (stage/routing traces live there).
+            futures = [pool.submit(contextvars.copy_context().run, run, chunk) for chunk in chunks]
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for fut in pending:
+                fut.cancel()
+            for fut in futures:
+                if fut in done and fut.exception() is not None:
+                    raise fut.exception()
+            parts = [fut.result() for fut in futures]
+
+        with stage("chunk-merge", parts=len(parts)):
+            merge_docx_parts(parts=parts, out_docx=out_docx)
+        return ChunkedConversionResult(docx_path=out_docx, chunks=len(chunks), retries=len(retried))
+    finally:
+        shutil.rmtree(chunks_dir, ignore_errors=True)
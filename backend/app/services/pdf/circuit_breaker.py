@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, TypeVar
+
+from ...core.config import settings
+
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+def _caused_by(exc: BaseException, types: tuple[type[BaseException], ...]) -> bool:
+    """True if `exc` or an exception it was raised `from` is one of `types`."""
+
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        if isinstance(current, types):
+            return True
+        seen.add(id(current))
+        current = current.__cause__
+    return False
+
+
+def backoff_delay(attempt: int, *, base_sec: float, cap_sec: float) -> float:
+    """Full-jitter exponential backoff for retry `attempt` (0-based)."""
+
+    return random.uniform(0.0, min(cap_sec, base_sec * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Rolling-window breaker for one conversion engine.
+
+    Outcomes of the last `window_sec` are kept. Once at least `min_calls` were seen,
+    the breaker opens when the failure rate reaches `failure_rate` or the share of
+    calls slower than `slow_call_sec` reaches `slow_rate`. While open, calls are
+    rejected immediately; after `open_sec` one probe is let through (half-open):
+    success closes the breaker, failure re-opens it for twice as long (up to
+    `max_open_sec`).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_sec: float,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_sec: float,
+        slow_rate: float,
+        open_sec: float,
+        max_open_sec: float,
+    ) -> None:
+        self.name = name
+        self.window_sec = float(window_sec)
+        self.min_calls = max(int(min_calls), 1)
+        self.failure_rate = float(failure_rate)
+        self.slow_call_sec = float(slow_call_sec)
+        self.slow_rate = float(slow_rate)
+        self.base_open_sec = max(float(open_sec), 1.0)
+        self.max_open_sec = max(float(max_open_sec), self.base_open_sec)
+        self._lock = threading.Lock()
+        self._outcomes: deque[tuple[float, bool, bool]] = deque()  # (time, ok, slow)
+        self.state = CLOSED
+        self._open_sec = self.base_open_sec
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.opened = 0
+        self.last_error: str | None = None
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_sec:
+            self._outcomes.popleft()
+
+    def allow(self) -> bool:
+        """True if a call may go ahead (and, when half-open, claims the probe)."""
+
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self._open_sec:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, *, ok: bool, elapsed_sec: float, error: str | None = None) -> None:
+        now = time.monotonic()
+        slow = elapsed_sec >= self.slow_call_sec
+        with self._lock:
+            if not ok:
+                self.last_error = error
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                if ok and not slow:
+                    self.state = CLOSED
+                    self._open_sec = self.base_open_sec
+                    self._outcomes.clear()
+                else:
+                    self._open_sec = min(self._open_sec * 2, self.max_open_sec)
+                    self._trip(now)
+                return
+            self._outcomes.append((now, ok, slow))
+            self._trim(now)
+            if self.state != CLOSED or len(self._outcomes) < self.min_calls:
+                return
+            total = len(self._outcomes)
+            failures = sum(1 for _t, good, _s in self._outcomes if not good)
+            slow_calls = sum(1 for _t, _g, is_slow in self._outcomes if is_slow)
+            if failures / total >= self.failure_rate or slow_calls / total >= self.slow_rate:
+                self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        self.state = OPEN
+        self._opened_at = now
+        self.opened += 1
+
+    def abandon(self) -> None:
+        """A call was cancelled by the caller: no outcome, but free the half-open probe."""
+
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        *,
+        cancel: threading.Event | None = None,
+        ignore: tuple[type[BaseException], ...] = (),
+    ) -> T:
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open (last error: {self.last_error or 'n/a'})")
+        t0 = time.monotonic()
+        try:
+            result = fn()
+        except BaseException as e:
+            if (cancel is not None and cancel.is_set()) or (ignore and _caused_by(e, ignore)):
+                # Losing a hedge, or local backpressure (`ignore`), says nothing about
+                # the engine's health.
+                self.abandon()
+                raise
+            self.record(ok=False, elapsed_sec=time.monotonic() - t0, error=str(e)[:300])
+            raise
+        self.record(ok=True, elapsed_sec=time.monotonic() - t0)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            total = len(self._outcomes)
+            failures = sum(1 for _t, good, _s in self._outcomes if not good)
+            slow_calls = sum(1 for _t, _g, is_slow in self._outcomes if is_slow)
+            return {
+                "state": self.state,
+                "window_calls": total,
+                "failure_rate": round(failures / total, 3) if total else None,
+                "slow_rate": round(slow_calls / total, 3) if total else None,
+                "open_for_sec": round(max(self._open_sec - (now - self._opened_at), 0.0), 1) if self.state == OPEN else 0,
+                "times_opened": self.opened,
+                "rejected": self.rejected,
+                "last_error": self.last_error,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(engine: str, *, slow_call_sec: float | None = None) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(engine)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                engine,
+                window_sec=settings.breaker_window_sec,
+                min_calls=settings.breaker_min_calls,
+                failure_rate=settings.breaker_failure_rate,
+                slow_call_sec=slow_call_sec if slow_call_sec is not None else settings.breaker_slow_call_sec,
+                slow_rate=settings.breaker_slow_rate,
+                open_sec=settings.breaker_open_sec,
+                max_open_sec=settings.breaker_max_open_sec,
+            )
+            _breakers[engine] = breaker
+        return breaker
+
+
+def call_with_breaker(
+    engine: str,
+    fn: Callable[[], T],
+    *,
+    error_cls: type[Exception],
+    slow_call_sec: float | None = None,
+    cancel: threading.Event | None = None,
+    ignore: tuple[type[BaseException], ...] = (),
+) -> T:
+    """Run `fn` through the engine's breaker; an open breaker raises `error_cls` at once.
+
+    Failures after `cancel` was set, or caused by one of `ignore` (e.g. our own queue
+    timing out), are not counted against the engine.
+    """
+
+    if not settings.breaker_enabled:
+        return fn()
+    try:
+        return get_breaker(engine, slow_call_sec=slow_call_sec).call(fn, cancel=cancel, ignore=ignore)
+    except CircuitOpenError as e:
+        raise error_cls(str(e)) from e
+
+
+def breaker_stats() -> dict:
+    with _breakers_lock:
+        return {name: breaker.stats() for name, breaker in sorted(_breakers.items())}
@@ -2,22 +2,16 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from .pdf_profile import analyze_pdf
+
+
+# These helpers are kept for standalone callers/scripts. The pipeline analyses the
+# document once with `analyze_pdf` and queries the resulting PdfProfile directly.
+
 
 def pdf_has_text_layer(pdf_path: str | Path, min_chars: int = 20) -> bool:
     """Heuristic: returns True if the PDF appears to contain selectable text."""
-    import fitz  # PyMuPDF
-
-    doc = fitz.open(str(pdf_path))
-    try:
-        total = 0
-        for page in doc:
-            txt = page.get_text("text") or ""
-            total += len(txt.strip())
-            if total >= min_chars:
-                return True
-        return False
-    finally:
-        doc.close()
+    return analyze_pdf(pdf_path).has_text_layer(min_chars=min_chars)
 
 
 def pdf_text_layer_seems_low_quality(
@@ -37,28 +31,9 @@ def pdf_text_layer_seems_low_quality(
     spaces, which often correlates with missing word boundaries.
     """
 
-    import fitz  # PyMuPDF
-
-    doc = fitz.open(str(pdf_path))
-    try:
-        pages_to_scan = doc.page_count
-        if max_pages and int(max_pages) > 0:
-            pages_to_scan = min(pages_to_scan, int(max_pages))
-
-        text_parts: list[str] = []
-        for i in range(pages_to_scan):
-            try:
-                text_parts.append(doc.load_page(i).get_text("text") or "")
-            except Exception:  # noqa: BLE001
-                continue
-
-        text = "\n".join(text_parts)
-        stripped = text.strip()
-        if len(stripped) < int(min_chars):
-            return False
-
-        space_count = stripped.count(" ")
-        space_ratio = space_count / max(len(stripped), 1)
-        return space_ratio < float(min_space_ratio)
-    finally:
-        doc.close()
+    profile = analyze_pdf(pdf_path, max_pages=max_pages)
+    return profile.text_layer_seems_low_quality(
+        max_pages=max_pages,
+        min_chars=min_chars,
+        min_space_ratio=min_space_ratio,
+    )
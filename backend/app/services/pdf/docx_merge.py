@@ -0,0 +1,669 @@
+from __future__ import annotations
+
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+
+from .docx_zip import DocxZipError, DocxZipWriter
+
+
+class DocxMergeError(RuntimeError):
+    pass
+
+
+_DOCUMENT_XML = "word/document.xml"
+_DOCUMENT_RELS = "word/_rels/document.xml.rels"
+_CONTENT_TYPES = "[Content_Types].xml"
+_NEW_NUMBERING = "word/numbering.xml"
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_REL_IMAGE = f"{_REL_NS}/image"
+_REL_HYPERLINK = f"{_REL_NS}/hyperlink"
+_REL_STYLES = f"{_REL_NS}/styles"
+_REL_NUMBERING = f"{_REL_NS}/numbering"
+_REL_HEADER = f"{_REL_NS}/header"
+_REL_FOOTER = f"{_REL_NS}/footer"
+_REL_FOOTNOTES = f"{_REL_NS}/footnotes"
+_REL_ENDNOTES = f"{_REL_NS}/endnotes"
+_NUMBERING_CT = "application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"
+# Document-wide parts where the first part's copy is kept as-is.
+_SHARED_REL_TYPES = {
+    _REL_STYLES,
+    f"{_REL_NS}/settings",
+    f"{_REL_NS}/webSettings",
+    f"{_REL_NS}/fontTable",
+    f"{_REL_NS}/theme",
+    f"{_REL_NS}/customXml",
+    "http://schemas.microsoft.com/office/2007/relationships/stylesWithEffects",
+}
+
+_ROOT_RE = re.compile(r"<w:document\b[^>]*>")
+_BODY_OPEN_RE = re.compile(r"<w:body\b[^>]*>")
+_BODY_CLOSE = "</w:body>"
+_XMLNS_RE = re.compile(r'\bxmlns:(\w+)="([^"]*)"')
+_IGNORABLE_RE = re.compile(r'\bmc:Ignorable="([^"]*)"')
+_RELATIONSHIP_RE = re.compile(r"<Relationship\b[^>]*/>")
+_ATTR_RE = re.compile(r'([\w:]+)="([^"]*)"')
+_DEFAULT_RE = re.compile(r"<Default\b[^>]*/>")
+_OVERRIDE_RE = re.compile(r"<Override\b[^>]*/>")
+
+_R_ATTR_RE = re.compile(r'(\br:(?:embed|id|link|pict)=")([^"]+)(")')
+_DOCPR_ID_RE = re.compile(r'(<wp:docPr\b[^>]*?\bid=")(\d+)(")')
+_BOOKMARK_ID_RE = re.compile(r'(<w:bookmark(?:Start|End)\b[^>]*?\bw:id=")(\d+)(")')
+
+_STYLE_RE = re.compile(r"<w:style\b[^>]*?(?:/>|>.*?</w:style>)", re.S)
+_STYLE_ID_RE = re.compile(r'\bw:styleId="([^"]*)"')
+_STYLE_REF_RE = re.compile(r'(<w:(?:pStyle|rStyle|tblStyle|basedOn|next|link|numStyleLink|styleLink)\b[^>]*?\bw:val=")([^"]*)(")')
+_STYLE_NAME_RE = re.compile(r'(<w:name\b[^>]*?\bw:val=")([^"]*)(")')
+_STYLE_DEFAULT_RE = re.compile(r'\s+w:default="(?:1|true|on)"')
+_STYLE_TYPE_RE = re.compile(r'\bw:type="([^"]*)"')
+_DOC_DEFAULTS_RE = re.compile(r"<w:docDefaults\b[^>]*?(?:/>|>.*?</w:docDefaults>)", re.S)
+# Elements that use their type's default style when they name none: (element, properties,
+# style reference). The reference is the first child of the properties, which are the
+# element's first child.
+_DEFAULT_STYLE_REFS = {
+    "paragraph": ("p", "pPr", "pStyle"),
+    "character": ("r", "rPr", "rStyle"),
+    "table": ("tbl", "tblPr", "tblStyle"),
+}
+_UNSTYLED_RE = {
+    kind: re.compile(rf"<w:{el}(?=[\s>/])([^>]*?)(/?)>(\s*<w:{props}(?=[\s>/])[^>]*?(/?)>)?(\s*<w:{ref}(?=[\s>/]))?")
+    for kind, (el, props, ref) in _DEFAULT_STYLE_REFS.items()
+}
+
+_NUMBERING_ROOT_RE = re.compile(r"<w:numbering\b[^>]*>")
+_ABSTRACT_RE = re.compile(r"<w:abstractNum\b[^>]*>.*?</w:abstractNum>", re.S)
+_ABSTRACT_ID_RE = re.compile(r'(\bw:abstractNumId=")(\d+)(")')
+_NUM_RE = re.compile(r"<w:num\b[^>]*>.*?</w:num>", re.S)
+_NUM_ID_RE = re.compile(r'(\bw:numId=")(\d+)(")')
+_NUM_ABSTRACT_REF_RE = re.compile(r'(<w:abstractNumId\b[^>]*?\bw:val=")(\d+)(")')
+_NUM_ID_REF_RE = re.compile(r'(<w:numId\b[^>]*?\bw:val=")(\d+)(")')
+_NSID_RE = re.compile(r"<w:nsid\b[^>]*/>")
+
+_NOTE_KINDS = {"footnote": _REL_FOOTNOTES, "endnote": _REL_ENDNOTES}
+_NOTE_RE = {
+    "footnote": re.compile(r"<w:footnote\b[^>]*?(?:/>|>.*?</w:footnote>)", re.S),
+    "endnote": re.compile(r"<w:endnote\b[^>]*?(?:/>|>.*?</w:endnote>)", re.S),
+}
+_NOTE_REF_RE = {
+    "footnote": re.compile(r'(<w:footnoteReference\b[^>]*?\bw:id=")(-?\d+)(")'),
+    "endnote": re.compile(r'(<w:endnoteReference\b[^>]*?\bw:id=")(-?\d+)(")'),
+}
+_NOTE_ID_RE = re.compile(r'(\bw:id=")(-?\d+)(")')
+_NOTE_TYPE_RE = re.compile(r'\bw:type="([^"]*)"')
+
+# Drawing/bookmark ids of part N are shifted by N * _ID_STRIDE to keep them unique.
+_ID_STRIDE = 1_000_000
+
+
+def _split_body(xml: str) -> tuple[str, str, str]:
+    """(head up to and including <w:body>, body content, tail from </w:body>)."""
+
+    m = _BODY_OPEN_RE.search(xml)
+    end = xml.rfind(_BODY_CLOSE)
+    if not m or end < m.end():
+        raise DocxMergeError("document.xml has no <w:body>")
+    return xml[: m.end()], xml[m.end() : end], xml[end:]
+
+
+def _split_final_sectpr(body: str) -> tuple[str, str]:
+    """Split off the body-level <w:sectPr> (last child of <w:body>)."""
+
+    stripped = body.rstrip()
+    if not stripped.endswith("</w:sectPr>"):
+        return body, ""
+    start = stripped.rfind("<w:sectPr")
+    return stripped[:start], stripped[start:]
+
+
+def _relationships(xml: str) -> list[dict[str, str]]:
+    return [dict(_ATTR_RE.findall(rel)) for rel in _RELATIONSHIP_RE.findall(xml)]
+
+
+def _relationship_xml(rel: dict[str, str]) -> str:
+    attrs = "".join(f' {k}="{v}"' for k, v in rel.items())
+    return f"<Relationship{attrs}/>"
+
+
+def _rels_name(part: str) -> str:
+    # word/header1.xml -> word/_rels/header1.xml.rels
+    return posixpath.join(posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels")
+
+
+def _sub_map(pattern: re.Pattern, mapping: dict[str, str], xml: str) -> str:
+    if not mapping:
+        return xml
+    return pattern.sub(lambda m: f"{m.group(1)}{mapping.get(m.group(2), m.group(2))}{m.group(3)}", xml)
+
+
+def _shift_ids(xml: str, offset: int) -> str:
+    if not offset:
+        return xml
+    xml = _DOCPR_ID_RE.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + offset}{m.group(3)}", xml)
+    return _BOOKMARK_ID_RE.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + offset}{m.group(3)}", xml)
+
+
+def _style_defaults(styles: dict[str, str]) -> dict[str, str]:
+    """Style type -> id of the default style of that type."""
+
+    defaults: dict[str, str] = {}
+    for sid, s in styles.items():
+        open_tag = s.split(">", 1)[0]
+        kind = _STYLE_TYPE_RE.search(open_tag)
+        if kind and _STYLE_DEFAULT_RE.search(open_tag):
+            defaults.setdefault(kind.group(1), sid)
+    return defaults
+
+
+def _name_default_style(xml: str, kind: str, style_id: str) -> str:
+    """Give every element of `kind` that names no style an explicit reference to `style_id`."""
+
+    el, props, ref = _DEFAULT_STYLE_REFS[kind]
+    ref_xml = f'<w:{ref} w:val="{style_id}"/>'
+
+    def fix(m: re.Match) -> str:
+        if m.group(5):
+            return m.group(0)
+        if m.group(2):
+            return f"<w:{el}{m.group(1)}><w:{props}>{ref_xml}</w:{props}></w:{el}>"
+        if m.group(3) and m.group(4):
+            return f"<w:{el}{m.group(1)}>{m.group(3).rstrip()[:-2]}>{ref_xml}</w:{props}>"
+        if m.group(3):
+            return f"<w:{el}{m.group(1)}>{m.group(3)}{ref_xml}"
+        return f"<w:{el}{m.group(1)}><w:{props}>{ref_xml}</w:{props}>"
+
+    return _UNSTYLED_RE[kind].sub(fix, xml)
+
+
+def _insert_before(xml: str, anchors: tuple[str, ...], added: str) -> str:
+    if not added:
+        return xml
+    for anchor in anchors:
+        idx = xml.find(anchor)
+        if idx >= 0:
+            return xml[:idx] + added + xml[idx:]
+    raise DocxMergeError(f"Cannot find insertion point ({anchors[-1]})")
+
+
+class _Package:
+    """One input DOCX: the open archive plus its main-document relationships."""
+
+    def __init__(self, path: Path) -> None:
+        self.zip = zipfile.ZipFile(path, "r")
+        self.names = set(self.zip.namelist())
+        for name in (_DOCUMENT_XML, _DOCUMENT_RELS, _CONTENT_TYPES):
+            if name not in self.names:
+                raise DocxMergeError(f"{path.name} is missing {name}")
+        self.rels = _relationships(self.read(_DOCUMENT_RELS))
+
+    def read(self, name: str) -> str:
+        return self.zip.read(name).decode("utf-8")
+
+    def part_for(self, rel_type: str) -> str | None:
+        for rel in self.rels:
+            if rel.get("Type") == rel_type and rel.get("TargetMode") != "External":
+                name = posixpath.normpath(posixpath.join("word", rel.get("Target", "")))
+                if name in self.names:
+                    return name
+        return None
+
+    def close(self) -> None:
+        self.zip.close()
+
+
+class _PartMaps:
+    """Id renames applied to everything a part contributes."""
+
+    def __init__(self, offset: int) -> None:
+        self.offset = offset
+        self.rels: dict[str, str] = {}
+        self.styles: dict[str, str] = {}
+        self.nums: dict[str, str] = {}
+        self.notes: dict[str, dict[str, str]] = {"footnote": {}, "endnote": {}}
+        # Style type -> the part's default style, when that is not the merged default.
+        self.default_styles: dict[str, str] = {}
+
+    def apply(self, xml: str, *, rels: bool) -> str:
+        if rels:
+            xml = _sub_map(_R_ATTR_RE, self.rels, xml)
+        xml = _sub_map(_STYLE_REF_RE, self.styles, xml)
+        for kind, style_id in self.default_styles.items():
+            xml = _name_default_style(xml, kind, style_id)
+        xml = _sub_map(_NUM_ID_REF_RE, self.nums, xml)
+        for kind, mapping in self.notes.items():
+            xml = _sub_map(_NOTE_REF_RE[kind], mapping, xml)
+        return _shift_ids(xml, self.offset)
+
+
+class _Merger:
+    """Plans the renames for every part, then writes the merged package."""
+
+    def __init__(self, packages: list[_Package]) -> None:
+        self.packages = packages
+        self.base = base = packages[0]
+
+        root = _ROOT_RE.search(base.read(_DOCUMENT_XML))
+        if not root:
+            raise DocxMergeError("document.xml has no <w:document> root")
+        self.root = root.group(0)
+        self.namespaces = dict(_XMLNS_RE.findall(self.root))
+        if self.namespaces.get("r") != _REL_NS:
+            raise DocxMergeError("Unexpected relationships namespace prefix")
+        ignorable = _IGNORABLE_RE.search(self.root)
+        self.ignorable = ignorable.group(1).split() if ignorable else []
+        self.shared_ids = {r.get("Type"): r.get("Id") for r in base.rels}
+
+        self.styles_part = base.part_for(_REL_STYLES)
+        self.styles: dict[str, str] = {}  # id -> original definition
+        self.doc_defaults = ""
+        if self.styles_part:
+            xml = base.read(self.styles_part)
+            for s in _STYLE_RE.findall(xml):
+                sid = _STYLE_ID_RE.search(s)
+                if sid:
+                    self.styles[sid.group(1)] = s
+            doc_defaults = _DOC_DEFAULTS_RE.search(xml)
+            self.doc_defaults = doc_defaults.group(0) if doc_defaults else ""
+        self.default_styles = _style_defaults(self.styles)
+        self.added_styles: list[str] = []
+        # Renamed style sets already added, keyed by their original definitions, so
+        # parts converted with the same style sheet share one renamed copy.
+        self.renamed_sets: dict[frozenset, dict[str, str]] = {}
+
+        self.numbering_part = base.part_for(_REL_NUMBERING)
+        self.new_numbering_root: str | None = None  # set when the base has no numbering part
+        self.next_abstract = self.next_num = 1
+        if self.numbering_part:
+            xml = base.read(self.numbering_part)
+            self.next_abstract = max([int(m.group(2)) for m in _ABSTRACT_ID_RE.finditer(xml)] + [-1]) + 1
+            self.next_num = max([int(m.group(2)) for m in _NUM_ID_RE.finditer(xml)] + [0]) + 1
+        self.added_abstracts: list[str] = []
+        self.added_nums: list[str] = []
+
+        self.notes_part = {kind: base.part_for(rel_type) for kind, rel_type in _NOTE_KINDS.items()}
+        self.next_note: dict[str, int] = {}
+        for kind, part in self.notes_part.items():
+            ids = [int(m.group(2)) for m in _NOTE_ID_RE.finditer(base.read(part))] if part else []
+            self.next_note[kind] = max(ids + [0]) + 1
+        self.added_notes: dict[str, list[str]] = {"footnote": [], "endnote": []}
+
+        self.extra_rels: list[dict[str, str]] = []
+        self.extra_defaults: dict[str, str] = {}
+        self.extra_overrides: list[str] = []
+        # (package index, source member, destination member, new bytes or None => raw copy)
+        self.copies: list[tuple[int, str, str, bytes | None]] = []
+        self.part_maps: list[_PartMaps] = [_PartMaps(0)]
+
+    # ---- planning ------------------------------------------------------------
+
+    def plan(self) -> None:
+        for k, pkg in enumerate(self.packages[1:], start=1):
+            self.part_maps.append(self._plan_part(k, pkg))
+
+    def _plan_part(self, k: int, pkg: _Package) -> _PartMaps:
+        maps = _PartMaps(k * _ID_STRIDE)
+        doc_xml = pkg.read(_DOCUMENT_XML)
+        root = _ROOT_RE.search(doc_xml)
+        if root:
+            self._merge_namespaces(root.group(0))
+
+        content_types = pkg.read(_CONTENT_TYPES)
+        for m in _DEFAULT_RE.findall(content_types):
+            ext = dict(_ATTR_RE.findall(m)).get("Extension", "").lower()
+            if ext:
+                self.extra_defaults.setdefault(ext, m)
+        overrides = {dict(_ATTR_RE.findall(m)).get("PartName", ""): m for m in _OVERRIDE_RE.findall(content_types)}
+
+        new_styles = self._plan_styles(k, pkg, maps)
+
+        # Everything this part contributes, to find the numbering it references.
+        texts = [doc_xml] + [s for _sid, s in new_styles]
+        media: dict[str, str] = {}
+        sub_parts: list[tuple[str, str]] = []
+        note_parts: dict[str, str] = {}
+        for rel in pkg.rels:
+            rid, rtype, target = rel.get("Id", ""), rel.get("Type", ""), rel.get("Target", "")
+            external = rel.get("TargetMode") == "External"
+            new_id = f"p{k}{rid}"
+            if rtype in _SHARED_REL_TYPES:
+                if rtype in self.shared_ids:
+                    maps.rels[rid] = self.shared_ids[rtype]
+                continue
+            if rtype == _REL_NUMBERING:
+                continue  # merged by numId below
+            if rtype in (_REL_FOOTNOTES, _REL_ENDNOTES):
+                kind = "footnote" if rtype == _REL_FOOTNOTES else "endnote"
+                source = pkg.part_for(rtype)
+                if source:
+                    note_parts[kind] = source
+                    texts.append(pkg.read(source))
+                continue
+            if external and rtype in (_REL_HYPERLINK, _REL_IMAGE):
+                self.extra_rels.append({**rel, "Id": new_id})
+            elif rtype == _REL_IMAGE:
+                self.extra_rels.append({**rel, "Id": new_id, "Target": self._copy_media(k, pkg, "word", target, media)})
+            elif rtype in (_REL_HEADER, _REL_FOOTER):
+                source = posixpath.normpath(posixpath.join("word", target))
+                dest = posixpath.join(posixpath.dirname(source), f"part{k}_{posixpath.basename(source)}")
+                override = overrides.get("/" + source)
+                if source not in pkg.names or override is None:
+                    raise DocxMergeError(f"Part {k} has a broken {posixpath.basename(rtype)} relationship")
+                sub_parts.append((source, dest))
+                texts.append(pkg.read(source))
+                self.extra_overrides.append(override.replace(f'PartName="/{source}"', f'PartName="/{dest}"'))
+                self.extra_rels.append({**rel, "Id": new_id, "Target": posixpath.relpath(dest, "word")})
+            else:
+                raise DocxMergeError(f"Unsupported relationship in part {k}: {rtype}")
+            maps.rels[rid] = new_id
+
+        self._plan_numbering(pkg, texts, maps)
+        for sid, s in new_styles:
+            self._add_style(k, sid, s, maps)
+        for kind, source in note_parts.items():
+            self._plan_notes(kind, pkg, source, maps)
+
+        for source, dest in sub_parts:
+            # Headers/footers keep their own relationship ids; only media targets move.
+            self.copies.append((k, source, dest, maps.apply(pkg.read(source), rels=False).encode("utf-8")))
+            rels_source = _rels_name(source)
+            if rels_source in pkg.names:
+
+                def fix(m: re.Match, source: str = source) -> str:
+                    rel = dict(_ATTR_RE.findall(m.group(0)))
+                    rtype, external = rel.get("Type", ""), rel.get("TargetMode") == "External"
+                    if external and rtype in (_REL_HYPERLINK, _REL_IMAGE):
+                        return m.group(0)
+                    if rtype != _REL_IMAGE:
+                        raise DocxMergeError(f"Unsupported relationship in {source}: {rtype}")
+                    target = self._copy_media(k, pkg, posixpath.dirname(source), rel.get("Target", ""), media)
+                    return _relationship_xml({**rel, "Target": target})
+
+                rels_xml = _RELATIONSHIP_RE.sub(fix, pkg.read(rels_source))
+                self.copies.append((k, rels_source, _rels_name(dest), rels_xml.encode("utf-8")))
+        return maps
+
+    def _merge_namespaces(self, root_tag: str) -> None:
+        for prefix, uri in _XMLNS_RE.findall(root_tag):
+            current = self.namespaces.setdefault(prefix, uri)
+            if current != uri:
+                raise DocxMergeError(f"Namespace prefix {prefix!r} is bound to different URIs")
+        ignorable = _IGNORABLE_RE.search(root_tag)
+        for prefix in ignorable.group(1).split() if ignorable else []:
+            if prefix not in self.ignorable:
+                self.ignorable.append(prefix)
+
+    def _copy_media(self, k: int, pkg: _Package, base_dir: str, target: str, media: dict[str, str]) -> str:
+        source = posixpath.normpath(posixpath.join(base_dir, target))
+        if source not in pkg.names:
+            raise DocxMergeError(f"Part {k} is missing {source}")
+        if source not in media:
+            media[source] = posixpath.join(posixpath.dirname(source), f"part{k}_{posixpath.basename(source)}")
+            self.copies.append((k, source, media[source], None))
+        return posixpath.relpath(media[source], base_dir)
+
+    def _plan_styles(self, k: int, pkg: _Package, maps: _PartMaps) -> list[tuple[str, str]]:
+        """Fill maps.styles and return the (original id, xml) styles to add.
+
+        Identical definitions are shared and new ids added as-is. An id whose
+        definition differs from the merged sheet is renamed, and so is every style
+        based on / linked to a renamed one (its effective formatting differs too).
+        When the part's default style of a type doesn't end up as the merged default,
+        its elements that name no style get an explicit reference (maps.default_styles).
+        """
+
+        source = pkg.part_for(_REL_STYLES)
+        if not source:
+            return []
+        if not self.styles_part:
+            raise DocxMergeError("First part has no styles part")
+        xml = pkg.read(source)
+        doc_defaults = _DOC_DEFAULTS_RE.search(xml)
+        if (doc_defaults.group(0) if doc_defaults else "") != self.doc_defaults:
+            # Document defaults apply to every part; they can't differ per part.
+            raise DocxMergeError(f"Part {k} has different document defaults")
+        styles: dict[str, str] = {}
+        for s in _STYLE_RE.findall(xml):
+            sid = _STYLE_ID_RE.search(s)
+            if sid:
+                styles[sid.group(1)] = s
+
+        renamed = {sid for sid, s in styles.items() if sid in self.styles and self.styles[sid] != s}
+        changed = bool(renamed)
+        while changed:
+            changed = False
+            for sid, s in styles.items():
+                if sid not in renamed and any(m.group(2) in renamed for m in _STYLE_REF_RE.finditer(s)):
+                    renamed.add(sid)
+                    changed = True
+
+        key = frozenset((sid, styles[sid]) for sid in renamed)
+        if key in self.renamed_sets:
+            maps.styles.update(self.renamed_sets[key])
+            new_styles = [(sid, s) for sid, s in styles.items() if sid not in renamed and sid not in self.styles]
+        else:
+            for sid in sorted(renamed):
+                new_id = f"{sid}P{k}"
+                while new_id in self.styles or new_id in styles:
+                    new_id += "x"
+                maps.styles[sid] = new_id
+            if renamed:
+                self.renamed_sets[key] = dict(maps.styles)
+            new_styles = [(sid, s) for sid, s in styles.items() if sid in renamed or sid not in self.styles]
+
+        for kind, sid in _style_defaults(styles).items():
+            new_id = maps.styles.get(sid, sid)
+            if new_id != self.default_styles.get(kind):
+                maps.default_styles[kind] = new_id
+        return new_styles
+
+    def _add_style(self, k: int, sid: str, original: str, maps: _PartMaps) -> None:
+        new_id = maps.styles.get(sid, sid)
+        xml = _sub_map(_STYLE_REF_RE, maps.styles, original)
+        xml = _sub_map(_NUM_ID_REF_RE, maps.nums, xml)
+        if new_id != sid:
+            xml = xml.replace(f'w:styleId="{sid}"', f'w:styleId="{new_id}"', 1)
+            # Word matches styles by name too; keep names unique.
+            xml = _STYLE_NAME_RE.sub(lambda m: f"{m.group(1)}{m.group(2)} ({k + 1}){m.group(3)}", xml, count=1)
+        if new_id != sid or new_id in maps.default_styles.values():
+            # A single default per type; this part's elements name theirs explicitly.
+            xml = _STYLE_DEFAULT_RE.sub("", xml, count=1)
+        # Later parts are compared against the original definition.
+        self.styles[new_id] = original
+        self.added_styles.append(xml)
+
+    def _plan_numbering(self, pkg: _Package, texts: list[str], maps: _PartMaps) -> None:
+        used = {m.group(2) for t in texts for m in _NUM_ID_REF_RE.finditer(t)} - {"0"}
+        source = pkg.part_for(_REL_NUMBERING)
+        if not used or not source:
+            return
+        xml = pkg.read(source)
+        abstracts = {m.group(2): a for a in _ABSTRACT_RE.findall(xml) for m in [_ABSTRACT_ID_RE.search(a)] if m}
+        nums = {m.group(2): n for n in _NUM_RE.findall(xml) for m in [_NUM_ID_RE.search(n)] if m}
+        if self.numbering_part is None and self.new_numbering_root is None:
+            root = _NUMBERING_ROOT_RE.search(xml)
+            self.new_numbering_root = root.group(0) if root else f'<w:numbering xmlns:w="{_W_NS}">'
+
+        abstract_map: dict[str, str] = {}
+        for num_id in sorted(used, key=int):
+            num = nums.get(num_id)
+            ref = _NUM_ABSTRACT_REF_RE.search(num) if num else None
+            if not ref or ref.group(2) not in abstracts:
+                continue
+            old_abstract = ref.group(2)
+            if old_abstract not in abstract_map:
+                new_abstract = abstract_map[old_abstract] = str(self.next_abstract)
+                self.next_abstract += 1
+                a = _ABSTRACT_ID_RE.sub(lambda m: f"{m.group(1)}{new_abstract}{m.group(3)}", abstracts[old_abstract], count=1)
+                # Equal nsids make Word treat lists as one; it assigns new ones when missing.
+                a = _NSID_RE.sub("", a)
+                # numStyleLink/styleLink follow renamed styles.
+                self.added_abstracts.append(_sub_map(_STYLE_REF_RE, maps.styles, a))
+            new_num = maps.nums[num_id] = str(self.next_num)
+            self.next_num += 1
+            n = _NUM_ID_RE.sub(lambda m: f"{m.group(1)}{new_num}{m.group(3)}", num, count=1)
+            self.added_nums.append(_sub_map(_NUM_ABSTRACT_REF_RE, abstract_map, n))
+
+    def _plan_notes(self, kind: str, pkg: _Package, source: str, maps: _PartMaps) -> None:
+        note_map = maps.notes[kind]
+        notes = []
+        for note in _NOTE_RE[kind].findall(pkg.read(source)):
+            note_type = _NOTE_TYPE_RE.search(note.split(">", 1)[0])
+            if note_type and note_type.group(1) != "normal":
+                continue  # separators: the first part's copies are used
+            old_id = _NOTE_ID_RE.search(note)
+            if old_id is None:
+                continue
+            note_map[old_id.group(2)] = str(self.next_note[kind])
+            self.next_note[kind] += 1
+            notes.append(note)
+        if not notes:
+            return
+        if self.notes_part[kind] is None:
+            raise DocxMergeError(f"First part has no {kind}s part")
+        rels_source = _rels_name(source)
+        if rels_source in pkg.names and _relationships(pkg.read(rels_source)):
+            raise DocxMergeError(f"{kind}s with relationships are not supported")
+        for note in notes:
+            note = _NOTE_ID_RE.sub(lambda m: f"{m.group(1)}{note_map[m.group(2)]}{m.group(3)}", note, count=1)
+            self.added_notes[kind].append(maps.apply(note, rels=False))
+
+    # ---- writing -------------------------------------------------------------
+
+    def write(self, out_docx: Path) -> None:
+        base = self.base
+        tmp_path = out_docx.with_suffix(out_docx.suffix + ".merge")
+        try:
+            with DocxZipWriter(tmp_path) as zout:
+                for info in base.zip.infolist():
+                    name = info.filename
+                    data = self._rewrite_base_member(name)
+                    if name == _DOCUMENT_XML:
+                        with zout.open_deflated(name, date_time=info.date_time) as out:
+                            self._write_document(out)
+                    elif data is not None:
+                        zout.write_bytes(name, data.encode("utf-8"), date_time=info.date_time)
+                    else:
+                        zout.copy_raw(base.zip, info)
+
+                if self.new_numbering_root is not None:
+                    xml = (
+                        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                        + self.new_numbering_root
+                        + "".join(self.added_abstracts)
+                        + "".join(self.added_nums)
+                        + "</w:numbering>"
+                    )
+                    zout.write_bytes(_NEW_NUMBERING, xml.encode("utf-8"))
+                for k, source, dest, data in self.copies:
+                    pkg = self.packages[k]
+                    info = pkg.zip.getinfo(source)
+                    if data is None:
+                        zout.copy_raw(pkg.zip, info, name=dest)
+                    else:
+                        zout.write_bytes(dest, data, date_time=info.date_time)
+            tmp_path.replace(out_docx)
+        except DocxZipError as e:
+            raise DocxMergeError(f"Cannot write merged DOCX: {e}") from e
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _rewrite_base_member(self, name: str) -> str | None:
+        """New content for a base member, or None to copy it raw."""
+
+        base = self.base
+        if name == _DOCUMENT_RELS:
+            rels = list(self.extra_rels)
+            if self.new_numbering_root is not None:
+                rels.append({"Id": "rIdMergedNumbering", "Type": _REL_NUMBERING, "Target": posixpath.relpath(_NEW_NUMBERING, "word")})
+            return _insert_before(base.read(name), ("</Relationships>",), "".join(map(_relationship_xml, rels)))
+        if name == _CONTENT_TYPES:
+            return self._content_types(base.read(name))
+        if name == self.styles_part and self.added_styles:
+            return _insert_before(base.read(name), ("</w:styles>",), "".join(self.added_styles))
+        if name == self.numbering_part and self.added_nums:
+            xml = _insert_before(base.read(name), ("<w:num ", "<w:numIdMacAtCleanup", "</w:numbering>"), "".join(self.added_abstracts))
+            return _insert_before(xml, ("<w:numIdMacAtCleanup", "</w:numbering>"), "".join(self.added_nums))
+        for kind, part in self.notes_part.items():
+            if name == part and self.added_notes[kind]:
+                return _insert_before(base.read(name), (f"</w:{kind}s>",), "".join(self.added_notes[kind]))
+        return None
+
+    def _document_head(self, head: str) -> str:
+        declared = dict(_XMLNS_RE.findall(self.root))
+        new_root = self.root[:-1] + "".join(f' xmlns:{p}="{u}"' for p, u in self.namespaces.items() if p not in declared)
+        ignorable = " ".join(p for p in self.ignorable if p in self.namespaces)
+        if _IGNORABLE_RE.search(new_root):
+            new_root = _IGNORABLE_RE.sub(f'mc:Ignorable="{ignorable}"', new_root)
+        elif ignorable and "mc" in self.namespaces:
+            new_root += f' mc:Ignorable="{ignorable}"'
+        return head.replace(self.root, new_root + ">", 1)
+
+    def _write_document(self, out) -> None:
+        last = len(self.packages) - 1
+        tail = ""
+        for k, pkg in enumerate(self.packages):
+            head, body, tail_k = _split_body(pkg.read(_DOCUMENT_XML))
+            if k == 0:
+                out.write(self._document_head(head).encode("utf-8"))
+                tail = tail_k
+            else:
+                body = self.part_maps[k].apply(body, rels=True)
+            if k < last:
+                content, sect = _split_final_sectpr(body)
+                body = content + (f"<w:p><w:pPr>{sect}</w:pPr></w:p>" if sect else "")
+            out.write(body.encode("utf-8"))
+        out.write(tail.encode("utf-8"))
+
+    def _content_types(self, xml: str) -> str:
+        have = {dict(_ATTR_RE.findall(m)).get("Extension", "").lower() for m in _DEFAULT_RE.findall(xml)}
+        defaults = "".join(m for ext, m in self.extra_defaults.items() if ext not in have)
+        # Defaults must precede Overrides.
+        xml = _insert_before(xml, ("<Override", "</Types>"), defaults)
+        overrides = list(self.extra_overrides)
+        if self.new_numbering_root is not None:
+            overrides.append(f'<Override PartName="/{_NEW_NUMBERING}" ContentType="{_NUMBERING_CT}"/>')
+        return _insert_before(xml, ("</Types>",), "".join(overrides))
+
+
+def merge_docx_parts(*, parts: list[Path], out_docx: Path) -> None:
+    """Concatenate DOCX files converted from consecutive page ranges of one PDF.
+
+    The first part is the base (settings, theme, fonts, note separators). Each later
+    part's body is appended and reconciled with it:
+
+    - styles: identical definitions are shared, conflicting ones renamed; a part whose
+      default style was renamed names it on its unstyled paragraphs/runs/tables
+    - numbering: referenced lists are copied with new abstractNum/num ids
+    - media, hyperlinks, headers/footers: copied under part-specific names with new
+      relationship ids (media is raw-copied, not recompressed)
+    - footnotes/endnotes: appended with new ids
+    - sections: each part's final <w:sectPr> becomes a section break, so every page
+      keeps its own size, margins and headers
+    - drawing/bookmark ids are shifted to stay unique
+
+    Only one part's document.xml is held in memory at a time. Parts with different
+    document defaults or carrying anything else (comments, embedded objects, ...) raise
+    DocxMergeError.
+    """
+
+    if not parts:
+        raise DocxMergeError("No parts to merge")
+
+    packages: list[_Package] = []
+    try:
+        for p in parts:
+            packages.append(_Package(p))
+        merger = _Merger(packages)
+        merger.plan()
+        merger.write(out_docx)
+
+    except DocxMergeError:
+        raise
+    except (KeyError, ValueError, zipfile.BadZipFile, UnicodeDecodeError) as e:
+        raise DocxMergeError(str(e)) from e
+    finally:
+        for pkg in packages:
+            pkg.close()
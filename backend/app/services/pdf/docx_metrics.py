@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = f"{_W}p"
+_W_T = f"{_W}t"
+_W_TAB = f"{_W}tab"
+_W_BR = f"{_W}br"
+_W_CR = f"{_W}cr"
+_W_TYPE = f"{_W}type"
+
+
+class DocxMetricsError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class DocxMetrics:
+    text_len: int  # sum of stripped paragraph lengths
+    space_ratio: float  # spaces / length of the whole (stripped) text
+    replacement_chars: int
+    mojibake_markers: int  # 'Ã' occurrences (common UTF-8 mis-decode artifact for Vietnamese)
+    lt_after_alpha: bool  # first '<' in the text follows a letter ('D<' font-mapping issue)
+    paragraph_count: int
+
+    @property
+    def looks_mojibake(self) -> bool:
+        return self.replacement_chars > 0 or self.mojibake_markers > 0 or self.lt_after_alpha
+
+
+EMPTY_DOCX_METRICS = DocxMetrics(
+    text_len=0,
+    space_ratio=0.0,
+    replacement_chars=0,
+    mojibake_markers=0,
+    lt_after_alpha=False,
+    paragraph_count=0,
+)
+
+
+class _TextAccumulator:
+    """Accumulates the paragraph text stream without keeping it in memory.
+
+    The text is the paragraphs joined by newlines; leading/trailing whitespace of the
+    whole stream is excluded from the space ratio, matching `text.strip()`.
+    """
+
+    def __init__(self) -> None:
+        self.text_len = 0
+        self.replacement_chars = 0
+        self.mojibake_markers = 0
+        self.lt_after_alpha: bool | None = None
+        self._started = False
+        self._chars = 0
+        self._spaces = 0
+        self._tail_chars = 0
+        self._tail_spaces = 0
+        self._last2 = ""
+
+    def add_paragraph(self, text: str, *, first: bool) -> None:
+        self.text_len += len(text.strip())
+        self.replacement_chars += text.count("\ufffd")
+        self.mojibake_markers += text.count("Ã")
+        chunk = text if first else "\n" + text
+        if self.lt_after_alpha is None:
+            pos = chunk.find("<")
+            if pos >= 0:
+                before = (self._last2 + chunk[:pos])[-2:]
+                self.lt_after_alpha = any(c.isalpha() for c in before)
+        self._last2 = (self._last2 + chunk)[-2:]
+        self._feed(chunk)
+
+    def _feed(self, chunk: str) -> None:
+        if not self._started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return
+            self._started = True
+        self._chars += len(chunk)
+        self._spaces += chunk.count(" ")
+        body = chunk.rstrip()
+        if not body:
+            self._tail_chars += len(chunk)
+            self._tail_spaces += chunk.count(" ")
+        else:
+            tail = chunk[len(body):]
+            self._tail_chars = len(tail)
+            self._tail_spaces = tail.count(" ")
+
+    @property
+    def space_ratio(self) -> float:
+        length = self._chars - self._tail_chars
+        if length <= 0:
+            return 0.0
+        return (self._spaces - self._tail_spaces) / max(length, 1)
+
+
+def measure_docx(docx_path: Path) -> DocxMetrics:
+    """Compute text/quality metrics of a DOCX in one streaming pass.
+
+    `word/document.xml` is read incrementally and each paragraph is discarded once
+    measured, so memory stays bounded even for very large Adobe/Aspose outputs.
+    Paragraph text follows python-docx semantics (w:t, tabs, line breaks).
+    """
+
+    if not docx_path.exists():
+        raise FileNotFoundError(str(docx_path))
+
+    acc = _TextAccumulator()
+    paragraph_count = 0
+    # Nested paragraphs (text boxes) are measured separately from their host.
+    buffers: list[list[str]] = []
+    stack: list[ET.Element] = []
+
+    try:
+        with zipfile.ZipFile(docx_path, "r") as zf:
+            try:
+                stream = zf.open("word/document.xml")
+            except KeyError as e:
+                raise DocxMetricsError("DOCX missing word/document.xml") from e
+
+            with stream:
+                for event, elem in ET.iterparse(stream, events=("start", "end")):
+                    if event == "start":
+                        stack.append(elem)
+                        if elem.tag == _W_P:
+                            buffers.append([])
+                        continue
+
+                    stack.pop()
+                    tag = elem.tag
+                    if buffers:
+                        if tag == _W_T:
+                            buffers[-1].append(elem.text or "")
+                        elif tag == _W_TAB:
+                            buffers[-1].append("\t")
+                        elif tag == _W_CR or (tag == _W_BR and elem.get(_W_TYPE, "textWrapping") == "textWrapping"):
+                            buffers[-1].append("\n")
+
+                    if tag == _W_P:
+                        acc.add_paragraph("".join(buffers.pop()), first=paragraph_count == 0)
+                        paragraph_count += 1
+
+                    # Drop finished subtrees from their parent to keep memory bounded.
+                    elem.clear()
+                    if stack:
+                        parent = stack[-1]
+                        if len(parent) and parent[-1] is elem:
+                            parent.remove(elem)
+    except DocxMetricsError:
+        raise
+    except Exception as e:  # noqa: BLE001
+        raise DocxMetricsError(str(e)) from e
+
+    return DocxMetrics(
+        text_len=acc.text_len,
+        space_ratio=acc.space_ratio,
+        replacement_chars=acc.replacement_chars,
+        mojibake_markers=acc.mojibake_markers,
+        lt_after_alpha=bool(acc.lt_after_alpha),
+        paragraph_count=paragraph_count,
+    )
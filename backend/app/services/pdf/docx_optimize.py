@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import posixpath
+import re
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+from .docx_zip import DocxZipError, DocxZipWriter
+
+
+OUTPUT_PROFILES = ("standard", "lightweight")
+
+_EMU_PER_INCH = 914400
+# Only downsample when the image is clearly denser than the target (avoids churn).
+_DPI_SLACK = 1.25
+
+_WP_EXTENT = "{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}extent"
+_A_EXT = "{http://schemas.openxmlformats.org/drawingml/2006/main}ext"
+_A_BLIP = "{http://schemas.openxmlformats.org/drawingml/2006/main}blip"
+_R_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+_W_DRAWING = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}drawing"
+
+_REL_FONT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/font"
+_RELATIONSHIP_RE = re.compile(r"<Relationship\b[^>]*/>")
+_TARGET_RE = re.compile(r'Target="([^"]+)"')
+_TYPE_RE = re.compile(r'Type="([^"]+)"')
+_EMBED_FONT_RE = re.compile(r"<w:embed(?:Regular|Bold|Italic|BoldItalic)\b[^>]*/>")
+_FONT_SETTINGS_RE = re.compile(r"<w:(?:embedTrueTypeFonts|embedSystemFonts|saveSubsetFonts)\b[^>]*/>")
+_CONTENT_TYPES = "[Content_Types].xml"
+_OVERRIDE_RE = re.compile(r"<Override\b[^>]*/>")
+_PART_NAME_RE = re.compile(r'PartName="([^"]+)"')
+
+_RECOMPRESSIBLE = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG"}
+
+
+class DocxOptimizeError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class DocxOptimizeResult:
+    bytes_before: int
+    bytes_after: int
+    media_deduplicated: int
+    images_recompressed: int
+    fonts_removed: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(self.bytes_before - self.bytes_after, 0)
+
+
+def _is_rels_part(name: str) -> bool:
+    # word/_rels/document.xml.rels, word/charts/_rels/chart1.xml.rels, _rels/.rels, ...
+    return name.endswith(".rels") and posixpath.basename(posixpath.dirname(name)) == "_rels"
+
+
+def _rels_source_dir(rels_name: str) -> str:
+    # word/_rels/document.xml.rels -> word
+    return posixpath.dirname(posixpath.dirname(rels_name))
+
+
+def _resolve(base_dir: str, target: str) -> str:
+    if target.startswith("/"):
+        # Absolute part name (relative to the package root).
+        return posixpath.normpath(target.lstrip("/"))
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _relative(base_dir: str, part: str) -> str:
+    return posixpath.relpath(part, base_dir)
+
+
+def _display_sizes(zin: zipfile.ZipFile, part: str, rels: dict[str, str]) -> dict[str, tuple[int, int]]:
+    """Largest displayed size (EMU) of each image referenced from `part`, streaming."""
+
+    sizes: dict[str, tuple[int, int]] = {}
+    extent: tuple[int, int] | None = None
+    with zin.open(part) as src:
+        for event, elem in ET.iterparse(src, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == _W_DRAWING:
+                    extent = None
+                continue
+            if tag in (_WP_EXTENT, _A_EXT) and extent is None:
+                try:
+                    extent = (int(elem.get("cx") or 0), int(elem.get("cy") or 0))
+                except ValueError:
+                    extent = None
+            elif tag == _A_BLIP and extent:
+                target = rels.get(elem.get(_R_EMBED) or "")
+                if target:
+                    w, h = sizes.get(target, (0, 0))
+                    sizes[target] = (max(w, extent[0]), max(h, extent[1]))
+            elif tag == _W_DRAWING:
+                extent = None
+            # Attributes were read above; drop children to keep memory bounded.
+            elem.clear()
+    return sizes
+
+
+def _recompress(data: bytes, ext: str, display_emu: tuple[int, int], target_dpi: int) -> bytes | None:
+    from PIL import Image
+
+    fmt = _RECOMPRESSIBLE.get(ext)
+    if not fmt or display_emu[0] <= 0:
+        return None
+    with Image.open(io.BytesIO(data)) as img:
+        width_in = display_emu[0] / _EMU_PER_INCH
+        if img.width / width_in <= target_dpi * _DPI_SLACK:
+            return None
+        new_w = max(int(width_in * target_dpi), 1)
+        new_h = max(int(img.height * new_w / img.width), 1)
+        resized = img.resize((new_w, new_h), Image.LANCZOS)
+        out = io.BytesIO()
+        if fmt == "JPEG":
+            if resized.mode not in ("RGB", "L"):
+                resized = resized.convert("RGB")
+            resized.save(out, "JPEG", quality=85, optimize=True)
+        else:
+            resized.save(out, "PNG", optimize=True)
+    new_data = out.getvalue()
+    return new_data if len(new_data) < len(data) else None
+
+
+def optimize_docx(*, docx_path: Path, profile: str = "standard", target_dpi: int = 220) -> DocxOptimizeResult:
+    """Shrink a DOCX in place.
+
+    - identical media parts are stored once (relationships re-pointed by content hash)
+    - images displayed at more than `target_dpi` are downsampled and re-encoded
+    - "lightweight" profile: embedded fonts are removed (fontTable/settings updated)
+
+    Untouched members are copied raw (no recompression).
+    """
+
+    if profile not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown output profile: {profile}")
+    if not docx_path.exists():
+        raise FileNotFoundError(str(docx_path))
+
+    bytes_before = docx_path.stat().st_size
+    tmp_path = docx_path.with_suffix(docx_path.suffix + ".opt")
+    try:
+        with zipfile.ZipFile(docx_path, "r") as zin:
+            infos = zin.infolist()
+            names = {i.filename for i in infos}
+
+            # 1) Deduplicate media by content hash.
+            canonical: dict[str, str] = {}
+            duplicates: dict[str, str] = {}
+            for info in infos:
+                if not info.filename.startswith("word/media/") or info.is_dir():
+                    continue
+                h = hashlib.sha256()
+                with zin.open(info) as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        h.update(chunk)
+                digest = h.hexdigest()
+                if digest in canonical:
+                    duplicates[info.filename] = canonical[digest]
+                else:
+                    canonical[digest] = info.filename
+
+            # 2) Parse relationships (small) and find what they point to. Every part's rels
+            #    (charts, diagrams, glossary, headers...) may reference a duplicate.
+            rels_parts: dict[str, str] = {}
+            font_parts: set[str] = set()
+            for info in infos:
+                if not _is_rels_part(info.filename):
+                    continue
+                xml = zin.read(info).decode("utf-8")
+                rels_parts[info.filename] = xml
+                base = _rels_source_dir(info.filename)
+                for rel in _RELATIONSHIP_RE.findall(xml):
+                    t = _TYPE_RE.search(rel)
+                    target = _TARGET_RE.search(rel)
+                    if t and target and t.group(1) == _REL_FONT:
+                        font_parts.add(_resolve(base, target.group(1)))
+
+            # 3) Display sizes of images, per source part.
+            display: dict[str, tuple[int, int]] = {}
+            for rels_name, xml in rels_parts.items():
+                base = _rels_source_dir(rels_name)
+                part = _resolve(base, posixpath.basename(rels_name)[: -len(".rels")])
+                if part not in names or not part.endswith(".xml"):
+                    continue
+                id_to_target: dict[str, str] = {}
+                for rel in _RELATIONSHIP_RE.findall(xml):
+                    rid = re.search(r'Id="([^"]+)"', rel)
+                    target = _TARGET_RE.search(rel)
+                    if rid and target and "TargetMode=\"External\"" not in rel:
+                        id_to_target[rid.group(1)] = duplicates.get(
+                            _resolve(base, target.group(1)), _resolve(base, target.group(1))
+                        )
+                if not any(t.startswith("word/media/") for t in id_to_target.values()):
+                    continue
+                try:
+                    for target, (cx, cy) in _display_sizes(zin, part, id_to_target).items():
+                        w, h = display.get(target, (0, 0))
+                        display[target] = (max(w, cx), max(h, cy))
+                except ET.ParseError:
+                    continue
+
+            drop_fonts = profile == "lightweight" and bool(font_parts)
+            images_recompressed = 0
+
+            def rewrite_rels(name: str, xml: str) -> str:
+                base = _rels_source_dir(name)
+
+                def fix(rel_match: re.Match) -> str:
+                    rel = rel_match.group(0)
+                    t = _TYPE_RE.search(rel)
+                    if drop_fonts and t and t.group(1) == _REL_FONT:
+                        return ""
+                    target = _TARGET_RE.search(rel)
+                    if target:
+                        resolved = _resolve(base, target.group(1))
+                        if resolved in duplicates:
+                            new_target = _relative(base, duplicates[resolved])
+                            return rel.replace(target.group(0), f'Target="{new_target}"')
+                    return rel
+
+                return _RELATIONSHIP_RE.sub(fix, xml)
+
+            dropped_parts = set(duplicates) | (font_parts if drop_fonts else set())
+
+            def rewrite_content_types(xml: str) -> str:
+                # Overrides of parts that are no longer in the package make it invalid.
+                def fix(override: re.Match) -> str:
+                    part = _PART_NAME_RE.search(override.group(0))
+                    return "" if part and part.group(1).lstrip("/") in dropped_parts else override.group(0)
+
+                return _OVERRIDE_RE.sub(fix, xml)
+
+            def write_all(zout) -> int:
+                recompressed = 0
+                for info in infos:
+                    name = info.filename
+                    if name in dropped_parts:
+                        continue
+                    if name == _CONTENT_TYPES and dropped_parts:
+                        xml = zin.read(info).decode("utf-8")
+                        new_xml = rewrite_content_types(xml)
+                        if new_xml != xml:
+                            zout.write_bytes(name, new_xml.encode("utf-8"), date_time=info.date_time)
+                            continue
+                    if name in rels_parts:
+                        new_xml = rewrite_rels(name, rels_parts[name])
+                        if new_xml != rels_parts[name]:
+                            zout.write_bytes(name, new_xml.encode("utf-8"), date_time=info.date_time)
+                            continue
+                    elif drop_fonts and name == "word/fontTable.xml":
+                        xml = zin.read(info).decode("utf-8")
+                        zout.write_bytes(name, _EMBED_FONT_RE.sub("", xml).encode("utf-8"), date_time=info.date_time)
+                        continue
+                    elif drop_fonts and name == "word/settings.xml":
+                        xml = zin.read(info).decode("utf-8")
+                        zout.write_bytes(name, _FONT_SETTINGS_RE.sub("", xml).encode("utf-8"), date_time=info.date_time)
+                        continue
+                    elif name in display:
+                        ext = posixpath.splitext(name)[1].lower()
+                        try:
+                            new_data = _recompress(zin.read(info), ext, display[name], target_dpi)
+                        except Exception:  # noqa: BLE001
+                            # Unreadable/unsupported image: keep it as-is.
+                            new_data = None
+                        if new_data is not None:
+                            zout.write_bytes(name, new_data, date_time=info.date_time, deflate=False)
+                            recompressed += 1
+                            continue
+                    zout.copy_raw(zin, info)
+                return recompressed
+
+            if not duplicates and not drop_fonts and not display:
+                return DocxOptimizeResult(bytes_before, bytes_before, 0, 0, 0)
+
+            try:
+                with DocxZipWriter(tmp_path) as zout:
+                    images_recompressed = write_all(zout)
+            except DocxZipError as e:
+                raise DocxOptimizeError(f"Cannot rewrite DOCX: {e}") from e
+
+        bytes_after = tmp_path.stat().st_size
+        if bytes_after >= bytes_before:
+            tmp_path.unlink()
+            return DocxOptimizeResult(bytes_before, bytes_before, 0, 0, 0)
+        tmp_path.replace(docx_path)
+        return DocxOptimizeResult(
+            bytes_before=bytes_before,
+            bytes_after=bytes_after,
+            media_deduplicated=len(duplicates),
+            images_recompressed=images_recompressed,
+            fonts_removed=len(font_parts) if drop_fonts else 0,
+        )
+
+    except DocxOptimizeError:
+        raise
+    except Exception as e:  # noqa: BLE001
+        try:
+            tmp_path.unlink()
+        except Exception:  # noqa: BLE001
+            pass
+        raise DocxOptimizeError(str(e)) from e
@@ -1,61 +1,333 @@
 from __future__ import annotations
 
-import re
+import logging
 import zipfile
 from pathlib import Path
+from xml.parsers import expat
+
+from .docx_zip import DocxZipError, DocxZipWriter
+
+
+logger = logging.getLogger(__name__)
 
 
 class DocxPostprocessError(RuntimeError):
     pass
 
 
-_PAGE_BREAK_RE = re.compile(r"<w:br\b[^>]*w:type=\"page\"[^>]*/>")
-_LAST_RENDERED_RE = re.compile(r"<w:lastRenderedPageBreak\s*/>")
-_PAGE_BREAK_BEFORE_RE = re.compile(r"<w:pageBreakBefore\s*/>")
+# Paragraphs containing any of these (case-insensitive) are Aspose evaluation watermarks.
+ASPOSE_WATERMARK_KEYWORDS = (
+    "evaluation only",
+    "aspose.words",
+    "evaluation copy",
+    "temporary-license",
+    "products.aspose.com",
+    "created with an evaluation copy",
+)
 
+_DOCUMENT_XML = "word/document.xml"
+_FLUSH_BYTES = 256 * 1024
+_TRUE_VALUES = ("1", "true", "on")
 
-def normalize_docx_page_breaks(*, docx_path: Path, aggressive: bool = False) -> None:
-    """Reduce common pdf2docx page-break artifacts.
 
-    - Removes <w:lastRenderedPageBreak/> which can show up mid-paragraph.
-    - Collapses repeated consecutive page breaks into a single break.
+def _escape_text(s: str) -> str:
+    return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
-    This is a best-effort normalization; it doesn't guarantee perfect layout.
+
+def _escape_attr(s: str) -> str:
+    return (
+        s.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace("\n", "&#10;")
+        .replace("\r", "&#13;")
+        .replace("\t", "&#9;")
+    )
+
+
+class _DocumentRewriter:
+    """Streaming rewrite of word/document.xml applying every enabled transform.
+
+    - drops <w:lastRenderedPageBreak/> (stale layout hints that show up mid-paragraph)
+    - aggressive: drops explicit page breaks (<w:br w:type="page"/>, <w:pageBreakBefore/>)
+    - remove_watermark: drops body paragraphs whose text matches a watermark keyword
+
+    Events come from expat without namespace processing, so the output keeps the
+    original prefixes and namespace declarations. Only the current top-level paragraph
+    is buffered (to decide whether it is a watermark); everything else is written as
+    it is parsed.
+    """
+
+    def __init__(self, out, *, aggressive: bool, remove_watermark: bool, watermark_keywords: tuple[str, ...]) -> None:
+        self._out = out
+        self._aggressive = aggressive
+        self._remove_watermark = remove_watermark
+        self._keywords = watermark_keywords
+        self._chunks: list[str] = []
+        self._size = 0
+        self._open_tag = False  # start tag written without its closing '>'
+        self._skip_depth = 0
+        self._stack: list[str] = []
+        # Watermark detection state (top-level body paragraph only).
+        self._para_buf: list[str] | None = None
+        self._para_text: list[str] = []
+        self._p_nesting = 0
+        self._in_t = False
+        self.removed_paragraphs = 0
+        self.removed_breaks = 0
+
+    # ---- output ----------------------------------------------------------
+
+    def _emit(self, s: str) -> None:
+        if self._para_buf is not None:
+            self._para_buf.append(s)
+            return
+        self._chunks.append(s)
+        self._size += len(s)
+        if self._size >= _FLUSH_BYTES:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._chunks:
+            self._out.write("".join(self._chunks).encode("utf-8"))
+            self._chunks = []
+            self._size = 0
+
+    def _close_open_tag(self) -> None:
+        if self._open_tag:
+            self._emit(">")
+            self._open_tag = False
+
+    # ---- transforms ------------------------------------------------------
+
+    def _drop(self, name: str, attrs: list[str]) -> bool:
+        if name == "w:lastRenderedPageBreak":
+            return True
+        if not self._aggressive:
+            return False
+        if name == "w:br":
+            return dict(zip(attrs[::2], attrs[1::2])).get("w:type") == "page"
+        if name == "w:pageBreakBefore":
+            val = dict(zip(attrs[::2], attrs[1::2])).get("w:val")
+            return val is None or val.lower() in _TRUE_VALUES
+        return False
+
+    # ---- expat handlers --------------------------------------------------
+
+    def xml_decl(self, version, encoding, standalone) -> None:
+        decl = f'<?xml version="{version or "1.0"}" encoding="UTF-8"'
+        if standalone == 1:
+            decl += ' standalone="yes"'
+        elif standalone == 0:
+            decl += ' standalone="no"'
+        self._emit(decl + "?>\n")
+
+    def start(self, name: str, attrs: list[str]) -> None:
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        if self._drop(name, attrs):
+            self._close_open_tag()
+            self._skip_depth = 1
+            self.removed_breaks += name != "w:lastRenderedPageBreak"
+            return
+
+        self._close_open_tag()
+        if name == "w:p":
+            if self._remove_watermark and self._p_nesting == 0 and self._stack and self._stack[-1] == "w:body":
+                self._para_buf = []
+                self._para_text = []
+            self._p_nesting += 1
+        elif self._para_buf is not None and self._p_nesting == 1:
+            if name == "w:t":
+                self._in_t = True
+            elif name == "w:tab":
+                self._para_text.append("\t")
+            elif name in ("w:br", "w:cr"):
+                self._para_text.append("\n")
+
+        parts = [f"<{name}"]
+        for i in range(0, len(attrs), 2):
+            parts.append(f' {attrs[i]}="{_escape_attr(attrs[i + 1])}"')
+        self._emit("".join(parts))
+        self._open_tag = True
+        self._stack.append(name)
+
+    def end(self, name: str) -> None:
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        self._stack.pop()
+        if self._open_tag:
+            self._emit("/>")
+            self._open_tag = False
+        else:
+            self._emit(f"</{name}>")
+
+        if name == "w:t":
+            self._in_t = False
+        elif name == "w:p":
+            self._p_nesting -= 1
+            if self._p_nesting == 0 and self._para_buf is not None:
+                buf, self._para_buf = self._para_buf, None
+                text = "".join(self._para_text).lower()
+                if any(k in text for k in self._keywords):
+                    self.removed_paragraphs += 1
+                else:
+                    for s in buf:
+                        self._emit(s)
+
+    def chars(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        self._close_open_tag()
+        if self._in_t and self._p_nesting == 1:
+            self._para_text.append(data)
+        self._emit(_escape_text(data))
+
+    def pi(self, target: str, data: str) -> None:
+        if self._skip_depth:
+            return
+        self._close_open_tag()
+        self._emit(f"<?{target} {data}?>" if data else f"<?{target}?>")
+
+    def comment(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        self._close_open_tag()
+        self._emit(f"<!--{data}-->")
+
+    def run(self, src) -> None:
+        parser = expat.ParserCreate()
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.XmlDeclHandler = self.xml_decl
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.chars
+        parser.ProcessingInstructionHandler = self.pi
+        parser.CommentHandler = self.comment
+        parser.ParseFile(src)
+        self.flush()
+
+
+def postprocess_docx(
+    *,
+    docx_path: Path,
+    aggressive_page_breaks: bool = False,
+    remove_watermark: bool = False,
+    watermark_keywords: tuple[str, ...] = ASPOSE_WATERMARK_KEYWORDS,
+) -> None:
+    """Apply all DOCX fixes in a single pass.
+
+    `word/document.xml` is streamed through one rewriter (see _DocumentRewriter) and
+    every other member is copied as raw compressed bytes, so the cost no longer
+    depends on how much media the document carries.
+
+    If that pass fails with remove_watermark set, the watermark is still removed on
+    its own (see _remove_watermark_only) before the error is raised: a failed
+    page-break cleanup must not ship the Aspose evaluation watermark.
     """
 
     if not docx_path.exists():
         raise FileNotFoundError(str(docx_path))
 
+    keywords = tuple(k.lower() for k in watermark_keywords)
+    try:
+        _rewrite_document(
+            docx_path=docx_path,
+            aggressive_page_breaks=aggressive_page_breaks,
+            remove_watermark=remove_watermark,
+            keywords=keywords,
+        )
+    except DocxPostprocessError as e:
+        if not remove_watermark:
+            raise
+        try:
+            removed = _remove_watermark_only(docx_path, keywords)
+        except Exception as e_retry:  # noqa: BLE001
+            raise DocxPostprocessError(f"{e}; watermark-only retry failed: {e_retry}") from e_retry
+        logger.warning("DOCX postprocess failed (%s); removed %s watermark paragraph(s) on their own", e, removed)
+        raise
+
+
+def _remove_watermark_only(docx_path: Path, keywords: tuple[str, ...]) -> int:
+    """Fallback watermark removal through python-docx (independent of the streaming parser)."""
+
+    from docx import Document
+
+    doc = Document(str(docx_path))
+    removed = 0
+    for para in list(doc.paragraphs):
+        if any(k in para.text.lower() for k in keywords):
+            element = para._element
+            element.getparent().remove(element)
+            removed += 1
+    if removed:
+        doc.save(str(docx_path))
+    return removed
+
+
+def _rewrite_document(
+    *,
+    docx_path: Path,
+    aggressive_page_breaks: bool,
+    remove_watermark: bool,
+    keywords: tuple[str, ...],
+) -> None:
+    tmp_path = docx_path.with_suffix(docx_path.suffix + ".tmp")
     try:
         with zipfile.ZipFile(docx_path, "r") as zin:
+            infos = zin.infolist()
+            if not any(i.filename == _DOCUMENT_XML for i in infos):
+                raise DocxPostprocessError("DOCX missing word/document.xml")
+
+            def rewrite(out) -> None:
+                with zin.open(_DOCUMENT_XML) as src:
+                    _DocumentRewriter(
+                        out,
+                        aggressive=aggressive_page_breaks,
+                        remove_watermark=remove_watermark,
+                        watermark_keywords=keywords,
+                    ).run(src)
+
             try:
-                xml_bytes = zin.read("word/document.xml")
-            except KeyError as e:
-                raise DocxPostprocessError("DOCX missing word/document.xml") from e
-
-            xml = xml_bytes.decode("utf-8")
-
-            # Remove rendered page breaks
-            xml2 = _LAST_RENDERED_RE.sub("", xml)
-
-            if aggressive:
-                # Remove explicit page breaks and "page break before" flags.
-                # This reduces unwanted "ngắt trang" artifacts in Word.
-                xml2 = _PAGE_BREAK_RE.sub("", xml2)
-                xml2 = _PAGE_BREAK_BEFORE_RE.sub("", xml2)
-
-        # Write back by rebuilding zip (in-place safe update)
-        tmp_path = docx_path.with_suffix(docx_path.suffix + ".tmp")
-        with zipfile.ZipFile(docx_path, "r") as zin, zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zout:
-            for item in zin.infolist():
-                data = zin.read(item.filename)
-                if item.filename == "word/document.xml":
-                    data = xml2.encode("utf-8")
-                zout.writestr(item, data)
+                with DocxZipWriter(tmp_path) as zout:
+                    for info in infos:
+                        if info.filename == _DOCUMENT_XML:
+                            with zout.open_deflated(info.filename, date_time=info.date_time) as out:
+                                rewrite(out)
+                        else:
+                            zout.copy_raw(zin, info)
+            except DocxZipError:
+                # Unusual archive (zip64/encrypted): rebuild it with zipfile instead.
+                with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+                    for info in infos:
+                        if info.filename == _DOCUMENT_XML:
+                            with zout.open(info.filename, "w") as out:
+                                rewrite(out)
+                        else:
+                            zout.writestr(info, zin.read(info.filename))
 
         tmp_path.replace(docx_path)
 
     except DocxPostprocessError:
         raise
     except Exception as e:  # noqa: BLE001
+        try:
+            tmp_path.unlink()
+        except Exception:  # noqa: BLE001
+            pass
         raise DocxPostprocessError(str(e)) from e
+
+
+def normalize_docx_page_breaks(*, docx_path: Path, aggressive: bool = False) -> None:
+    """Reduce common pdf2docx page-break artifacts.
+
+    - Removes <w:lastRenderedPageBreak/> which can show up mid-paragraph.
+    - aggressive: also removes explicit page breaks and "page break before" flags.
+
+    This is a best-effort normalization; it doesn't guarantee perfect layout.
+    """
+
+    postprocess_docx(docx_path=docx_path, aggressive_page_breaks=aggressive)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import re
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+
+# 1 twip = 1/20 pt = 635 EMU
+EMU_PER_TWIP = 635
+
+_NS = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"'
+)
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_REL_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+_REL_STYLES = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+_CONTENT_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "jpg": "image/jpeg",
+}
+
+# Characters not allowed in XML 1.0 (python-docx rejects them outright).
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+# Word 2010 defaults, same as python-docx's default template.
+_STYLES_XML = (
+    _XML_DECL
+    + '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:docDefaults>"
+    '<w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="Calibri" w:cs="Times New Roman"/>'
+    '<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="en-US"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="200" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+    "</w:docDefaults>"
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+    "</w:styles>"
+)
+
+
+class DocxWriterError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class PageSetup:
+    """Section geometry in twips (defaults: US Letter, 1" margins, like python-docx)."""
+
+    width: int = 12240
+    height: int = 15840
+    top: int = 1440
+    bottom: int = 1440
+    left: int = 1440
+    right: int = 1440
+
+    @property
+    def usable_width_emu(self) -> int:
+        return (self.width - self.left - self.right) * EMU_PER_TWIP
+
+    @property
+    def usable_height_emu(self) -> int:
+        return (self.height - self.top - self.bottom) * EMU_PER_TWIP
+
+
+class StreamingDocxWriter:
+    """Minimal DOCX writer that streams content instead of building a document tree.
+
+    Paragraph XML is appended to a spooled temp file and media parts are written into
+    the zip as soon as they are added, so memory stays constant per paragraph/page.
+    `word/document.xml` is assembled from the spool on `close()`.
+
+    Use as a context manager; on error the partial output file is removed.
+    """
+
+    def __init__(self, out_path: Path, *, page: PageSetup | None = None) -> None:
+        self.out_path = out_path
+        self.page = page or PageSetup()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._body = tempfile.SpooledTemporaryFile(max_size=1024 * 1024, mode="w+b")
+        self._media: list[tuple[str, str]] = []  # (rId, target)
+        self._extensions: set[str] = set()
+        self._closed = False
+        self.paragraph_count = 0
+
+    def __enter__(self) -> StreamingDocxWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write(self, xml: str) -> None:
+        self._body.write(xml.encode("utf-8"))
+
+    def add_paragraph(self, text: str) -> None:
+        text = _INVALID_XML_CHARS.sub("", text)
+        self._write(f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>')
+        self.paragraph_count += 1
+
+    def add_picture(self, data: bytes, *, width_emu: int, height_emu: int, ext: str = "png") -> None:
+        """Add a paragraph (no spacing) holding one inline picture."""
+
+        ext = ext.lower().lstrip(".")
+        if ext not in _CONTENT_TYPES:
+            raise DocxWriterError(f"Unsupported image type: {ext}")
+
+        n = len(self._media) + 1
+        rid = f"rId{n + 1}"  # rId1 is the styles part
+        target = f"media/image{n}.{ext}"
+        # Images are already compressed; storing them avoids a pointless deflate pass.
+        self._zip.writestr(f"word/{target}", data, compress_type=zipfile.ZIP_STORED)
+        self._media.append((rid, target))
+        self._extensions.add(ext)
+
+        cx, cy = int(width_emu), int(height_emu)
+        self._write(
+            '<w:p><w:pPr><w:spacing w:before="0" w:after="0"/></w:pPr><w:r><w:drawing>'
+            f'<wp:inline distT="0" distB="0" distL="0" distR="0"><wp:extent cx="{cx}" cy="{cy}"/>'
+            f'<wp:docPr id="{n}" name="Picture {n}"/>'
+            '<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+            '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+            f'<pic:pic><pic:nvPicPr><pic:cNvPr id="{n}" name="image{n}.{ext}"/><pic:cNvPicPr/></pic:nvPicPr>'
+            f'<pic:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+            f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+            '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr></pic:pic>'
+            "</a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>"
+        )
+        self.paragraph_count += 1
+
+    def _sect_pr(self) -> str:
+        pg = self.page
+        return (
+            f'<w:sectPr><w:pgSz w:w="{pg.width}" w:h="{pg.height}"/>'
+            f'<w:pgMar w:top="{pg.top}" w:right="{pg.right}" w:bottom="{pg.bottom}" w:left="{pg.left}" '
+            'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+        )
+
+    def close(self) -> Path:
+        if self._closed:
+            return self.out_path
+        self._closed = True
+        try:
+            with self._zip.open("word/document.xml", "w") as out:
+                out.write(f"{_XML_DECL}<w:document {_NS}><w:body>".encode("utf-8"))
+                self._body.seek(0)
+                shutil.copyfileobj(self._body, out, 1024 * 1024)
+                out.write(f"{self._sect_pr()}</w:body></w:document>".encode("utf-8"))
+
+            self._zip.writestr("word/styles.xml", _STYLES_XML)
+
+            rels = [f'<Relationship Id="rId1" Type="{_REL_STYLES}" Target="styles.xml"/>']
+            rels += [f'<Relationship Id="{rid}" Type="{_REL_IMAGE}" Target="{target}"/>' for rid, target in self._media]
+            self._zip.writestr(
+                "word/_rels/document.xml.rels",
+                _XML_DECL
+                + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                + "".join(rels)
+                + "</Relationships>",
+            )
+
+            defaults = "".join(
+                f'<Default Extension="{ext}" ContentType="{_CONTENT_TYPES[ext]}"/>' for ext in sorted(self._extensions)
+            )
+            self._zip.writestr(
+                "[Content_Types].xml",
+                _XML_DECL
+                + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                + '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                + '<Default Extension="xml" ContentType="application/xml"/>'
+                + defaults
+                + '<Override PartName="/word/document.xml" '
+                + 'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                + '<Override PartName="/word/styles.xml" '
+                + 'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+                + "</Types>",
+            )
+            self._zip.writestr(
+                "_rels/.rels",
+                _XML_DECL
+                + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                + '<Relationship Id="rId1" '
+                + 'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+                + 'Target="word/document.xml"/>'
+                + "</Relationships>",
+            )
+        except Exception as e:  # noqa: BLE001
+            self.abort()
+            raise DocxWriterError(f"Failed to write DOCX: {e}") from e
+        finally:
+            self._body.close()
+            self._zip.close()
+        return self.out_path
+
+    def abort(self) -> None:
+        self._closed = True
+        try:
+            self._body.close()
+            self._zip.close()
+        except Exception:  # noqa: BLE001
+            pass
+        try:
+            self.out_path.unlink()
+        except Exception:  # noqa: BLE001
+            # best-effort cleanup
+            pass
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+
+
+# Layouts match the ones used by the stdlib zipfile module.
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_DIR = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_LOCAL_SIG = b"PK\x03\x04"
+_CENTRAL_SIG = b"PK\x01\x02"
+_END_SIG = b"PK\x05\x06"
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_MAX_32 = 0xFFFFFFFF
+_VERSION = 20  # 2.0: deflate
+
+
+class DocxZipError(RuntimeError):
+    pass
+
+
+def _dos_datetime(date_time: tuple[int, int, int, int, int, int]) -> tuple[int, int]:
+    y, mo, d, h, mi, s = date_time
+    return (h << 11) | (mi << 5) | (s // 2), ((max(y, 1980) - 1980) << 9) | (mo << 5) | d
+
+
+class _Member:
+    __slots__ = ("name", "flags", "compress_type", "dos_time", "dos_date", "crc", "compress_size", "file_size", "offset", "external_attr")
+
+    def __init__(self, name: bytes, flags: int, compress_type: int, date_time, external_attr: int = 0) -> None:
+        self.name = name
+        self.flags = flags
+        self.compress_type = compress_type
+        self.dos_time, self.dos_date = _dos_datetime(date_time)
+        self.crc = 0
+        self.compress_size = 0
+        self.file_size = 0
+        self.offset = 0
+        self.external_attr = external_attr
+
+    def local_header(self) -> bytes:
+        return _LOCAL_HEADER.pack(
+            _LOCAL_SIG, _VERSION, 0, self.flags, self.compress_type, self.dos_time, self.dos_date,
+            self.crc, self.compress_size, self.file_size, len(self.name), 0,
+        ) + self.name
+
+    def central_record(self) -> bytes:
+        return _CENTRAL_DIR.pack(
+            _CENTRAL_SIG, _VERSION, 0, _VERSION, 0, self.flags, self.compress_type, self.dos_time, self.dos_date,
+            self.crc, self.compress_size, self.file_size, len(self.name), 0, 0, 0, 0, self.external_attr, self.offset,
+        ) + self.name
+
+
+def _encode_name(name: str) -> tuple[bytes, int]:
+    try:
+        return name.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return name.encode("utf-8"), _FLAG_UTF8
+
+
+class DeflateMemberWriter:
+    """File-like sink for one deflated member; sizes/CRC are patched into its header on close."""
+
+    def __init__(self, owner: DocxZipWriter, member: _Member) -> None:
+        self._owner = owner
+        self._member = member
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        self._closed = False
+
+    def write(self, data: bytes) -> int:
+        m = self._member
+        m.crc = zlib.crc32(data, m.crc)
+        m.file_size += len(data)
+        out = self._compressor.compress(data)
+        if out:
+            self._owner._fp.write(out)
+            m.compress_size += len(out)
+        return len(data)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        m = self._member
+        tail = self._compressor.flush()
+        fp = self._owner._fp
+        fp.write(tail)
+        m.compress_size += len(tail)
+        if m.file_size > _MAX_32 or m.compress_size > _MAX_32:
+            raise DocxZipError(f"{m.name!r} is too large (zip64 not supported)")
+        end = fp.tell()
+        fp.seek(m.offset)
+        fp.write(m.local_header())
+        fp.seek(end)
+        self._owner._open_member = None
+
+    def __enter__(self) -> DeflateMemberWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class DocxZipWriter:
+    """Write a zip (DOCX) where untouched members are copied as raw compressed bytes.
+
+    Rewriting a DOCX with `zipfile` inflates and re-deflates every part, including
+    large media. `copy_raw` instead moves the member's compressed payload as-is, and
+    `open_deflated` streams a rewritten part. Zip64 is not supported (DOCX parts are
+    far below 4 GiB); callers fall back to `zipfile` on DocxZipError.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._fp: BinaryIO = path.open("wb")
+        self._members: list[_Member] = []
+        self._open_member: DeflateMemberWriter | None = None
+
+    def __enter__(self) -> DocxZipWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._fp.close()
+
+    def _start(self, member: _Member) -> None:
+        if self._open_member is not None:
+            raise DocxZipError("Previous member is still open")
+        member.offset = self._fp.tell()
+        if member.offset > _MAX_32:
+            raise DocxZipError("Archive too large (zip64 not supported)")
+        self._members.append(member)
+
+    def copy_raw(self, src: zipfile.ZipFile, info: zipfile.ZipInfo, *, name: str | None = None) -> None:
+        """Copy `info` from `src` without decompressing it (optionally under a new `name`)."""
+
+        if info.file_size > _MAX_32 or info.compress_size > _MAX_32 or info.flag_bits & 0x1:
+            raise DocxZipError(f"Cannot raw-copy {info.filename!r}")
+
+        encoded, utf8 = _encode_name(name or info.filename)
+        # Sizes come from the central directory, so a data descriptor is never needed.
+        flags = (info.flag_bits & ~_FLAG_DATA_DESCRIPTOR & ~_FLAG_UTF8) | utf8
+        member = _Member(encoded, flags, info.compress_type, info.date_time, info.external_attr)
+        member.crc = info.CRC
+        member.compress_size = info.compress_size
+        member.file_size = info.file_size
+        self._start(member)
+        self._fp.write(member.local_header())
+
+        src_fp = src.fp
+        if src_fp is None:
+            raise DocxZipError("Source archive is closed")
+        src_fp.seek(info.header_offset)
+        header = src_fp.read(_LOCAL_HEADER.size)
+        if len(header) != _LOCAL_HEADER.size or header[:4] != _LOCAL_SIG:
+            raise DocxZipError(f"Bad local header for {info.filename!r}")
+        fields = _LOCAL_HEADER.unpack(header)
+        src_fp.seek(fields[10] + fields[11], 1)  # file name + extra field
+
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = src_fp.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                raise DocxZipError(f"Truncated member {info.filename!r}")
+            self._fp.write(chunk)
+            remaining -= len(chunk)
+
+    def open_deflated(self, name: str, *, date_time=(1980, 1, 1, 0, 0, 0)) -> DeflateMemberWriter:
+        encoded, utf8 = _encode_name(name)
+        member = _Member(encoded, utf8, zipfile.ZIP_DEFLATED, date_time)
+        self._start(member)
+        self._fp.write(member.local_header())  # placeholder, patched on close
+        writer = DeflateMemberWriter(self, member)
+        self._open_member = writer
+        return writer
+
+    def write_bytes(self, name: str, data: bytes, *, date_time=(1980, 1, 1, 0, 0, 0), deflate: bool = True) -> None:
+        """Write a whole member; deflate=False stores it (for already-compressed media)."""
+
+        if not deflate:
+            encoded, utf8 = _encode_name(name)
+            member = _Member(encoded, utf8, zipfile.ZIP_STORED, date_time)
+            member.crc = zlib.crc32(data)
+            member.compress_size = member.file_size = len(data)
+            self._start(member)
+            self._fp.write(member.local_header())
+            self._fp.write(data)
+            return
+        with self.open_deflated(name, date_time=date_time) as out:
+            out.write(data)
+
+    def close(self) -> None:
+        if self._open_member is not None:
+            self._open_member.close()
+        start = self._fp.tell()
+        for m in self._members:
+            self._fp.write(m.central_record())
+        size = self._fp.tell() - start
+        if len(self._members) > 0xFFFF or start > _MAX_32:
+            self._fp.close()
+            raise DocxZipError("Archive too large (zip64 not supported)")
+        self._fp.write(_END_RECORD.pack(_END_SIG, 0, 0, len(self._members), len(self._members), size, start, 0))
+        self._fp.close()
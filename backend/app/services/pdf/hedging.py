@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import concurrent.futures
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Generic, TypeVar
+
+from ...core.config import settings
+from ...utils.cpu_slots import cpu_slot
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_WINDOW = 200
+# Latency grows with page count, so history is kept per size bucket (80+ is chunked).
+_SIZE_BUCKETS = ((4, "1-4"), (19, "5-19"), (79, "20-79"))
+
+
+def size_bucket(page_count: int) -> str:
+    for upper, name in _SIZE_BUCKETS:
+        if page_count <= upper:
+            return name
+    return "80+"
+
+
+class LatencyHistory:
+    """Recent latencies (seconds) of one engine, per page-count bucket."""
+
+    def __init__(self, window: int = _WINDOW) -> None:
+        self._window = window
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, bucket: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(bucket, deque(maxlen=self._window)).append(seconds)
+
+    def count(self, bucket: str) -> int:
+        with self._lock:
+            return len(self._samples.get(bucket, ()))
+
+    def percentile(self, bucket: str, p: float) -> float | None:
+        with self._lock:
+            ordered = sorted(self._samples.get(bucket, ()))
+        if not ordered:
+            return None
+        return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+    def stats(self) -> dict:
+        out = {}
+        for bucket in sorted(self._samples):
+            out[bucket] = {
+                "samples": self.count(bucket),
+                "p50_sec": _round(self.percentile(bucket, 0.50)),
+                "p95_sec": _round(self.percentile(bucket, 0.95)),
+                "p99_sec": _round(self.percentile(bucket, 0.99)),
+            }
+        return out
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
+
+
+@dataclass(frozen=True)
+class HedgeOutcome(Generic[T]):
+    value: T
+    winner: str  # "primary" | "hedge"
+    hedged: bool
+
+
+_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            # Each conversion thread runs at most one primary and one hedge at a time,
+            # so neither side ever queues behind another job.
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(settings.conversion_threads, 1) * 2,
+                thread_name_prefix="hedge",
+            )
+        return _executor
+
+
+def _run_local(fn: Callable[[threading.Event], T], cancel: threading.Event) -> T:
+    # The hedge is local CPU work: it takes a conversion slot like any other job.
+    with cpu_slot():
+        if cancel.is_set():
+            raise concurrent.futures.CancelledError()
+        return fn(cancel)
+
+
+class Hedger:
+    """Hedged execution for a remote primary engine (Adobe).
+
+    The primary starts right away. If it hasn't finished after the configured
+    percentile of its recent latency for similar page counts, `hedge` (a local
+    engine) starts in parallel. The first result accepted by `accept` (the quality
+    gates) wins and the other side is told to stop through its cancel event. A primary
+    result that `accept` rejects is returned at once (the hedge is stopped), so the
+    caller's own guards handle it as without hedging. If the primary fails before the
+    hedge point its error is raised as usual, so the regular fallback chain takes over.
+    """
+
+    def __init__(self, engine: str) -> None:
+        self.engine = engine
+        self.history = LatencyHistory()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.primary_wins = 0
+        self.hedge_wins = 0
+        self.none_accepted = 0
+
+    def delay_sec(self, bucket: str) -> float:
+        delay = None
+        if self.history.count(bucket) >= max(settings.hedge_min_samples, 1):
+            delay = self.history.percentile(bucket, settings.hedge_percentile)
+        if delay is None:
+            delay = settings.hedge_default_delay_sec
+        return max(float(delay), float(settings.hedge_min_delay_sec))
+
+    def run(
+        self,
+        primary: Callable[[threading.Event], T],
+        hedge: Callable[[threading.Event], T],
+        *,
+        page_count: int,
+        accept: Callable[[T], bool],
+    ) -> HedgeOutcome[T]:
+        bucket = size_bucket(page_count)
+        delay = self.delay_sec(bucket)
+        cancels = {"primary": threading.Event(), "hedge": threading.Event()}
+        executor = _get_executor()
+        with self._lock:
+            self.calls += 1
+
+        t0 = time.monotonic()
+        # Both sides run in a copy of the caller's context (per-job traces live there).
+        primary_future = executor.submit(contextvars.copy_context().run, primary, cancels["primary"])
+        try:
+            value = primary_future.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        else:
+            self.history.record(bucket, time.monotonic() - t0)
+            return HedgeOutcome(value=value, winner="primary", hedged=False)
+
+        with self._lock:
+            self.hedged += 1
+        logger.info("%s still running after %.1fs (%s pages); starting local hedge", self.engine, delay, page_count)
+        hedge_future = executor.submit(contextvars.copy_context().run, _run_local, hedge, cancels["hedge"])
+        sides = {primary_future: "primary", hedge_future: "hedge"}
+        produced: dict[str, T] = {}
+        errors: dict[str, BaseException] = {}
+        pending = set(sides)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            # On a tie the primary (remote engine, better layout) wins.
+            for fut in sorted(done, key=lambda f: sides[f] != "primary"):
+                side = sides[fut]
+                try:
+                    value = fut.result()
+                except BaseException as e:  # noqa: BLE001
+                    errors[side] = e
+                    continue
+                if side == "primary":
+                    self.history.record(bucket, time.monotonic() - t0)
+                if not accept(value):
+                    produced[side] = value
+                    if side == "primary":
+                        # Don't sit out the rest of a local run only to maybe beat the
+                        # caller's own fallback for this output.
+                        cancels["hedge"].set()
+                        pending = set()
+                        break
+                    continue
+                loser = "hedge" if side == "primary" else "primary"
+                cancels[loser].set()
+                if loser == "primary" and not primary_future.done():
+                    # Censored sample (the real latency is longer): keeps slow calls in
+                    # the history so the hedge point doesn't drift down as hedges win.
+                    self.history.record(bucket, time.monotonic() - t0)
+                with self._lock:
+                    if side == "primary":
+                        self.primary_wins += 1
+                    else:
+                        self.hedge_wins += 1
+                return HedgeOutcome(value=value, winner=side, hedged=True)
+
+        with self._lock:
+            self.none_accepted += 1
+        # No result passed the gates: hand the primary's output (or error) back so the
+        # caller's own guards and fallbacks apply as without hedging.
+        if "primary" in produced:
+            return HedgeOutcome(value=produced["primary"], winner="primary", hedged=True)
+        raise errors["primary"]
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls, hedged = self.calls, self.hedged
+            counters = {
+                "calls": calls,
+                "hedged": hedged,
+                "hedge_rate": round(hedged / calls, 3) if calls else None,
+                "primary_wins": self.primary_wins,
+                "hedge_wins": self.hedge_wins,
+                "hedge_win_rate": round(self.hedge_wins / hedged, 3) if hedged else None,
+                "none_accepted": self.none_accepted,
+            }
+        latency = self.history.stats()
+        for bucket, row in latency.items():
+            row["hedge_after_sec"] = round(self.delay_sec(bucket), 2)
+        return {**counters, "latency": latency}
+
+
+_hedgers: dict[str, Hedger] = {}
+_hedgers_lock = threading.Lock()
+
+
+def get_hedger(engine: str) -> Hedger:
+    with _hedgers_lock:
+        hedger = _hedgers.get(engine)
+        if hedger is None:
+            hedger = _hedgers[engine] = Hedger(engine)
+        return hedger
+
+
+def hedge_stats() -> dict:
+    with _hedgers_lock:
+        hedgers = sorted(_hedgers.items())
+    return {
+        "enabled": settings.hedge_enabled,
+        "percentile": settings.hedge_percentile,
+        **{name: hedger.stats() for name, hedger in hedgers},
+    }
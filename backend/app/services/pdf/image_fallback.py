@@ -1,13 +1,88 @@
 from __future__ import annotations
 
-import io
+import logging
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
+from ...core.config import settings
+from ...utils.process_pool import discard_process_pool, get_process_pool, resolve_workers
+from .docx_writer import DocxWriterError, PageSetup, StreamingDocxWriter
+
+
+logger = logging.getLogger(__name__)
+
+_POOL_NAME = "pdf-raster"
+
 
 class ImageFallbackError(RuntimeError):
     pass
 
 
+# (png bytes, pixel width, pixel height)
+RenderedPage = tuple[bytes, int, int]
+
+
+def _render_range(pdf_path: str, start: int, end: int, dpi: int) -> list[RenderedPage]:
+    """Render pages [start, end] to PNG. Runs in a pool worker, which opens the PDF itself."""
+
+    import fitz  # PyMuPDF
+
+    zoom = dpi / 72.0
+    mat = fitz.Matrix(zoom, zoom)
+    out: list[RenderedPage] = []
+    doc = fitz.open(pdf_path)
+    try:
+        for idx in range(start, end + 1):
+            pix = doc.load_page(idx).get_pixmap(matrix=mat, alpha=False)
+            out.append((pix.tobytes("png"), pix.width, pix.height))
+    finally:
+        doc.close()
+    return out
+
+
+def _iter_rendered_pages(*, pdf_path: Path, page_count: int, dpi: int) -> Iterator[RenderedPage]:
+    """Yield rendered pages in page order.
+
+    Large documents are rendered by the shared process pool in page-range tasks; a job
+    keeps at most 2 x workers tasks in flight, which bounds the encoded pages held in
+    memory and leaves room in the pool for concurrent jobs.
+    """
+
+    pool_workers = resolve_workers(settings.pdf_raster_workers)
+    per_task = max(settings.pdf_raster_pages_per_task, 1)
+    if min(pool_workers, page_count) <= 1 or page_count < max(settings.pdf_raster_min_pages, 2):
+        for idx in range(page_count):
+            yield from _render_range(str(pdf_path), idx, idx, dpi)
+        return
+
+    ranges = [(s, min(s + per_task, page_count) - 1) for s in range(0, page_count, per_task)]
+    window = min(pool_workers, len(ranges)) * 2
+    pool = get_process_pool(_POOL_NAME, pool_workers)
+    pending: deque = deque()
+    next_range = 0
+    done_pages = 0
+    try:
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < window:
+                start, end = ranges[next_range]
+                pending.append(pool.submit(_render_range, str(pdf_path), start, end, dpi))
+                next_range += 1
+            for page in pending.popleft().result():
+                yield page
+                done_pages += 1
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); render the rest inline rather than failing the job.
+        logger.warning("Raster pool broke; rendering remaining pages in-process")
+        discard_process_pool(_POOL_NAME, pool)
+        for idx in range(done_pages, page_count):
+            yield from _render_range(str(pdf_path), idx, idx, dpi)
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
 def pdf_to_docx_images(
     *,
     pdf_path: Path,
@@ -21,8 +96,6 @@ def pdf_to_docx_images(
     """
 
     import fitz  # PyMuPDF
-    from docx import Document
-    from docx.shared import Emu, Inches
 
     if dpi < 72:
         dpi = 72
@@ -30,59 +103,41 @@ def pdf_to_docx_images(
     doc = fitz.open(str(pdf_path))
     try:
         page_count = doc.page_count
-        if page_count == 0:
-            raise ImageFallbackError("PDF has no pages")
-        if page_count > max_pages:
-            raise ImageFallbackError(f"PDF has too many pages ({page_count}); max is {max_pages}")
-
-        word_doc = Document()
-        section = word_doc.sections[0]
-
-        # Reduce margins to preserve page fit.
-        section.top_margin = Inches(0.25)
-        section.bottom_margin = Inches(0.25)
-        section.left_margin = Inches(0.25)
-        section.right_margin = Inches(0.25)
-
-        usable_width = section.page_width - section.left_margin - section.right_margin
-        usable_height = section.page_height - section.top_margin - section.bottom_margin
-
-        zoom = dpi / 72.0
-        mat = fitz.Matrix(zoom, zoom)
-
-        for idx in range(page_count):
-            page = doc.load_page(idx)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            img_bytes = pix.tobytes("png")
-
-            p = word_doc.add_paragraph()
-            p.paragraph_format.space_before = 0
-            p.paragraph_format.space_after = 0
-
-            run = p.add_run()
-            # Scale to fit BOTH width and height to avoid overflow that can create blank pages.
-            max_w_emu = int(usable_width)
-            max_h_emu = int(usable_height)
-            img_w = max(pix.width, 1)
-            img_h = max(pix.height, 1)
-
-            # Start by fitting width.
-            w_emu = max_w_emu
-            h_emu = int(w_emu * (img_h / img_w))
-
-            # If too tall, fit height instead.
-            if h_emu > max_h_emu:
-                h_emu = max_h_emu
-                w_emu = int(h_emu * (img_w / img_h))
-
-            run.add_picture(io.BytesIO(img_bytes), width=Emu(w_emu), height=Emu(h_emu))
-
-            # Intentionally avoid explicit page breaks; Word will paginate based on content height.
-
-        out_docx.parent.mkdir(parents=True, exist_ok=True)
-        word_doc.save(str(out_docx))
-        if out_docx.stat().st_size == 0:
-            raise ImageFallbackError("Generated DOCX is empty")
-        return out_docx
     finally:
         doc.close()
+    if page_count == 0:
+        raise ImageFallbackError("PDF has no pages")
+    if page_count > max_pages:
+        raise ImageFallbackError(f"PDF has too many pages ({page_count}); max is {max_pages}")
+
+    # Reduce margins (0.25") to preserve page fit.
+    page = PageSetup(top=360, bottom=360, left=360, right=360)
+    max_w_emu = page.usable_width_emu
+    max_h_emu = page.usable_height_emu
+
+    try:
+        # Pages are streamed into the zip as they are rendered (no in-memory document).
+        with StreamingDocxWriter(out_docx, page=page) as writer:
+            for img_bytes, width, height in _iter_rendered_pages(pdf_path=pdf_path, page_count=page_count, dpi=dpi):
+                # Scale to fit BOTH width and height to avoid overflow that can create blank pages.
+                img_w = max(width, 1)
+                img_h = max(height, 1)
+
+                # Start by fitting width.
+                w_emu = max_w_emu
+                h_emu = int(w_emu * (img_h / img_w))
+
+                # If too tall, fit height instead.
+                if h_emu > max_h_emu:
+                    h_emu = max_h_emu
+                    w_emu = int(h_emu * (img_w / img_h))
+
+                writer.add_picture(img_bytes, width_emu=w_emu, height_emu=h_emu)
+
+                # Intentionally avoid explicit page breaks; Word will paginate based on content height.
+    except DocxWriterError as e:
+        raise ImageFallbackError(str(e)) from e
+
+    if out_docx.stat().st_size == 0:
+        raise ImageFallbackError("Generated DOCX is empty")
+    return out_docx
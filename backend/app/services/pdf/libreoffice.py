@@ -3,6 +3,8 @@ from __future__ import annotations
 import subprocess
 from pathlib import Path
 
+from ...core.config import settings
+
 
 class LibreOfficeNotFoundError(RuntimeError):
     pass
@@ -12,6 +14,23 @@ class LibreOfficeConvertError(RuntimeError):
     pass
 
 
+def _convert_with_pool(*, src: Path, out_dir: Path, fmt: str, soffice_path: str, timeout_sec: int) -> Path:
+    from .libreoffice_pool import LibreOfficePoolError, LibreOfficePoolTimeout, get_libreoffice_pool
+
+    try:
+        out = get_libreoffice_pool(soffice_path).convert(src=src, out_dir=out_dir, fmt=fmt, timeout_sec=timeout_sec)
+    except LibreOfficePoolTimeout as e:
+        raise LibreOfficeConvertError("LibreOffice conversion timed out") from e
+    except LibreOfficePoolError as e:
+        raise LibreOfficeConvertError(str(e)) from e
+
+    if not out.exists():
+        raise LibreOfficeConvertError(f"LibreOffice did not produce {fmt.upper()}")
+    if out.stat().st_size == 0:
+        raise LibreOfficeConvertError(f"LibreOffice produced empty {fmt.upper()}")
+    return out
+
+
 def convert_pdf_to_docx(
     *,
     pdf_path: Path,
@@ -22,6 +41,9 @@ def convert_pdf_to_docx(
 ) -> Path:
     """Convert PDF to DOCX using LibreOffice (Tier A).
 
+    Uses the persistent LibreOffice pool when enabled (LIBREOFFICE_POOL_SIZE > 0);
+    otherwise starts a one-off soffice with `user_install_dir` as its profile.
+
     Returns path to generated .docx.
     """
 
@@ -30,6 +52,11 @@ def convert_pdf_to_docx(
     if not out_dir.exists():
         out_dir.mkdir(parents=True, exist_ok=True)
 
+    if settings.libreoffice_pool_size > 0:
+        return _convert_with_pool(
+            src=pdf_path, out_dir=out_dir, fmt="docx", soffice_path=soffice_path, timeout_sec=timeout_sec
+        )
+
     cmd = [
         soffice_path,
         "--headless",
@@ -87,6 +114,9 @@ def convert_word_to_pdf(
 ) -> Path:
     """Convert DOC/DOCX to PDF using LibreOffice.
 
+    Uses the persistent LibreOffice pool when enabled (LIBREOFFICE_POOL_SIZE > 0);
+    otherwise starts a one-off soffice with `user_install_dir` as its profile.
+
     Returns path to generated .pdf.
     """
 
@@ -95,6 +125,11 @@ def convert_word_to_pdf(
     if not out_dir.exists():
         out_dir.mkdir(parents=True, exist_ok=True)
 
+    if settings.libreoffice_pool_size > 0:
+        return _convert_with_pool(
+            src=word_path, out_dir=out_dir, fmt="pdf", soffice_path=soffice_path, timeout_sec=timeout_sec
+        )
+
     cmd = [
         soffice_path,
         "--headless",
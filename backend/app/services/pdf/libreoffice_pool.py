@@ -0,0 +1,512 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from ...core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# Export filters per target format (used by the UNO path).
+_EXPORT_FILTERS = {
+    "pdf": "writer_pdf_Export",
+    "docx": "MS Word 2007 XML",
+}
+# PDFs are opened in Writer (not Draw) so they can be saved as DOCX.
+_IMPORT_FILTERS = {
+    ".pdf": "writer_pdf_import",
+}
+
+
+# A ping (getComponents()) on a wedged soffice never returns; the health check kills it instead.
+_HEALTH_TIMEOUT_SEC = 5
+_HELPER = Path(__file__).with_name("libreoffice_uno_helper.py")
+# Sentinel put on an instance's reply queue when its helper's stdout closes.
+_EOF = object()
+
+
+class LibreOfficePoolError(RuntimeError):
+    pass
+
+
+class LibreOfficePoolTimeout(LibreOfficePoolError):
+    pass
+
+
+def _imports_uno(python: str) -> bool:
+    try:
+        return subprocess.run([python, "-c", "import uno"], capture_output=True, timeout=30).returncode == 0
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def find_uno_python(soffice_path: str) -> str | None:
+    """An interpreter that can import `uno`: LIBREOFFICE_UNO_PYTHON, the app's own, the
+    system Python (Debian's python3-uno) or the one bundled with LibreOffice."""
+
+    if settings.libreoffice_uno_python:
+        return settings.libreoffice_uno_python if _imports_uno(settings.libreoffice_uno_python) else None
+    program_dir = Path(soffice_path).resolve().parent
+    candidates = [sys.executable, "/usr/bin/python3", str(program_dir / "python"), str(program_dir / "python.exe")]
+    for python in dict.fromkeys(candidates):
+        if Path(python).is_file() and _imports_uno(python):
+            return python
+    return None
+
+
+def _free_port() -> int:
+    # Port 0: the OS picks a free port, so instances of several app processes never share one.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _Instance:
+    """One long-lived headless soffice with its own persistent user profile.
+
+    With a `uno`-capable interpreter (`uno_python`) the process listens on a local socket
+    and a helper process (libreoffice_uno_helper, under that interpreter) loads/stores each
+    document over UNO: no process start per conversion. Without one the profile is still
+    created once and reused, which removes LibreOffice's first-start initialisation from
+    every `--convert-to` call.
+    """
+
+    def __init__(self, *, index: int, soffice_path: str, profile_dir: Path, uno_python: str | None) -> None:
+        self.index = index
+        self.soffice_path = soffice_path
+        self.port: int | None = None
+        self.profile_dir = profile_dir
+        self.uno_python = uno_python
+        self.proc: subprocess.Popen | None = None
+        self.helper: subprocess.Popen | None = None
+        self._replies: queue.Queue = queue.Queue()
+        self.docs_done = 0
+        self.restarts = 0
+        self.started = False
+
+    @property
+    def use_uno(self) -> bool:
+        return self.uno_python is not None
+
+    # ---- lifecycle -------------------------------------------------------
+
+    def _base_cmd(self) -> list[str]:
+        return [
+            self.soffice_path,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--nofirststartwizard",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={self.profile_dir.as_uri()}",
+        ]
+
+    def start(self, startup_timeout_sec: int) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.docs_done = 0
+        self.started = True
+
+        if not self.use_uno:
+            # Initialise the profile once; conversions then reuse it.
+            try:
+                subprocess.run(
+                    [*self._base_cmd(), "--terminate_after_init"],
+                    capture_output=True,
+                    timeout=startup_timeout_sec,
+                )
+            except Exception as e:  # noqa: BLE001
+                raise LibreOfficePoolError(f"LibreOffice profile warm-up failed: {e}") from e
+            return
+
+        self.port = _free_port()
+        accept = f"socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        self.proc = subprocess.Popen(
+            [*self._base_cmd(), f"--accept={accept}"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.helper = subprocess.Popen(
+            [self.uno_python, str(_HELPER), accept, str(startup_timeout_sec)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+        # A fresh queue per start: replies of a killed helper can't leak into the next one.
+        self._replies = replies = queue.Queue()
+        threading.Thread(
+            target=self._read_replies,
+            args=(self.helper, replies),
+            name=f"libreoffice-uno-{self.index}",
+            daemon=True,
+        ).start()
+
+        deadline = time.monotonic() + startup_timeout_sec + 5
+        while True:
+            if self.proc.poll() is not None:
+                code = self.proc.returncode
+                self.stop()
+                raise LibreOfficePoolError(f"soffice exited during startup (code {code})")
+            try:
+                reply = replies.get(timeout=0.2)
+                break
+            except queue.Empty:
+                if time.monotonic() >= deadline:
+                    reply = {"ok": False, "error": "timed out"}
+                    break
+        if reply is _EOF or not reply.get("ok"):
+            self.stop()
+            error = "UNO helper exited" if reply is _EOF else reply.get("error")
+            raise LibreOfficePoolError(f"LibreOffice instance {self.index} did not start: {error}")
+
+    @staticmethod
+    def _read_replies(helper: subprocess.Popen, replies: queue.Queue) -> None:
+        try:
+            for line in helper.stdout:
+                try:
+                    replies.put(json.loads(line))
+                except ValueError:
+                    continue
+        except (OSError, ValueError):
+            pass
+        replies.put(_EOF)
+
+    def _request(self, req: dict, *, timeout_sec: float) -> None:
+        """Send one request to the helper; a reply not in time kills the instance."""
+
+        try:
+            self.helper.stdin.write(json.dumps(req) + "\n")
+            self.helper.stdin.flush()
+        except (OSError, ValueError, AttributeError) as e:
+            raise LibreOfficePoolError("LibreOffice UNO helper is not running") from e
+        try:
+            reply = self._replies.get(timeout=timeout_sec)
+        except queue.Empty as e:
+            # UNO calls can't be interrupted; killing soffice and the helper ends them.
+            self.kill()
+            raise LibreOfficePoolTimeout("LibreOffice conversion timed out") from e
+        if reply is _EOF:
+            raise LibreOfficePoolError("LibreOffice UNO helper exited")
+        if not reply.get("ok"):
+            raise LibreOfficePoolError(f"LibreOffice conversion failed: {reply.get('error')}")
+
+    def kill(self) -> None:
+        for proc in (self.proc, self.helper):
+            if proc is not None and proc.poll() is None:
+                try:
+                    proc.kill()
+                except Exception:  # noqa: BLE001
+                    pass
+
+    def stop(self) -> None:
+        if self.helper is not None and self.helper.poll() is None and self.proc is not None and self.proc.poll() is None:
+            try:
+                # Asks soffice to terminate (the desktop is only reachable over the bridge).
+                self._request({"op": "quit"}, timeout_sec=5)
+            except Exception:  # noqa: BLE001
+                pass
+        for proc in (self.helper, self.proc):
+            if proc is None:
+                continue
+            try:
+                proc.wait(timeout=5)
+            except Exception:  # noqa: BLE001
+                try:
+                    proc.kill()
+                    proc.wait(timeout=5)
+                except Exception:  # noqa: BLE001
+                    pass
+        if self.helper is not None:
+            for stream in (self.helper.stdin, self.helper.stdout):
+                try:
+                    stream.close()
+                except Exception:  # noqa: BLE001
+                    pass
+        self.proc = self.helper = None
+
+    def reset_profile(self) -> None:
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def healthy(self) -> bool:
+        if not self.use_uno:
+            return (self.profile_dir / "user").exists()
+        if self.proc is None or self.proc.poll() is not None or self.helper is None or self.helper.poll() is not None:
+            return False
+        try:
+            self._request({"op": "ping"}, timeout_sec=_HEALTH_TIMEOUT_SEC)
+            return True
+        except LibreOfficePoolError:
+            return False
+
+    # ---- conversion ------------------------------------------------------
+
+    def convert(self, *, src: Path, out_dir: Path, fmt: str, timeout_sec: int) -> Path:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / f"{src.stem}.{fmt}"
+        if self.use_uno:
+            self._request(
+                {
+                    "op": "convert",
+                    "src": str(src.resolve()),
+                    "out": str(out_path.resolve()),
+                    "filter": _EXPORT_FILTERS[fmt],
+                    "infilter": _IMPORT_FILTERS.get(src.suffix.lower()),
+                },
+                timeout_sec=max(int(timeout_sec), 1),
+            )
+        else:
+            self._convert_cli(src=src, out_dir=out_dir, fmt=fmt, timeout_sec=timeout_sec)
+        self.docs_done += 1
+        return out_path
+
+    def _convert_cli(self, *, src: Path, out_dir: Path, fmt: str, timeout_sec: int) -> None:
+        cmd = [*self._base_cmd()]
+        infilter = _IMPORT_FILTERS.get(src.suffix.lower())
+        if infilter:
+            cmd.append(f"--infilter={infilter}")
+        cmd += ["--convert-to", fmt, "--outdir", str(out_dir), str(src)]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=timeout_sec)
+        except subprocess.TimeoutExpired as e:
+            raise LibreOfficePoolTimeout("LibreOffice conversion timed out") from e
+        except subprocess.CalledProcessError as e:
+            stderr = (e.stderr or "").strip()
+            raise LibreOfficePoolError(f"LibreOffice conversion failed: {stderr[-800:]}") from e
+
+
+class LibreOfficePool:
+    """Fixed-size pool of headless LibreOffice instances.
+
+    - An instance serves one conversion at a time (checked out from an idle queue).
+    - Health is checked on checkout; dead or unresponsive instances are restarted.
+    - Instances are recycled after `max_docs` conversions (LibreOffice leaks memory).
+    - A timed-out or crashed conversion kills its instance, which is then restarted.
+    """
+
+    def __init__(
+        self,
+        *,
+        soffice_path: str,
+        size: int,
+        max_docs: int,
+        root: Path,
+        startup_timeout_sec: int = 60,
+        uno_python: str | None = None,
+    ) -> None:
+        self.soffice_path = soffice_path
+        self.size = max(int(size), 1)
+        self.max_docs = max(int(max_docs), 1)
+        self.startup_timeout_sec = startup_timeout_sec
+        # Interpreter for the UNO helpers; None: warmed profiles + one soffice per conversion.
+        self.uno_python = uno_python
+        self.use_uno = uno_python is not None
+        # Profiles are per app process: uvicorn workers each run their own pool.
+        self.root = root / f"pid-{os.getpid()}"
+        self._instances = [
+            _Instance(
+                index=i,
+                soffice_path=soffice_path,
+                profile_dir=self.root / f"instance-{i}",
+                uno_python=uno_python,
+            )
+            for i in range(self.size)
+        ]
+        self._idle: queue.Queue[_Instance] = queue.Queue()
+        for inst in self._instances:
+            self._idle.put(inst)
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self.conversions = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.recycles = 0
+        self.restarts = 0
+
+    def start(self) -> None:
+        """Warm the idle instances (called in the background at startup)."""
+
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.size):
+            try:
+                inst = self._idle.get_nowait()
+            except queue.Empty:
+                # All checked out: those requests start their own instance.
+                return
+            try:
+                if not inst.started:
+                    inst.start(self.startup_timeout_sec)
+            except Exception:  # noqa: BLE001
+                # Checkout retries the start; keep the slot in rotation.
+                logger.exception("LibreOffice instance %s failed to start", inst.index)
+            finally:
+                self._idle.put(inst)
+
+    def _restart(self, inst: _Instance, *, reset_profile: bool = False) -> None:
+        inst.stop()
+        if reset_profile:
+            inst.reset_profile()
+        inst.restarts += 1
+        with self._lock:
+            self.restarts += 1
+        inst.start(self.startup_timeout_sec)
+
+    def _checkout(self, timeout_sec: float) -> _Instance:
+        try:
+            inst = self._idle.get(timeout=timeout_sec)
+        except queue.Empty as e:
+            raise LibreOfficePoolTimeout("No LibreOffice instance available") from e
+        if not inst.healthy():
+            # Only the checked-out instance is (re)started here, never the whole pool.
+            try:
+                if inst.started:
+                    self._restart(inst, reset_profile=not self.use_uno)
+                else:
+                    inst.start(self.startup_timeout_sec)
+            except Exception:
+                self._idle.put(inst)
+                raise
+        return inst
+
+    def _checkin(self, inst: _Instance, *, broken: bool) -> None:
+        try:
+            if self._closed:
+                inst.stop()
+            elif broken:
+                self._restart(inst)
+            elif inst.docs_done >= self.max_docs:
+                with self._lock:
+                    self.recycles += 1
+                self._restart(inst, reset_profile=True)
+        except Exception:  # noqa: BLE001
+            # Left unhealthy; the next checkout retries the start.
+            logger.exception("LibreOffice instance %s failed to restart", inst.index)
+        finally:
+            self._idle.put(inst)
+
+    def convert(self, *, src: Path, out_dir: Path, fmt: str, timeout_sec: int) -> Path:
+        """Convert `src` to `fmt` ("pdf" or "docx") into `out_dir`; returns the output path."""
+
+        if fmt not in _EXPORT_FILTERS:
+            raise ValueError(f"Unsupported target format: {fmt}")
+        if self._closed:
+            raise LibreOfficePoolError("LibreOffice pool is shut down")
+
+        inst = self._checkout(timeout_sec)
+        broken = False
+        try:
+            out = inst.convert(src=src, out_dir=out_dir, fmt=fmt, timeout_sec=timeout_sec)
+        except LibreOfficePoolTimeout:
+            broken = True
+            with self._lock:
+                self.timeouts += 1
+                self.failures += 1
+            raise
+        except Exception:
+            # A failed document may have taken soffice down with it.
+            broken = not inst.healthy()
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            self._checkin(inst, broken=broken)
+
+        with self._lock:
+            self.conversions += 1
+        return out
+
+    def shutdown(self) -> None:
+        self._closed = True
+        for inst in self._instances:
+            inst.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": "uno" if self.use_uno else "profile",
+                "uno_python": self.uno_python,
+                "size": self.size,
+                "idle": self._idle.qsize(),
+                "max_docs": self.max_docs,
+                "conversions": self.conversions,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "recycles": self.recycles,
+                "restarts": self.restarts,
+            }
+
+
+_pool: LibreOfficePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_libreoffice_pool(soffice_path: str) -> LibreOfficePool:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None or _pool.soffice_path != soffice_path:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = LibreOfficePool(
+                soffice_path=soffice_path,
+                size=settings.libreoffice_pool_size,
+                max_docs=settings.libreoffice_pool_max_docs,
+                root=Path(settings.libreoffice_pool_dir),
+                startup_timeout_sec=settings.libreoffice_pool_startup_sec,
+                uno_python=find_uno_python(soffice_path),
+            )
+            if not _pool.use_uno:
+                logger.warning(
+                    "LibreOffice pool without a `uno`-capable Python (install python3-uno or set "
+                    "LIBREOFFICE_UNO_PYTHON): profiles are kept warm, but every conversion still starts soffice"
+                )
+        return _pool
+
+
+def libreoffice_pool_stats() -> dict | None:
+    with _pool_lock:
+        return _pool.stats() if _pool is not None else None
+
+
+def start_libreoffice_pool() -> None:
+    """Warm the pool in the background so the first conversion doesn't pay the start."""
+
+    if settings.libreoffice_pool_size <= 0:
+        return
+
+    def _start() -> None:
+        from .toolchain import get_toolchain
+
+        # Same resolution as conversions: LIBREOFFICE_PATH (binary or directory) or PATH.
+        soffice = get_toolchain().soffice
+        if soffice:
+            get_libreoffice_pool(soffice).start()
+
+    threading.Thread(target=_start, name="libreoffice-pool-start", daemon=True).start()
+
+
+def shutdown_libreoffice_pool() -> None:
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,115 @@
+"""UNO bridge for one pooled LibreOffice instance (see libreoffice_pool).
+
+Runs under an interpreter that can import `uno`, which usually isn't the app's: Debian's
+python3-uno is built for the system Python (/usr/bin/python3), not for the
+python:3.10-slim interpreter. Only the standard library and `uno` may be used here.
+
+Usage: python3 libreoffice_uno_helper.py <accept-string> <connect-timeout-sec>
+
+Protocol (one JSON object per line): the first line written is the connect result;
+then every request read from stdin gets one reply.
+    {"op": "ping"}
+    {"op": "convert", "src": path, "out": path, "filter": name, "infilter": name|null}
+    {"op": "quit"}
+Replies: {"ok": true} or {"ok": false, "error": "..."}.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+
+def _props(**values):
+    from com.sun.star.beans import PropertyValue  # type: ignore
+
+    out = []
+    for name, value in values.items():
+        p = PropertyValue()
+        p.Name = name
+        p.Value = value
+        out.append(p)
+    return tuple(out)
+
+
+def _connect(accept: str, timeout_sec: float):
+    import uno  # type: ignore
+
+    local_ctx = uno.getComponentContext()
+    resolver = local_ctx.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_ctx)
+    deadline = time.monotonic() + timeout_sec
+    while True:
+        try:
+            ctx = resolver.resolve(f"uno:{accept}")
+            return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+        except Exception:  # noqa: BLE001
+            # soffice is still starting.
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+def _convert(desktop, req: dict) -> None:
+    import uno  # type: ignore
+
+    load_props = {"Hidden": True, "ReadOnly": True}
+    if req.get("infilter"):
+        load_props["FilterName"] = req["infilter"]
+    doc = desktop.loadComponentFromURL(uno.systemPathToFileUrl(req["src"]), "_blank", 0, _props(**load_props))
+    if doc is None:
+        raise RuntimeError("LibreOffice could not open the document")
+    try:
+        doc.storeToURL(uno.systemPathToFileUrl(req["out"]), _props(FilterName=req["filter"], Overwrite=True))
+    finally:
+        try:
+            doc.close(True)
+        except Exception:  # noqa: BLE001
+            pass
+
+
+def main() -> int:
+    # Replies go to the original stdout; anything LibreOffice prints goes to stderr.
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    def reply(ok: bool, error: str | None = None) -> None:
+        replies.write(json.dumps({"ok": True} if ok else {"ok": False, "error": error}) + "\n")
+        replies.flush()
+
+    accept, timeout_sec = sys.argv[1], float(sys.argv[2])
+    try:
+        desktop = _connect(accept, timeout_sec)
+    except Exception as e:  # noqa: BLE001
+        reply(False, f"cannot connect to soffice: {e}")
+        return 1
+    reply(True)
+
+    for line in sys.stdin:
+        try:
+            req = json.loads(line)
+            op = req.get("op")
+            if op == "quit":
+                try:
+                    desktop.terminate()
+                except Exception:  # noqa: BLE001
+                    # The bridge drops when soffice exits; that's expected.
+                    pass
+                reply(True)
+                return 0
+            if op == "ping":
+                desktop.getComponents()
+            elif op == "convert":
+                _convert(desktop, req)
+            else:
+                raise ValueError(f"unknown op {op!r}")
+        except Exception as e:  # noqa: BLE001
+            reply(False, str(e) or type(e).__name__)
+            continue
+        reply(True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
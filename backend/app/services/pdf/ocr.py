@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -14,27 +15,9 @@ class OcrFailedError(RuntimeError):
     pass
 
 
-def run_ocrmypdf(
-    *,
-    input_pdf: Path,
-    output_pdf: Path,
-    ocrmypdf_path: str,
-    lang: str,
-    timeout_sec: int,
-    extra_path: str | None = None,
-) -> Path:
-    """Runs OCRmyPDF to create a searchable PDF (text layer).
-
-    Notes:
-    - Requires external deps on Windows (e.g., Tesseract OCR, Ghostscript).
-    - We use --skip-text to avoid damaging born-digital PDFs.
-    - This function validates that requested Tesseract languages exist and attempts to
-      set a sensible TESSDATA_PREFIX when running inside containers.
-    """
-
-    output_pdf.parent.mkdir(parents=True, exist_ok=True)
+def build_ocr_env(extra_path: str | None = None) -> dict[str, str]:
+    """Environment for OCR subprocesses (PATH incl. Tesseract, TESSDATA_PREFIX)."""
 
-    # Prepare env for subprocess
     env = os.environ.copy()
 
     # Ensure PATH includes a tesseract location if provided
@@ -59,19 +42,37 @@ def run_ocrmypdf(
                 env["TESSDATA_PREFIX"] = c
                 break
 
-    # Verify tesseract is available and list languages
-    tesseract_bin = shutil.which("tesseract")
-    if not tesseract_bin:
-        raise OcrNotAvailableError(
-            "Tesseract not found on PATH. Install Tesseract and ensure it is visible to the backend process."
-        )
+    return env
 
-    try:
-        proc = subprocess.run([tesseract_bin, "--list-langs"], capture_output=True, text=True, env=env, check=True)
-        langs_out = proc.stdout or proc.stderr or ""
-        available = {l.strip() for l in langs_out.splitlines() if l.strip()}
-    except Exception:
-        available = set()
+
+def _check_tesseract_languages(
+    *,
+    lang: str,
+    env: dict[str, str],
+    available_langs: frozenset[str] | None = None,
+) -> None:
+    """Validate the requested languages.
+
+    `available_langs` comes from the toolchain registry; without it Tesseract is
+    probed here (`tesseract --list-langs`).
+    """
+
+    if available_langs:
+        available = set(available_langs)
+    else:
+        # Verify tesseract is available and list languages
+        tesseract_bin = shutil.which("tesseract", path=env.get("PATH"))
+        if not tesseract_bin:
+            raise OcrNotAvailableError(
+                "Tesseract not found on PATH. Install Tesseract and ensure it is visible to the backend process."
+            )
+
+        try:
+            proc = subprocess.run([tesseract_bin, "--list-langs"], capture_output=True, text=True, env=env, check=True)
+            langs_out = proc.stdout or proc.stderr or ""
+            available = {l.strip() for l in langs_out.splitlines() if l.strip()}
+        except Exception:
+            available = set()
 
     # lang can be like 'vie+eng' — ensure at least one requested language is present (prefer 'vie')
     requested = {l.strip() for l in str(lang).split("+") if l.strip()}
@@ -81,19 +82,30 @@ def run_ocrmypdf(
             f"Requested OCR languages ({lang}) not available in Tesseract. Available: {sorted(available)}. Ensure 'vie' traineddata is installed and TESSDATA_PREFIX points to tessdata."
         )
 
-    # Build ocrmypdf command
-    cmd = [
-        ocrmypdf_path,
-        "--skip-text",
-        "--deskew",
+
+def _run_ocrmypdf_cmd(
+    *,
+    input_pdf: Path,
+    output_pdf: Path,
+    ocrmypdf_path: str,
+    lang: str,
+    timeout_sec: int,
+    env: dict[str, str],
+    jobs: int | None = None,
+    redo_ocr: bool = False,
+) -> Path:
+    # --redo-ocr replaces an existing (bad) OCR layer; OCRmyPDF doesn't allow --deskew with it.
+    cmd = [ocrmypdf_path, "--redo-ocr"] if redo_ocr else [ocrmypdf_path, "--skip-text", "--deskew"]
+    cmd += [
         "--rotate-pages",
         "--optimize",
         "1",
         "--language",
         lang,
-        str(input_pdf),
-        str(output_pdf),
     ]
+    if jobs:
+        cmd += ["--jobs", str(jobs)]
+    cmd += [str(input_pdf), str(output_pdf)]
 
     try:
         subprocess.run(
@@ -115,3 +127,276 @@ def run_ocrmypdf(
         raise OcrFailedError("OCR did not produce output PDF")
 
     return output_pdf
+
+
+def run_ocrmypdf(
+    *,
+    input_pdf: Path,
+    output_pdf: Path,
+    ocrmypdf_path: str,
+    lang: str,
+    timeout_sec: int,
+    extra_path: str | None = None,
+    available_langs: frozenset[str] | None = None,
+) -> Path:
+    """Runs OCRmyPDF to create a searchable PDF (text layer).
+
+    Notes:
+    - Requires external deps on Windows (e.g., Tesseract OCR, Ghostscript).
+    - We use --skip-text to avoid damaging born-digital PDFs.
+    - This function validates that requested Tesseract languages exist and attempts to
+      set a sensible TESSDATA_PREFIX when running inside containers.
+    """
+
+    output_pdf.parent.mkdir(parents=True, exist_ok=True)
+
+    env = build_ocr_env(extra_path)
+    _check_tesseract_languages(lang=lang, env=env, available_langs=available_langs)
+
+    return _run_ocrmypdf_cmd(
+        input_pdf=input_pdf,
+        output_pdf=output_pdf,
+        ocrmypdf_path=ocrmypdf_path,
+        lang=lang,
+        timeout_sec=timeout_sec,
+        env=env,
+    )
+
+
+def page_ranges(page_count: int, pages_per_chunk: int) -> list[tuple[int, int]]:
+    """Split [0, page_count) into inclusive (start, end) ranges of at most pages_per_chunk."""
+
+    size = max(int(pages_per_chunk), 1)
+    return [(start, min(start + size, page_count) - 1) for start in range(0, page_count, size)]
+
+
+def split_pdf(*, input_pdf: Path, out_dir: Path, ranges: list[tuple[int, int]]) -> list[Path]:
+    """Write each inclusive page range of input_pdf to its own PDF, in order."""
+
+    import fitz  # PyMuPDF
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    parts: list[Path] = []
+    src = fitz.open(str(input_pdf))
+    try:
+        for idx, (start, end) in enumerate(ranges):
+            part = fitz.open()
+            try:
+                part.insert_pdf(src, from_page=start, to_page=end)
+                out = out_dir / f"part-{idx:04d}.pdf"
+                part.save(str(out))
+            finally:
+                part.close()
+            parts.append(out)
+    finally:
+        src.close()
+    return parts
+
+
+def merge_pdfs(*, parts: list[Path], output_pdf: Path) -> Path:
+    """Concatenate PDFs in the given order (text layers and images are kept as-is)."""
+
+    import fitz  # PyMuPDF
+
+    output_pdf.parent.mkdir(parents=True, exist_ok=True)
+    merged = fitz.open()
+    try:
+        for p in parts:
+            src = fitz.open(str(p))
+            try:
+                merged.insert_pdf(src)
+            finally:
+                src.close()
+        merged.save(str(output_pdf), garbage=3, deflate=True)
+    finally:
+        merged.close()
+    return output_pdf
+
+
+def _ocr_in_chunks(
+    *,
+    input_pdf: Path,
+    output_pdf: Path,
+    ocrmypdf_path: str,
+    lang: str,
+    timeout_sec: int,
+    env: dict[str, str],
+    workers: int,
+    pages_per_chunk: int,
+    redo_ocr: bool = False,
+) -> Path:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(str(input_pdf))
+    try:
+        page_count = doc.page_count
+    finally:
+        doc.close()
+
+    ranges = page_ranges(page_count, pages_per_chunk)
+    workers = max(1, min(int(workers), len(ranges)))
+    if len(ranges) <= 1 or workers <= 1:
+        return _run_ocrmypdf_cmd(
+            input_pdf=input_pdf,
+            output_pdf=output_pdf,
+            ocrmypdf_path=ocrmypdf_path,
+            lang=lang,
+            timeout_sec=timeout_sec,
+            env=env,
+            redo_ocr=redo_ocr,
+        )
+
+    chunk_dir = output_pdf.parent / f"{output_pdf.stem}-chunks"
+    parts = split_pdf(input_pdf=input_pdf, out_dir=chunk_dir, ranges=ranges)
+    jobs_per_chunk = max(1, (os.cpu_count() or 1) // workers)
+
+    def _ocr_part(part: Path) -> Path:
+        return _run_ocrmypdf_cmd(
+            input_pdf=part,
+            output_pdf=part.with_name(f"{part.stem}-ocr.pdf"),
+            ocrmypdf_path=ocrmypdf_path,
+            lang=lang,
+            timeout_sec=timeout_sec,
+            env=env,
+            jobs=jobs_per_chunk,
+            redo_ocr=redo_ocr,
+        )
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-chunk") as pool:
+        ocr_parts = list(pool.map(_ocr_part, parts))
+
+    try:
+        merge_pdfs(parts=ocr_parts, output_pdf=output_pdf)
+    except Exception as e:  # noqa: BLE001
+        raise OcrFailedError(f"Failed to merge OCR chunks: {e}") from e
+
+    if not output_pdf.exists() or output_pdf.stat().st_size == 0:
+        raise OcrFailedError("OCR did not produce output PDF")
+    return output_pdf
+
+
+def run_ocrmypdf_parallel(
+    *,
+    input_pdf: Path,
+    output_pdf: Path,
+    ocrmypdf_path: str,
+    lang: str,
+    timeout_sec: int,
+    extra_path: str | None = None,
+    available_langs: frozenset[str] | None = None,
+    workers: int,
+    pages_per_chunk: int,
+) -> Path:
+    """OCR a large PDF as page-range chunks running concurrently, then merge in order.
+
+    Each chunk is its own OCRmyPDF process with its own `timeout_sec` budget, so one
+    long scan no longer has to fit a single timeout. The pool threads only wait on
+    those processes; `--jobs` is divided between chunks to avoid oversubscribing CPUs.
+    """
+
+    output_pdf.parent.mkdir(parents=True, exist_ok=True)
+
+    env = build_ocr_env(extra_path)
+    _check_tesseract_languages(lang=lang, env=env, available_langs=available_langs)
+
+    return _ocr_in_chunks(
+        input_pdf=input_pdf,
+        output_pdf=output_pdf,
+        ocrmypdf_path=ocrmypdf_path,
+        lang=lang,
+        timeout_sec=timeout_sec,
+        env=env,
+        workers=workers,
+        pages_per_chunk=pages_per_chunk,
+    )
+
+
+def run_ocrmypdf_selective(
+    *,
+    input_pdf: Path,
+    output_pdf: Path,
+    pages: list[int],
+    ocrmypdf_path: str,
+    lang: str,
+    timeout_sec: int,
+    extra_path: str | None = None,
+    available_langs: frozenset[str] | None = None,
+    workers: int = 1,
+    pages_per_chunk: int = 8,
+    redo_ocr: bool = False,
+) -> Path:
+    """OCR only the given pages (0-based) and splice them back into the document.
+
+    Born-digital pages are copied untouched from the input; the selected pages are
+    extracted into one PDF, OCRed (in parallel chunks when large) and put back in
+    their original positions.
+    """
+
+    import fitz  # PyMuPDF
+
+    output_pdf.parent.mkdir(parents=True, exist_ok=True)
+
+    env = build_ocr_env(extra_path)
+    _check_tesseract_languages(lang=lang, env=env, available_langs=available_langs)
+
+    selected = sorted(set(int(p) for p in pages))
+    work = output_pdf.parent / f"{output_pdf.stem}-selective"
+    work.mkdir(parents=True, exist_ok=True)
+    subset_pdf = work / "subset.pdf"
+    subset_ocr = work / "subset-ocr.pdf"
+
+    src = fitz.open(str(input_pdf))
+    try:
+        subset = fitz.open()
+        try:
+            for idx in selected:
+                subset.insert_pdf(src, from_page=idx, to_page=idx)
+            subset.save(str(subset_pdf))
+        finally:
+            subset.close()
+
+        _ocr_in_chunks(
+            input_pdf=subset_pdf,
+            output_pdf=subset_ocr,
+            ocrmypdf_path=ocrmypdf_path,
+            lang=lang,
+            timeout_sec=timeout_sec,
+            env=env,
+            workers=workers,
+            pages_per_chunk=pages_per_chunk,
+            redo_ocr=redo_ocr,
+        )
+
+        try:
+            ocred = fitz.open(str(subset_ocr))
+            merged = fitz.open()
+            try:
+                if ocred.page_count != len(selected):
+                    raise OcrFailedError("OCR changed the number of pages")
+                position = {page_idx: i for i, page_idx in enumerate(selected)}
+                # Copy consecutive runs of pages from the same source in one call.
+                start = 0
+                while start < src.page_count:
+                    from_ocr = start in position
+                    end = start
+                    while end + 1 < src.page_count and ((end + 1) in position) == from_ocr:
+                        end += 1
+                    if from_ocr:
+                        merged.insert_pdf(ocred, from_page=position[start], to_page=position[end])
+                    else:
+                        merged.insert_pdf(src, from_page=start, to_page=end)
+                    start = end + 1
+                merged.save(str(output_pdf), garbage=3, deflate=True)
+            finally:
+                merged.close()
+                ocred.close()
+        except OcrFailedError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            raise OcrFailedError(f"Failed to reassemble OCRed pages: {e}") from e
+    finally:
+        src.close()
+
+    if not output_pdf.exists() or output_pdf.stat().st_size == 0:
+        raise OcrFailedError("OCR did not produce output PDF")
+    return output_pdf
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import logging
+import shutil
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
 
+from ...core.config import settings
 from ...utils.files import safe_filename
+from ...utils.process_pool import discard_process_pool, get_process_pool, limit_address_space, resolve_workers
+from .docx_merge import DocxMergeError, merge_docx_parts
+
+
+logger = logging.getLogger(__name__)
+
+_POOL_NAME = "pdf2docx"
 
 
 class Pdf2DocxConvertError(RuntimeError):
@@ -16,6 +28,69 @@ class Pdf2DocxConvertResult:
     pages_converted: int
 
 
+def _convert_range(pdf_path: str, out_docx: str, start: int, end: int) -> int:
+    """Worker: convert pages [start, end) into their own DOCX."""
+
+    from pdf2docx import Converter
+
+    cv = Converter(pdf_path)
+    try:
+        cv.convert(out_docx, start=start, end=end)
+    finally:
+        cv.close()
+    return end - start
+
+
+def _convert_parallel(*, pdf_path: Path, out_docx: Path, page_count: int, workers: int) -> None:
+    """Convert page ranges in worker processes, then merge the part DOCX files.
+
+    Each worker only holds the layouts of its own range, and the merge streams one
+    part at a time, so peak memory no longer grows with the document length. The pool
+    is shared by concurrent jobs; a job keeps at most `workers` ranges in flight.
+    """
+
+    per_task = max(settings.pdf2docx_pages_per_task, 1)
+    ranges = [(s, min(s + per_task, page_count)) for s in range(0, page_count, per_task)]
+    parts_dir = out_docx.parent / f".{out_docx.stem}.parts"
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    parts = [parts_dir / f"part{i:04d}.docx" for i in range(len(ranges))]
+
+    pool = get_process_pool(
+        _POOL_NAME,
+        resolve_workers(settings.pdf2docx_workers),
+        initializer=limit_address_space,
+        initargs=(settings.pdf2docx_worker_max_mem_mb,),
+    )
+    pending: deque = deque()
+    next_range = 0
+    try:
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < workers:
+                start, end = ranges[next_range]
+                fut = pool.submit(_convert_range, str(pdf_path), str(parts[next_range]), start, end)
+                pending.append((fut, start, end))
+                next_range += 1
+            fut, start, end = pending.popleft()
+            try:
+                fut.result()
+            except MemoryError as e:
+                raise Pdf2DocxConvertError(
+                    f"pdf2docx worker exceeded {settings.pdf2docx_worker_max_mem_mb} MB on pages {start + 1}-{end}"
+                ) from e
+        for part in parts:
+            if not part.exists():
+                raise Pdf2DocxConvertError(f"pdf2docx did not produce {part.name}")
+        merge_docx_parts(parts=parts, out_docx=out_docx)
+    except BrokenProcessPool as e:
+        # A worker was killed (OOM/crash); the pool can't be reused.
+        discard_process_pool(_POOL_NAME, pool)
+        raise Pdf2DocxConvertError("pdf2docx worker process died") from e
+    finally:
+        for fut, _start, _end in pending:
+            fut.cancel()
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+
 def convert_pdf_to_docx_pdf2docx(
     *,
     pdf_path: Path,
@@ -31,7 +106,6 @@ def convert_pdf_to_docx_pdf2docx(
 
     try:
         import fitz  # PyMuPDF
-        from pdf2docx import Converter
 
         doc = fitz.open(str(pdf_path))
         try:
@@ -47,13 +121,26 @@ def convert_pdf_to_docx_pdf2docx(
         if pages_to_convert == 0:
             raise Pdf2DocxConvertError("PDF has 0 pages")
 
-        end_page_index = pages_to_convert - 1  # pdf2docx uses 0-based inclusive end
-
-        cv = Converter(str(pdf_path))
-        try:
-            cv.convert(str(out_docx), start=0, end=end_page_index)
-        finally:
-            cv.close()
+        per_task = max(settings.pdf2docx_pages_per_task, 1)
+        workers = min(resolve_workers(settings.pdf2docx_workers), -(-pages_to_convert // per_task))
+        converted = False
+        if workers > 1 and pages_to_convert >= max(settings.pdf2docx_parallel_min_pages, 2):
+            try:
+                _convert_parallel(pdf_path=pdf_path, out_docx=out_docx, page_count=pages_to_convert, workers=workers)
+                converted = True
+            except DocxMergeError as e:
+                # Unusual part content; the single-process path handles anything pdf2docx emits.
+                logger.warning("pdf2docx part merge failed (%s); converting in-process", e)
+
+        if not converted:
+            from pdf2docx import Converter
+
+            cv = Converter(str(pdf_path))
+            try:
+                # pdf2docx uses a 0-based, exclusive end page.
+                cv.convert(str(out_docx), start=0, end=pages_to_convert)
+            finally:
+                cv.close()
 
         if not out_docx.exists():
             raise Pdf2DocxConvertError("pdf2docx did not produce a DOCX output")
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class PageProfile:
+    index: int
+    text_len: int  # length of the stripped page text
+    space_count: int  # spaces inside the stripped page text
+    has_replacement_char: bool
+    has_latin1_mojibake: bool  # 'Â'/'Ã' followed by a UTF-8 continuation-byte code point
+    # None when the page has no '<'. Otherwise: whether the first '<' follows a letter
+    # (e.g. 'D<'), which often indicates garbled spacing from broken font mapping.
+    lt_after_alpha: bool | None
+    image_coverage: float  # 0..1, share of the page area covered by images
+
+    @property
+    def space_ratio(self) -> float:
+        if self.text_len <= 0:
+            return 0.0
+        return self.space_count / self.text_len
+
+
+@dataclass(frozen=True)
+class PdfProfile:
+    """Everything the pipeline needs to know about a PDF, extracted in one pass.
+
+    Only the first `max_pages` pages are analysed (see `analyze_pdf`); `page_count`
+    is always the real page count of the document.
+    """
+
+    page_count: int
+    pages: tuple[PageProfile, ...]
+
+    def _head(self, max_pages: int | None) -> tuple[PageProfile, ...]:
+        if max_pages and int(max_pages) > 0:
+            return self.pages[: int(max_pages)]
+        return self.pages
+
+    def text_len(self, max_pages: int | None = None) -> int:
+        return sum(p.text_len for p in self._head(max_pages))
+
+    def has_text_layer(self, min_chars: int = 20) -> bool:
+        """Heuristic: returns True if the PDF appears to contain selectable text."""
+        return self.text_len() >= min_chars
+
+    def text_layer_seems_low_quality(
+        self,
+        *,
+        max_pages: int = 2,
+        min_chars: int = 200,
+        min_space_ratio: float = 0.015,
+    ) -> bool:
+        """True when the text is long enough but has unusually few spaces.
+
+        Missing spaces often correlate with missing word boundaries, e.g. Vietnamese
+        words glued together ("tờpháplý", "cổđôngsánglập").
+        """
+
+        head = self._head(max_pages)
+        length = sum(p.text_len for p in head)
+        if length < int(min_chars):
+            return False
+        spaces = sum(p.space_count for p in head)
+        return spaces / max(length, 1) < float(min_space_ratio)
+
+    @property
+    def fully_analysed(self) -> bool:
+        return len(self.pages) == self.page_count
+
+    def pages_needing_ocr(
+        self,
+        *,
+        min_chars: int = 20,
+        min_image_coverage: float = 0.3,
+        low_quality_min_chars: int = 100,
+        min_space_ratio: float = 0.015,
+    ) -> list[int]:
+        """Indexes of pages without a usable text layer.
+
+        A page needs OCR when it is mostly covered by images and either has (almost) no
+        text (image-only scan) or has a long text layer with almost no spaces (bad OCR).
+        Born-digital pages and blank pages are left alone.
+        """
+
+        selected: list[int] = []
+        for p in self.pages:
+            if p.image_coverage < float(min_image_coverage):
+                continue
+            if p.text_len < int(min_chars):
+                selected.append(p.index)
+            elif p.text_len >= int(low_quality_min_chars) and p.space_ratio < float(min_space_ratio):
+                selected.append(p.index)
+        return selected
+
+    def text_looks_mojibake(self, max_pages: int = 2) -> bool:
+        head = self._head(max_pages)
+        # Replacement character is a definite sign of decoding issues.
+        if any(p.has_replacement_char for p in head):
+            return True
+        # UTF-8 -> Windows-1252 mojibake patterns like 'Ã' or 'Â' + continuation byte.
+        if any(p.has_latin1_mojibake for p in head):
+            return True
+        # Suspicious '<' sequences: only the first '<' in the text is considered.
+        for p in head:
+            if p.lt_after_alpha is not None:
+                return p.lt_after_alpha
+        return False
+
+
+def _has_latin1_mojibake(text: str) -> bool:
+    for i, ch in enumerate(text[:-1]):
+        if ch in ("Â", "Ã") and 128 <= ord(text[i + 1]) <= 191:
+            return True
+    return False
+
+
+def _lt_after_alpha(text: str) -> bool | None:
+    pos = text.find("<")
+    if pos < 0:
+        return None
+    return any(c.isalpha() for c in text[max(pos - 2, 0) : pos])
+
+
+def _image_coverage(page) -> float:
+    rect = page.rect
+    page_area = abs(rect.width * rect.height)
+    if page_area <= 0:
+        return 0.0
+    covered = 0.0
+    try:
+        infos = page.get_image_info()
+    except Exception:  # noqa: BLE001
+        return 0.0
+    for info in infos:
+        bbox = info.get("bbox")
+        if not bbox:
+            continue
+        x0, y0, x1, y1 = bbox
+        w = max(0.0, min(x1, rect.x1) - max(x0, rect.x0))
+        h = max(0.0, min(y1, rect.y1) - max(y0, rect.y0))
+        covered += w * h
+    return min(covered / page_area, 1.0)
+
+
+def analyze_pdf(pdf_path: str | Path, *, max_pages: int | None = None) -> PdfProfile:
+    """Open the PDF once and collect per-page text and image statistics.
+
+    max_pages limits how many pages are analysed (0/None = all pages), mirroring
+    PDF_MAX_PAGES so we never extract text from pages we won't convert.
+    """
+
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(str(pdf_path))
+    try:
+        page_count = doc.page_count
+        pages_to_scan = page_count
+        if max_pages and int(max_pages) > 0:
+            pages_to_scan = min(page_count, int(max_pages))
+
+        pages: list[PageProfile] = []
+        for i in range(pages_to_scan):
+            try:
+                page = doc.load_page(i)
+                text = (page.get_text("text") or "").strip()
+                coverage = _image_coverage(page)
+            except Exception:  # noqa: BLE001
+                text = ""
+                coverage = 0.0
+            pages.append(
+                PageProfile(
+                    index=i,
+                    text_len=len(text),
+                    space_count=text.count(" "),
+                    has_replacement_char="\ufffd" in text,
+                    has_latin1_mojibake=_has_latin1_mojibake(text),
+                    lt_after_alpha=_lt_after_alpha(text),
+                    image_coverage=coverage,
+                )
+            )
+        return PdfProfile(page_count=page_count, pages=tuple(pages))
+    finally:
+        doc.close()
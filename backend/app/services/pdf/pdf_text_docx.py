@@ -2,9 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from docx import Document
-
 from ...utils.files import safe_filename
+from .docx_writer import StreamingDocxWriter
 
 
 class PdfTextToDocxError(RuntimeError):
@@ -34,18 +33,16 @@ def convert_pdf_text_to_docx(*, pdf_path: Path, out_dir: Path, max_pages: int) -
             if max_pages and max_pages > 0:
                 pages_to_convert = min(total_pages, int(max_pages))
 
-            word = Document()
-            for page_index in range(pages_to_convert):
-                page = doc.load_page(page_index)
-                text = (page.get_text("text") or "").strip()
-                if not text:
-                    continue
-                for line in text.splitlines():
-                    line = line.strip()
-                    if line:
-                        word.add_paragraph(line)
-
-            word.save(str(out_docx))
+            with StreamingDocxWriter(out_docx) as word:
+                for page_index in range(pages_to_convert):
+                    page = doc.load_page(page_index)
+                    text = (page.get_text("text") or "").strip()
+                    if not text:
+                        continue
+                    for line in text.splitlines():
+                        line = line.strip()
+                        if line:
+                            word.add_paragraph(line)
         finally:
             doc.close()
 
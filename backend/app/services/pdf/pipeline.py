@@ -1,28 +1,50 @@
 from __future__ import annotations
 
+import dataclasses
+import logging
+import os
+import shutil
+import threading
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
 from ...core.config import settings
-from ...utils.files import safe_filename, which
-from .classifier import pdf_has_text_layer, pdf_text_layer_seems_low_quality
-from .docx_postprocess import DocxPostprocessError, normalize_docx_page_breaks
+from ...utils.cpu_slots import released_cpu_slot
+from ...utils.files import safe_filename
+from .chunking import ChunkedConversionError, convert_pdf_in_chunks
+from .circuit_breaker import call_with_breaker
+from .docx_merge import DocxMergeError
+from .docx_metrics import EMPTY_DOCX_METRICS, DocxMetrics, measure_docx
+from .docx_optimize import DocxOptimizeError, optimize_docx
+from .docx_postprocess import DocxPostprocessError, postprocess_docx
+from .hedging import get_hedger
 from .image_fallback import pdf_to_docx_images
-from .ocr import OcrFailedError, run_ocrmypdf
+from .ocr import OcrFailedError, run_ocrmypdf, run_ocrmypdf_parallel, run_ocrmypdf_selective
+from .adobe_governor import AdobeQueueTimeout
 from .adobe_pdf_services_convert import (
+    AdobeAssetSession,
     AdobePdfServicesConvertError,
     convert_pdf_to_docx_adobe_pdf_services,
 )
 from .aspose_words_convert import AsposeWordsConvertError, convert_pdf_to_docx_aspose_words
+from .pdf_profile import PdfProfile, analyze_pdf
+from .routing import get_engine_router, note_document, reject_attempt, tier_a_engines, timed_attempt
+from .stages import mark_stage, stage
+from .toolchain import get_toolchain
 from .pdf2docx_convert import Pdf2DocxConvertError, convert_pdf_to_docx_pdf2docx
 from .pdf_text_docx import PdfTextToDocxError, convert_pdf_text_to_docx
 
 
+logger = logging.getLogger(__name__)
+
+
 @dataclass(frozen=True)
 class PdfToDocxResult:
     docx_path: Path
-    mode: str  # "tier-a" | "tier-a-ocr" | "tier-b"
+    mode: str  # "tier-a" | "tier-a-ocr" | "tier-a-hedge" | "tier-b"
     has_text_layer: bool
+    bytes_saved: int = 0  # set by convert_pdf_to_docx_optimized
 
 
 class EditableConversionUnavailable(RuntimeError):
@@ -34,104 +56,217 @@ class OcrUnavailableError(RuntimeError):
     pass
 
 
-def _docx_text_len(docx_path: Path) -> int:
-    try:
-        from docx import Document
+def _measure_docx(docx_path: Path) -> DocxMetrics:
+    with stage("measure-docx"):
+        try:
+            return measure_docx(docx_path)
+        except Exception:  # noqa: BLE001
+            return EMPTY_DOCX_METRICS
 
-        d = Document(str(docx_path))
-        total = 0
-        for p in d.paragraphs:
-            total += len((p.text or "").strip())
-        return total
-    except Exception:  # noqa: BLE001
-        return 0
 
+def _postprocess(*, docx_path: Path, **cleanup) -> None:
+    with stage("postprocess", **cleanup):
+        postprocess_docx(docx_path=docx_path, **cleanup)
 
-def _docx_space_ratio(docx_path: Path) -> float:
-    try:
-        from docx import Document
-
-        d = Document(str(docx_path))
-        text = "\n".join((p.text or "") for p in d.paragraphs)
-        stripped = text.strip()
-        if not stripped:
-            return 0.0
-        return stripped.count(" ") / max(len(stripped), 1)
-    except Exception:  # noqa: BLE001
-        return 0.0
 
+def _text_fallback(*, pdf_path: Path, out_dir: Path) -> Path:
+    with stage("text-fallback"):
+        return convert_pdf_text_to_docx(pdf_path=pdf_path, out_dir=out_dir, max_pages=settings.max_pages)
 
-def _docx_looks_mojibake(docx_path: Path) -> bool:
-    try:
-        from docx import Document
-
-        d = Document(str(docx_path))
-        text = "\n".join((p.text or "") for p in d.paragraphs)
-        # Simple heuristics: presence of replacement chars or common mojibake markers
-        if "\ufffd" in text:
-            return True
-        # Common UTF-8 mis-decode artifacts for Vietnamese can contain 'Ã' sequences
-        if "Ã" in text:
-            return True
-        # Some PDFs yield odd sequences like 'D<' from font mapping issues
-        if "<" in text and any(c.isalpha() for c in text.split("<")[0][-2:]):
-            return True
-        return False
-    except Exception:  # noqa: BLE001
-        return False
 
+def _reject(engine: str, reason: str, *, outcome: str = "rejected") -> None:
+    """A Tier A output failed a quality gate and is discarded: note it for routing and the
+    stage log."""
 
-def _pdf_text_len(pdf_path: Path, max_pages: int) -> int:
-    try:
-        import fitz  # PyMuPDF
+    reject_attempt(engine, reason, outcome=outcome)
+    mark_stage("quality-gate", outcome="rejected", engine=engine, reason=reason)
 
-        doc = fitz.open(str(pdf_path))
-        try:
-            total_pages = doc.page_count
-            pages_to_count = total_pages
-            if max_pages and int(max_pages) > 0:
-                pages_to_count = min(total_pages, int(max_pages))
-            total = 0
-            for i in range(pages_to_count):
-                total += len((doc.load_page(i).get_text("text") or "").strip())
-            return total
-        finally:
-            doc.close()
-    except Exception:  # noqa: BLE001
-        return 0
 
+def _convert_maybe_chunked(
+    *,
+    pdf_path: Path,
+    out_dir: Path,
+    page_count: int,
+    convert: Callable[[Path, Path], Path],
+    error_cls: type[Exception],
+) -> Path:
+    """`convert(pdf, out_dir)` on the whole PDF, or per page-range chunk for large ones.
 
-def _pdf_text_looks_mojibake(pdf_path: Path, max_pages: int = 2) -> bool:
+    Chunk failures are retried per chunk (see chunking) and surface as `error_cls`
+    so the engine fallback chain is unchanged. Parts that can't be merged fall back
+    to one whole-document conversion.
+    """
+
+    if settings.pdf_chunk_min_pages <= 0 or page_count < max(settings.pdf_chunk_min_pages, 2):
+        return convert(pdf_path, out_dir)
     try:
-        import fitz  # PyMuPDF
+        return convert_pdf_in_chunks(
+            pdf_path=pdf_path,
+            work_dir=out_dir,
+            convert_chunk=convert,
+            pages_per_chunk=settings.pdf_chunk_pages,
+            workers=settings.pdf_chunk_workers,
+            retries=settings.pdf_chunk_retries,
+        ).docx_path
+    except ChunkedConversionError as e:
+        raise error_cls(str(e)) from e
+    except DocxMergeError as e:
+        logger.warning("Chunk merge failed (%s); converting %s as a whole", e, pdf_path.name)
+        return convert(pdf_path, out_dir)
+
+
+def _convert_aspose(*, pdf_path: Path, out_dir: Path, page_count: int, cancel: threading.Event | None = None) -> Path:
+    # Watermarks are removed after merging (postprocess_docx), not per chunk.
+    with stage("aspose", cancel=cancel, pdf=pdf_path.name):
+        return timed_attempt(
+            "aspose",
+            lambda: call_with_breaker(
+                "aspose",
+                lambda: _convert_maybe_chunked(
+                    pdf_path=pdf_path,
+                    out_dir=out_dir,
+                    page_count=page_count,
+                    convert=lambda pdf, d: convert_pdf_to_docx_aspose_words(
+                        pdf_path=pdf, out_dir=d, remove_watermark=False, cancel=cancel
+                    ).docx_path,
+                    error_cls=AsposeWordsConvertError,
+                ),
+                error_cls=AsposeWordsConvertError,
+                cancel=cancel,
+            ),
+            cancel=cancel,
+        )
 
-        doc = fitz.open(str(pdf_path))
-        try:
-            pages_to_check = min(doc.page_count, max_pages)
-            text = []
-            for i in range(pages_to_check):
-                text.append(doc.load_page(i).get_text("text") or "")
-            joined = "\n".join(text)
-            # Replacement character is a definite sign of decoding issues.
-            if "\ufffd" in joined:
-                return True
-            # Detect common UTF-8 -> Windows-1252 mojibake patterns like 'Ã' or 'Â' followed by continuation-byte range
-            for i, ch in enumerate(joined[:-1]):
-                o = ord(ch)
-                if o in (0x00C2, 0x00C3):
-                    next_o = ord(joined[i+1])
-                    if 128 <= next_o <= 191:
-                        return True
-            # Check for suspicious '<' sequences e.g., 'D<' often indicates garbled spacing
-            if "<" in joined and any(c.isalpha() for c in joined.split("<")[0][-2:]):
-                return True
+
+def _convert_pdf2docx(*, pdf_path: Path, out_dir: Path, cancel: threading.Event | None = None) -> Path:
+    # pdf2docx can't be interrupted: `cancel` only marks a losing hedge as such.
+    with stage("pdf2docx", cancel=cancel, pdf=pdf_path.name):
+        return timed_attempt(
+            "pdf2docx",
+            lambda: call_with_breaker(
+                "pdf2docx",
+                lambda: convert_pdf_to_docx_pdf2docx(pdf_path=pdf_path, out_dir=out_dir, max_pages=settings.max_pages).docx_path,
+                error_cls=Pdf2DocxConvertError,
+                cancel=cancel,
+            ),
+            cancel=cancel,
+        )
+
+
+def _passes_quality_gates(docx_path: Path, *, profile: PdfProfile, has_text: bool, ocr_applied: bool) -> bool:
+    """The checks the Tier A chain discards a result for: the missing-content guard, and
+    the mojibake check on output of locally OCR'd input."""
+
+    with stage("quality-gate") as entry:
+        metrics = _measure_docx(docx_path)
+        if ocr_applied and metrics.looks_mojibake:
+            entry.update(outcome="rejected", reason="mojibake")
             return False
-        finally:
-            doc.close()
+        if has_text:
+            pdf_len = profile.text_len()
+            if pdf_len >= 300 and metrics.text_len < int(pdf_len * 0.15):
+                entry.update(outcome="rejected", reason="missing content")
+                return False
+        return True
+
+
+def _run_ocr(*, input_pdf: Path, output_pdf: Path, ocrmypdf_path: str, profile: PdfProfile) -> Path:
+    """OCR only what needs it.
+
+    - Mixed documents: only image-only / low-quality pages go through Tesseract and are
+      spliced back; born-digital pages stay untouched.
+    - Fully scanned documents: whole-document OCR, split into parallel page-range
+      chunks when large.
+    """
+
+    # Languages come from the cached toolchain probe; empty -> let OCR probe Tesseract itself.
+    langs = get_toolchain().tesseract_langs or None
+    workers = settings.ocr_parallel_workers or (os.cpu_count() or 1)
+    parallel = workers > 1 and profile.page_count >= max(settings.ocr_parallel_min_pages, 2)
+
+    if profile.fully_analysed and profile.page_count > 0:
+        pages = profile.pages_needing_ocr()
+        if not pages:
+            # Every page already has a usable text layer (OCRmyPDF --skip-text would
+            # leave them all untouched anyway).
+            output_pdf.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(input_pdf, output_pdf)
+            return output_pdf
+        if len(pages) < profile.page_count:
+            return run_ocrmypdf_selective(
+                input_pdf=input_pdf,
+                output_pdf=output_pdf,
+                pages=pages,
+                ocrmypdf_path=ocrmypdf_path,
+                lang=settings.ocr_lang,
+                timeout_sec=settings.ocr_timeout_sec,
+                extra_path=settings.tesseract_path,
+                available_langs=langs,
+                workers=workers if parallel else 1,
+                pages_per_chunk=settings.ocr_pages_per_chunk,
+                # Low-quality pages carry a bad OCR layer that --skip-text would keep.
+                redo_ocr=any(profile.pages[i].text_len > 0 for i in pages),
+            )
+
+    if parallel:
+        return run_ocrmypdf_parallel(
+            input_pdf=input_pdf,
+            output_pdf=output_pdf,
+            ocrmypdf_path=ocrmypdf_path,
+            lang=settings.ocr_lang,
+            timeout_sec=settings.ocr_timeout_sec,
+            extra_path=settings.tesseract_path,
+            available_langs=langs,
+            workers=workers,
+            pages_per_chunk=settings.ocr_pages_per_chunk,
+        )
+    return run_ocrmypdf(
+        input_pdf=input_pdf,
+        output_pdf=output_pdf,
+        ocrmypdf_path=ocrmypdf_path,
+        lang=settings.ocr_lang,
+        timeout_sec=settings.ocr_timeout_sec,
+        extra_path=settings.tesseract_path,
+        available_langs=langs,
+    )
+
+
+def _pdf_text_looks_mojibake(pdf_path: Path, max_pages: int = 2) -> bool:
+    try:
+        return analyze_pdf(pdf_path, max_pages=max_pages).text_looks_mojibake(max_pages=max_pages)
     except Exception:  # noqa: BLE001
         return False
 
 
+def convert_pdf_to_docx_optimized(
+    *,
+    pdf_path: Path,
+    work_dir: Path,
+    prefer_tier_a: bool = False,
+    force_ocr: bool = False,
+    output_profile: str = "standard",
+) -> PdfToDocxResult:
+    """Run the pipeline, then slim the DOCX (see docx_optimize) per `output_profile`."""
+
+    result = convert_pdf_to_docx_pipeline(
+        pdf_path=pdf_path,
+        work_dir=work_dir,
+        prefer_tier_a=prefer_tier_a,
+        force_ocr=force_ocr,
+    )
+    if not settings.docx_optimize_enabled:
+        return result
+
+    target_dpi = settings.docx_lightweight_dpi if output_profile == "lightweight" else settings.docx_target_dpi
+    try:
+        with stage("optimize", profile=output_profile):
+            optimized = optimize_docx(docx_path=result.docx_path, profile=output_profile, target_dpi=target_dpi)
+    except DocxOptimizeError:
+        # Slimming is best-effort; the unoptimized DOCX is still a valid result.
+        return result
+    return dataclasses.replace(result, bytes_saved=optimized.bytes_saved)
+
+
 def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_a: bool = False, force_ocr: bool = False) -> PdfToDocxResult:
     """Professional PDF→DOCX pipeline.
 
@@ -142,14 +277,20 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
     if not pdf_path.exists():
         raise FileNotFoundError(str(pdf_path))
 
-    has_text_initial = pdf_has_text_layer(pdf_path)
-    has_text = has_text_initial
-
-    # Some PDFs contain a "text layer" that is effectively unusable for high-quality
-    # DOCX conversion (often OCR output with missing spaces / poor glyph mapping).
-    # For Vietnamese, this frequently shows up as words glued together.
-    if has_text and settings.ocr_enabled and pdf_text_layer_seems_low_quality(pdf_path):
-        has_text = False
+    with stage("classify") as entry:
+        # Single analysis pass; every classifier and quality gate below reads from it.
+        profile = analyze_pdf(pdf_path, max_pages=settings.max_pages)
+        has_text_initial = profile.has_text_layer()
+        has_text = has_text_initial
+
+        # Some PDFs contain a "text layer" that is effectively unusable for high-quality
+        # DOCX conversion (often OCR output with missing spaces / poor glyph mapping).
+        # For Vietnamese, this frequently shows up as words glued together.
+        if has_text and settings.ocr_enabled and profile.text_layer_seems_low_quality():
+            has_text = False
+        is_scanned = not has_text
+        entry.update(pages=profile.page_count, has_text_layer=has_text_initial, scanned=is_scanned)
+    note_document(page_count=profile.page_count, has_text=has_text_initial, is_scanned=is_scanned)
 
     out_dir = work_dir / "tier-a"
     adobe_error: str | None = None
@@ -159,14 +300,12 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
     postprocess_error: str | None = None
     fallback_error: str | None = None
 
-    adobe_enabled = bool(settings.adobe_client_id and settings.adobe_client_secret)
-
     # OCR-first flow: run OCR when explicitly requested (force_ocr) or when in auto mode the
     # PDF appears scanned and prefer_tier_a is not set. OCR is performed locally via OCRmyPDF + Tesseract
     # and will produce a searchable PDF. We intentionally avoid image cleaning or aggressive processing
     # so stamps/con dấu remain intact (we do NOT use --clean).
     if (force_ocr or ((not prefer_tier_a) and (not has_text))) and settings.ocr_enabled:
-        ocrmypdf = which("ocrmypdf", settings.ocrmypdf_path)
+        ocrmypdf = get_toolchain().ocrmypdf
         if not ocrmypdf:
             # Explicitly fail so caller can inform admin to install OCR tools for the OCR-first path
             raise OcrUnavailableError(
@@ -174,22 +313,18 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
             )
         try:
             ocr_out = work_dir / "ocr" / "searchable.pdf"
-            # Use OCRmyPDF to create a searchable PDF while preserving original images/graphics
-            run_ocrmypdf(
-                input_pdf=pdf_path,
-                output_pdf=ocr_out,
-                ocrmypdf_path=ocrmypdf,
-                lang=settings.ocr_lang,
-                timeout_sec=settings.ocr_timeout_sec,
-                extra_path=settings.tesseract_path,
-            )
-            # Quick check: ensure OCR result doesn't look like Mojibake (wrong encoding)
-            if _pdf_text_looks_mojibake(ocr_out, max_pages=2):
-                raise EditableConversionUnavailable(
-                    "OCR cục bộ tạo lớp text nhưng phát hiện Mojibake (lỗi font). Hãy đảm bảo Tesseract đã có traineddata 'vie' và TESSDATA_PREFIX/TESSERACT_PATH được cấu hình đúng."
-                )
+            with stage("ocr", reason="forced" if force_ocr else "scanned"):
+                # Use OCRmyPDF to create a searchable PDF while preserving original images/graphics
+                _run_ocr(input_pdf=pdf_path, output_pdf=ocr_out, ocrmypdf_path=ocrmypdf, profile=profile)
+                # Quick check: ensure OCR result doesn't look like Mojibake (wrong encoding)
+                ocr_profile = analyze_pdf(ocr_out, max_pages=settings.max_pages)
+                if ocr_profile.text_looks_mojibake(max_pages=2):
+                    raise EditableConversionUnavailable(
+                        "OCR cục bộ tạo lớp text nhưng phát hiện Mojibake (lỗi font). Hãy đảm bảo Tesseract đã có traineddata 'vie' và TESSDATA_PREFIX/TESSERACT_PATH được cấu hình đúng."
+                    )
             # Use OCRed PDF for subsequent Tier A conversions
             pdf_path = ocr_out
+            profile = ocr_profile
             has_text = True
         except EditableConversionUnavailable:
             raise
@@ -197,22 +332,85 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
             # Surface OCR failure explicitly
             raise OcrUnavailableError(f"OCR failed: {e}") from e
 
-    # Tier A (Adobe PDF Services API preferred when configured)
-    if adobe_enabled:
+    def _try_adobe(*, hedge: bool) -> PdfToDocxResult | None:
+        # Tier A (Adobe PDF Services API)
+        nonlocal adobe_error, postprocess_error, fallback_error
+        # Uploaded input assets live for the whole Adobe attempt, so the OCR retry
+        # (or any other re-submission) reuses them instead of uploading again.
+        adobe_session = AdobeAssetSession()
+        hedge_engine = "aspose"
         try:
-            def _run_adobe(*, ocr_lang: str | None) -> tuple[Path, str]:
+            def _run_adobe(*, ocr_lang: str | None, cancel: threading.Event | None = None) -> tuple[Path, str]:
                 mode_local = "tier-a-adobe" if not ocr_lang else "tier-a-adobe-ocr"
-                r = convert_pdf_to_docx_adobe_pdf_services(
-                    pdf_path=pdf_path,
-                    out_dir=out_dir,
-                    base_url=settings.adobe_base_url,
-                    client_id=str(settings.adobe_client_id),
-                    client_secret=str(settings.adobe_client_secret),
-                    job_timeout_sec=settings.adobe_job_timeout_sec,
-                    poll_interval_ms=settings.adobe_poll_interval_ms,
-                    ocr_lang=ocr_lang,
-                )
-                return r.docx_path, mode_local
+                # Only waiting on Adobe here: let another job use this CPU slot meanwhile.
+                # An open Adobe breaker fails fast instead of waiting out the job timeout.
+                with released_cpu_slot(), stage("adobe", cancel=cancel, ocr_lang=ocr_lang):
+                    docx_local = timed_attempt(
+                        "adobe",
+                        lambda: call_with_breaker(
+                            "adobe",
+                            lambda: _convert_maybe_chunked(
+                                pdf_path=pdf_path,
+                                out_dir=out_dir,
+                                page_count=profile.page_count,
+                                convert=lambda pdf, d: convert_pdf_to_docx_adobe_pdf_services(
+                                    pdf_path=pdf,
+                                    out_dir=d,
+                                    base_url=settings.adobe_base_url,
+                                    client_id=str(settings.adobe_client_id),
+                                    client_secret=str(settings.adobe_client_secret),
+                                    job_timeout_sec=settings.adobe_job_timeout_sec,
+                                    poll_interval_ms=settings.adobe_poll_interval_ms,
+                                    ocr_lang=ocr_lang,
+                                    session=adobe_session,
+                                    cancel=cancel,
+                                ).docx_path,
+                                error_cls=AdobePdfServicesConvertError,
+                            ),
+                            error_cls=AdobePdfServicesConvertError,
+                            slow_call_sec=settings.adobe_job_timeout_sec * 0.75,
+                            cancel=cancel,
+                            # A full local Adobe queue is our load, not an Adobe failure.
+                            ignore=(AdobeQueueTimeout,),
+                        ),
+                        cancel=cancel,
+                    )
+                return docx_local, mode_local
+
+            def _run_local_hedge(cancel: threading.Event) -> tuple[Path, str]:
+                # Same local chain as the fallback below, into its own directory so the
+                # Adobe output (same file name) is never overwritten.
+                nonlocal postprocess_error, hedge_engine
+                hedge_dir = work_dir / "tier-a-hedge"
+                try:
+                    docx_local = _convert_aspose(
+                        pdf_path=pdf_path, out_dir=hedge_dir, page_count=profile.page_count, cancel=cancel
+                    )
+                    cleanup = {"remove_watermark": True}
+                except AsposeWordsConvertError:
+                    if cancel.is_set():
+                        raise
+                    # pdf2docx can't be interrupted; a losing run is left to finish and ignored.
+                    hedge_engine = "pdf2docx"
+                    docx_local = _convert_pdf2docx(pdf_path=pdf_path, out_dir=hedge_dir, cancel=cancel)
+                    cleanup = {"aggressive_page_breaks": True}
+                try:
+                    _postprocess(docx_path=docx_local, **cleanup)
+                except DocxPostprocessError as e:
+                    postprocess_error = str(e)
+                return docx_local, "tier-a-hedge"
+
+            hedge_rejected = False
+
+            def _accept(result: tuple[Path, str]) -> bool:
+                nonlocal hedge_rejected
+                docx_local, mode_local = result
+                if _passes_quality_gates(docx_local, profile=profile, has_text=has_text, ocr_applied=force_ocr):
+                    return True
+                # A rejected Adobe output is still handed back and goes through the guards
+                # below, which decide whether it is discarded.
+                hedge_rejected = hedge_rejected or mode_local == "tier-a-hedge"
+                return False
 
             # Decide whether to request Adobe OCR. If we ran local OCR (force_ocr), we DO NOT request Adobe OCR
             # so Adobe will use our searchable PDF layer. If user explicitly asked Tier A, we still may request Adobe OCR
@@ -223,48 +421,80 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
             elif (not has_text) and settings.ocr_enabled:
                 ocr_lang = settings.adobe_ocr_lang
 
-            docx_path, mode = _run_adobe(ocr_lang=ocr_lang)
+            if hedge and settings.hedge_enabled and ocr_lang is None and not force_ocr:
+                # Hedge Adobe's latency tail with a local engine. Not when Adobe is asked
+                # to OCR: the local engines can't, so their result isn't comparable.
+                with released_cpu_slot(), stage("hedge") as entry:
+                    try:
+                        hedged = get_hedger("adobe").run(
+                            lambda cancel: _run_adobe(ocr_lang=None, cancel=cancel),
+                            _run_local_hedge,
+                            page_count=profile.page_count,
+                            accept=_accept,
+                        )
+                    finally:
+                        # A rejected hedge never wins: its output is always discarded.
+                        if hedge_rejected:
+                            reject_attempt(hedge_engine, "quality gate")
+                    entry.update(hedged=hedged.hedged, winner=hedged.winner)
+                docx_path, mode = hedged.value
+                if hedged.winner == "hedge":
+                    return PdfToDocxResult(docx_path=docx_path, mode=mode, has_text_layer=has_text_initial)
+            else:
+                docx_path, mode = _run_adobe(ocr_lang=ocr_lang)
 
             # If we explicitly ran OCR locally (force_ocr), prefer to mark the mode as "tier-a-ocr"
             if force_ocr:
                 mode = "tier-a-ocr"
 
+            # Page-break post-processing doesn't change the text, so metrics measured here
+            # stay valid for the mojibake check and the missing-content guard below.
+            adobe_metrics: DocxMetrics | None = None
+
             # If we did NOT OCR (because PDF appeared to have text), but the resulting
             # DOCX still looks like it has no spaces, retry once with Adobe OCR.
             if not prefer_tier_a and has_text and settings.ocr_enabled:
-                space_ratio = _docx_space_ratio(docx_path)
+                adobe_metrics = _measure_docx(docx_path)
+                space_ratio = adobe_metrics.space_ratio
                 if space_ratio > 0 and space_ratio < 0.01:
+                    _reject("adobe", "no spaces in output")
                     docx_path, mode = _run_adobe(ocr_lang=settings.adobe_ocr_lang)
                     mode = "tier-a-adobe-ocr-retry"
+                    adobe_metrics = None
 
             adobe_result_docx = docx_path
 
             try:
-                normalize_docx_page_breaks(docx_path=adobe_result_docx, aggressive=False)
+                _postprocess(docx_path=adobe_result_docx)
             except DocxPostprocessError as e:
                 postprocess_error = str(e)
 
             # If we forced local OCR before sending to Adobe, detect any mojibake patterns.
             # Try Aspose fallback if Adobe produced mojibake after our OCR, otherwise fail with helpful guidance.
-            if force_ocr and _docx_looks_mojibake(adobe_result_docx):
+            if (force_ocr or has_text) and adobe_metrics is None:
+                adobe_metrics = _measure_docx(adobe_result_docx)
+            if force_ocr and adobe_metrics.looks_mojibake:
+                _reject("adobe", "mojibake")
                 # Attempt Aspose fallback using the searchable PDF (pdf_path should point to OCRed PDF)
                 try:
                     aspose_fallback_dir = out_dir / "aspose-after-ocr"
-                    aspose_fallback = convert_pdf_to_docx_aspose_words(pdf_path=pdf_path, out_dir=aspose_fallback_dir)
+                    aspose_fallback_docx = _convert_aspose(pdf_path=pdf_path, out_dir=aspose_fallback_dir, page_count=profile.page_count)
                     try:
-                        normalize_docx_page_breaks(docx_path=aspose_fallback.docx_path, aggressive=False)
+                        # Watermark removal + page-break cleanup in one pass.
+                        _postprocess(docx_path=aspose_fallback_docx, remove_watermark=True)
                     except DocxPostprocessError as e:
                         postprocess_error = str(e)
 
                     # If Aspose also looks mojibake, fail explicitly
-                    if _docx_looks_mojibake(aspose_fallback.docx_path):
+                    if _measure_docx(aspose_fallback_docx).looks_mojibake:
+                        _reject("aspose", "mojibake")
                         raise EditableConversionUnavailable(
                             "Cả Adobe và Aspose trên kết quả OCR cục bộ đều chứa dấu hiệu Mojibake. Vui lòng kiểm tra rằng Tesseract đã dùng traineddata 'vie' và TESSDATA_PREFIX/TESSERACT_PATH đúng."
                         )
 
                     # Otherwise, return Aspose result as a fallback (less ideal layout but preserves text)
                     return PdfToDocxResult(
-                        docx_path=aspose_fallback.docx_path,
+                        docx_path=aspose_fallback_docx,
                         mode="aspose-after-ocr",
                         has_text_layer=True,
                     )
@@ -277,22 +507,20 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
 
             # Missing-content guard for text-layer PDFs
             if has_text:
-                pdf_len = _pdf_text_len(pdf_path, settings.max_pages)
-                docx_len = _docx_text_len(adobe_result_docx)
+                pdf_len = profile.text_len()
+                docx_len = adobe_metrics.text_len
                 if pdf_len >= 300 and docx_len < int(pdf_len * 0.15):
                     try:
-                        docx_text = convert_pdf_text_to_docx(
-                            pdf_path=pdf_path,
-                            out_dir=out_dir / "text-fallback",
-                            max_pages=settings.max_pages,
-                        )
+                        docx_text = _text_fallback(pdf_path=pdf_path, out_dir=out_dir / "text-fallback")
+                    except PdfTextToDocxError as e:
+                        fallback_error = str(e)
+                    else:
+                        _reject("adobe", "missing content", outcome="text-fallback")
                         return PdfToDocxResult(
                             docx_path=docx_text,
                             mode="tier-a-text",
                             has_text_layer=has_text_initial,
                         )
-                    except PdfTextToDocxError as e:
-                        fallback_error = str(e)
 
             return PdfToDocxResult(
                 docx_path=adobe_result_docx,
@@ -301,105 +529,122 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
             )
         except AdobePdfServicesConvertError as e:
             adobe_error = str(e)
-
-    # Tier A (Aspose.Words preferred):
-    # - If PDF already has a text layer, convert directly.
-    # - If scanned, OCR to searchable PDF then convert.
-    try:
-        aspose_result = convert_pdf_to_docx_aspose_words(pdf_path=pdf_path, out_dir=out_dir)
+        finally:
+            adobe_session.close()
+        return None
+
+    def _try_aspose() -> PdfToDocxResult | None:
+        nonlocal aspose_error, postprocess_error, fallback_error
+        # Tier A (Aspose.Words):
+        # - If PDF already has a text layer, convert directly.
+        # - If scanned, OCR to searchable PDF then convert.
         try:
-            normalize_docx_page_breaks(docx_path=aspose_result.docx_path, aggressive=False)
-        except DocxPostprocessError as e:
-            postprocess_error = str(e)
+            aspose_docx = _convert_aspose(pdf_path=pdf_path, out_dir=out_dir, page_count=profile.page_count)
+            try:
+                # Watermark removal + page-break cleanup in one pass.
+                _postprocess(docx_path=aspose_docx, remove_watermark=True)
+            except DocxPostprocessError as e:
+                postprocess_error = str(e)
 
-        # If the PDF has selectable text but the produced DOCX contains far less text,
-        # fall back to a text-only DOCX to avoid "mất nội dung".
-        if has_text:
-            pdf_len = _pdf_text_len(pdf_path, settings.max_pages)
-            docx_len = _docx_text_len(aspose_result.docx_path)
-            if pdf_len >= 300 and docx_len < int(pdf_len * 0.15):
-                try:
-                    docx_text = convert_pdf_text_to_docx(
-                        pdf_path=pdf_path,
-                        out_dir=out_dir / "text-fallback",
-                        max_pages=settings.max_pages,
-                    )
-                    return PdfToDocxResult(
-                        docx_path=docx_text,
-                        mode="tier-a-text",
-                        has_text_layer=has_text,
-                    )
-                except PdfTextToDocxError as e:
-                    fallback_error = str(e)
+            # If the PDF has selectable text but the produced DOCX contains far less text,
+            # fall back to a text-only DOCX to avoid "mất nội dung".
+            if has_text:
+                pdf_len = profile.text_len()
+                docx_len = _measure_docx(aspose_docx).text_len
+                if pdf_len >= 300 and docx_len < int(pdf_len * 0.15):
+                    try:
+                        docx_text = _text_fallback(pdf_path=pdf_path, out_dir=out_dir / "text-fallback")
+                    except PdfTextToDocxError as e:
+                        fallback_error = str(e)
+                    else:
+                        _reject("aspose", "missing content", outcome="text-fallback")
+                        return PdfToDocxResult(
+                            docx_path=docx_text,
+                            mode="tier-a-text",
+                            has_text_layer=has_text,
+                        )
 
-        return PdfToDocxResult(
-            docx_path=aspose_result.docx_path,
-            mode="tier-a",
-            has_text_layer=has_text,
-        )
-    except AsposeWordsConvertError as e:
-        aspose_error = str(e)
+            return PdfToDocxResult(
+                docx_path=aspose_docx,
+                mode="tier-a",
+                has_text_layer=has_text,
+            )
+        except AsposeWordsConvertError as e:
+            aspose_error = str(e)
+        return None
 
-    # Fallback: pdf2docx (still useful when Aspose isn't installed/working)
-    try:
-        docx_result = convert_pdf_to_docx_pdf2docx(
-            pdf_path=pdf_path,
-            out_dir=out_dir,
-            max_pages=settings.max_pages,
-        )
+    def _try_pdf2docx() -> PdfToDocxResult | None:
+        nonlocal pdf2docx_error, postprocess_error, fallback_error
+        # Fallback: pdf2docx (still useful when Aspose isn't installed/working)
         try:
-            normalize_docx_page_breaks(docx_path=docx_result.docx_path, aggressive=True)
-        except DocxPostprocessError as e:
-            postprocess_error = str(e)
-        if has_text:
-            pdf_len = _pdf_text_len(pdf_path, settings.max_pages)
-            docx_len = _docx_text_len(docx_result.docx_path)
-            if pdf_len >= 300 and docx_len < int(pdf_len * 0.15):
-                try:
-                    docx_text = convert_pdf_text_to_docx(
-                        pdf_path=pdf_path,
-                        out_dir=out_dir / "text-fallback",
-                        max_pages=settings.max_pages,
-                    )
-                    return PdfToDocxResult(
-                        docx_path=docx_text,
-                        mode="tier-a-text",
-                        has_text_layer=has_text,
-                    )
-                except PdfTextToDocxError as e:
-                    fallback_error = str(e)
+            pdf2docx_docx = _convert_pdf2docx(pdf_path=pdf_path, out_dir=out_dir)
+            try:
+                _postprocess(docx_path=pdf2docx_docx, aggressive_page_breaks=True)
+            except DocxPostprocessError as e:
+                postprocess_error = str(e)
+            if has_text:
+                pdf_len = profile.text_len()
+                docx_len = _measure_docx(pdf2docx_docx).text_len
+                if pdf_len >= 300 and docx_len < int(pdf_len * 0.15):
+                    try:
+                        docx_text = _text_fallback(pdf_path=pdf_path, out_dir=out_dir / "text-fallback")
+                    except PdfTextToDocxError as e:
+                        fallback_error = str(e)
+                    else:
+                        _reject("pdf2docx", "missing content", outcome="text-fallback")
+                        return PdfToDocxResult(
+                            docx_path=docx_text,
+                            mode="tier-a-text",
+                            has_text_layer=has_text,
+                        )
 
-        return PdfToDocxResult(
-            docx_path=docx_result.docx_path,
-            mode="tier-a",
-            has_text_layer=has_text,
+            return PdfToDocxResult(
+                docx_path=pdf2docx_docx,
+                mode="tier-a",
+                has_text_layer=has_text,
+            )
+        except Pdf2DocxConvertError as e:
+            pdf2docx_error = str(e)
+        return None
+
+    # Tier A engines in the order expected to reach a good result fastest for this kind of
+    # document (see routing; default: Adobe when configured, then Aspose.Words, then
+    # pdf2docx). Explicit Tier A / OCR-first requests keep Adobe first.
+    engines = tier_a_engines()
+    if not (prefer_tier_a or force_ocr):
+        engines = get_engine_router().engine_order(
+            page_count=profile.page_count, has_text=has_text_initial, is_scanned=is_scanned, engines=engines
         )
-    except Pdf2DocxConvertError as e:
-        pdf2docx_error = str(e)
+    mark_stage("route", order=engines)
+    for engine in engines:
+        if engine == "adobe":
+            # Hedging only makes sense while Adobe is the first choice.
+            result = _try_adobe(hedge=engine == engines[0])
+        elif engine == "aspose":
+            result = _try_aspose()
+        else:
+            result = _try_pdf2docx()
+        if result is not None:
+            return result
 
     if (not has_text) and settings.ocr_enabled:
-        ocrmypdf = which("ocrmypdf", settings.ocrmypdf_path)
+        ocrmypdf = get_toolchain().ocrmypdf
         if ocrmypdf:
             ocr_out = work_dir / "ocr" / "searchable.pdf"
             try:
-                run_ocrmypdf(
-                    input_pdf=pdf_path,
-                    output_pdf=ocr_out,
-                    ocrmypdf_path=ocrmypdf,
-                    lang=settings.ocr_lang,
-                    timeout_sec=settings.ocr_timeout_sec,
-                    extra_path=settings.tesseract_path,
-                )
-                has_text_after = pdf_has_text_layer(ocr_out)
+                with stage("ocr", reason="fallback"):
+                    _run_ocr(input_pdf=pdf_path, output_pdf=ocr_out, ocrmypdf_path=ocrmypdf, profile=profile)
+                has_text_after = analyze_pdf(ocr_out, max_pages=settings.max_pages).has_text_layer()
                 # Prefer Aspose after OCR
                 try:
-                    aspose2 = convert_pdf_to_docx_aspose_words(pdf_path=ocr_out, out_dir=out_dir)
+                    aspose2_docx = _convert_aspose(pdf_path=ocr_out, out_dir=out_dir, page_count=profile.page_count)
                     try:
-                        normalize_docx_page_breaks(docx_path=aspose2.docx_path, aggressive=False)
+                        # Watermark removal + page-break cleanup in one pass.
+                        _postprocess(docx_path=aspose2_docx, remove_watermark=True)
                     except DocxPostprocessError as e:
                         postprocess_error = str(e)
                     return PdfToDocxResult(
-                        docx_path=aspose2.docx_path,
+                        docx_path=aspose2_docx,
                         mode="tier-a-ocr",
                         has_text_layer=has_text_after,
                     )
@@ -407,17 +652,13 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
                     aspose_error = str(e_aspose_ocr)
 
                 # Fallback to pdf2docx after OCR
-                docx2_result = convert_pdf_to_docx_pdf2docx(
-                    pdf_path=ocr_out,
-                    out_dir=out_dir,
-                    max_pages=settings.max_pages,
-                )
+                pdf2docx_ocr_docx = _convert_pdf2docx(pdf_path=ocr_out, out_dir=out_dir)
                 try:
-                    normalize_docx_page_breaks(docx_path=docx2_result.docx_path, aggressive=True)
+                    _postprocess(docx_path=pdf2docx_ocr_docx, aggressive_page_breaks=True)
                 except DocxPostprocessError as e:
                     postprocess_error = str(e)
                 return PdfToDocxResult(
-                    docx_path=docx2_result.docx_path,
+                    docx_path=pdf2docx_ocr_docx,
                     mode="tier-a-ocr",
                     has_text_layer=has_text_after,
                 )
@@ -441,10 +682,11 @@ def convert_pdf_to_docx_pipeline(*, pdf_path: Path, work_dir: Path, prefer_tier_
     stem = safe_filename(pdf_path.stem, fallback="document")
     out_docx = work_dir / "tier-b" / f"{stem}.docx"
     out_docx.parent.mkdir(parents=True, exist_ok=True)
-    docx = pdf_to_docx_images(
-        pdf_path=pdf_path,
-        out_docx=out_docx,
-        dpi=settings.pdf_image_dpi,
-        max_pages=settings.max_pages,
-    )
+    with stage("image-fallback"):
+        docx = pdf_to_docx_images(
+            pdf_path=pdf_path,
+            out_docx=out_docx,
+            dpi=settings.pdf_image_dpi,
+            max_pages=settings.max_pages,
+        )
     return PdfToDocxResult(docx_path=docx, mode="tier-b", has_text_layer=has_text)
@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Iterator, TypeVar
+
+from ...core.config import settings
+from .hedging import size_bucket
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ENGINES = ("adobe", "aspose", "pdf2docx")
+_PAGE_BUCKETS = ("1-4", "5-19", "20-79", "80+")
+
+
+# --- Per-job trace -------------------------------------------------------------------
+# The pipeline notes the document features and every Tier A engine attempt into the
+# trace of the current job; the job runner stores it on the conversion_jobs row, which
+# is what the routing table below is learned from.
+
+
+@dataclass
+class RoutingTrace:
+    page_count: int | None = None
+    has_text: bool | None = None
+    is_scanned: bool | None = None
+    attempts: list[dict] = field(default_factory=list)
+
+    @property
+    def engine(self) -> str | None:
+        """Engine that produced the result (last accepted attempt)."""
+
+        for attempt in reversed(self.attempts):
+            if attempt["outcome"] == "ok":
+                return attempt["engine"]
+        return None
+
+    def attempts_json(self) -> str | None:
+        return json.dumps(self.attempts, ensure_ascii=False) if self.attempts else None
+
+
+_trace: contextvars.ContextVar[RoutingTrace | None] = contextvars.ContextVar("routing_trace", default=None)
+_trace_lock = threading.Lock()
+
+
+@contextmanager
+def track_routing() -> Iterator[RoutingTrace]:
+    trace = RoutingTrace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+def note_document(*, page_count: int, has_text: bool, is_scanned: bool) -> None:
+    trace = _trace.get()
+    if trace is not None:
+        trace.page_count, trace.has_text, trace.is_scanned = page_count, has_text, is_scanned
+
+
+def timed_attempt(engine: str, fn: Callable[[], T], *, cancel: threading.Event | None = None) -> T:
+    """Run one engine attempt and note its outcome/latency in the current trace."""
+
+    trace = _trace.get()
+    if trace is None:
+        return fn()
+    t0 = time.perf_counter()
+    try:
+        result = fn()
+    except Exception as e:  # noqa: BLE001
+        outcome = "cancelled" if cancel is not None and cancel.is_set() else "failed"
+        _append_attempt(trace, engine, outcome, t0, error=str(e)[:300])
+        raise
+    # A losing hedge that still finished (pdf2docx can't be stopped) didn't produce the result.
+    _append_attempt(trace, engine, "cancelled" if cancel is not None and cancel.is_set() else "ok", t0)
+    return result
+
+
+def _append_attempt(trace: RoutingTrace, engine: str, outcome: str, t0: float, *, error: str | None = None) -> None:
+    attempt = {"engine": engine, "outcome": outcome, "ms": int((time.perf_counter() - t0) * 1000)}
+    if error:
+        attempt["error"] = error
+    # Hedged attempts finish on other threads.
+    with _trace_lock:
+        trace.attempts.append(attempt)
+
+
+def reject_attempt(engine: str, reason: str, *, outcome: str = "rejected") -> None:
+    """The engine's last output failed a quality gate and was discarded: not a good result
+    after all. `outcome` "text-fallback": it was replaced by the text-only DOCX, which ends
+    the chain (no other engine was tried)."""
+
+    trace = _trace.get()
+    if trace is None:
+        return
+    with _trace_lock:
+        for attempt in reversed(trace.attempts):
+            if attempt["engine"] == engine and attempt["outcome"] == "ok":
+                attempt["outcome"] = outcome
+                attempt["error"] = reason
+                return
+
+
+# --- Routing table ---------------------------------------------------------------------
+
+
+def bucket_key(*, page_count: int, has_text: bool, is_scanned: bool) -> str:
+    return f"{size_bucket(page_count)}|{'text' if has_text else 'no-text'}|{'scanned' if is_scanned else 'digital'}"
+
+
+BUCKETS = tuple(
+    f"{pages}|{text}|{scan}"
+    for pages in _PAGE_BUCKETS
+    for text in ("text", "no-text")
+    for scan in ("scanned", "digital")
+)
+
+
+@dataclass
+class EngineModel:
+    attempts: int = 0
+    good: int = 0
+    good_ms: int = 0
+    bad_ms: int = 0
+    # Cancelled attempts (lost hedges): the outcome is unknown, but the engine took at least
+    # this long. Dropping them would leave only the fast calls in the latency estimate.
+    censored: int = 0
+    censored_ms: int = 0
+
+    def add(self, *, good: bool, ms: int) -> None:
+        self.attempts += 1
+        if good:
+            self.good += 1
+            self.good_ms += ms
+        else:
+            self.bad_ms += ms
+
+    def add_censored(self, *, ms: int) -> None:
+        self.censored += 1
+        self.censored_ms += ms
+
+    @property
+    def p_good(self) -> float:
+        # Laplace smoothing: a couple of lucky/unlucky jobs don't decide the order.
+        return (self.good + 1) / (self.attempts + 2)
+
+    @property
+    def failure_rate(self) -> float:
+        return (self.attempts - self.good) / self.attempts if self.attempts else 0.0
+
+    @property
+    def good_sec(self) -> float:
+        # Censored latencies count as (lower bounds of) successful calls' latencies.
+        samples = self.good + self.censored
+        return (self.good_ms + self.censored_ms) / samples / 1000 if samples else 0.0
+
+    @property
+    def bad_sec(self) -> float:
+        bad = self.attempts - self.good
+        return self.bad_ms / bad / 1000 if bad else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "success_rate": round(self.good / self.attempts, 3) if self.attempts else None,
+            "censored": self.censored,
+            "good_sec": round(self.good_sec, 2),
+            "bad_sec": round(self.bad_sec, 2),
+        }
+
+
+def expected_sec(order: list[str], models: dict[str, EngineModel]) -> float:
+    """Expected time until the first good result when engines are tried in `order`.
+
+    Each engine costs its mean time-to-success when it succeeds and its mean
+    time-to-failure otherwise; later engines only run when all earlier ones failed.
+    """
+
+    total, reach = 0.0, 1.0
+    for engine in order:
+        m = models[engine]
+        p = m.p_good
+        total += reach * (p * m.good_sec + (1 - p) * m.bad_sec)
+        reach *= 1 - p
+    return total
+
+
+class EngineRouter:
+    """Tier A engine order per document bucket, learned from conversion_jobs history."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: dict[str, dict[str, EngineModel]] = {}
+        self._overrides: dict[str, list[str]] = {}
+        self.refreshed_at: datetime | None = None
+        self.jobs_used = 0
+        self.refresh_ms: int | None = None
+        self.routed = 0
+        self.reordered = 0
+        self.explored = 0
+
+    def load(self, rows: list[tuple[int | None, int | None, int | None, str | None]]) -> None:
+        """Rebuild the models from (page_count, has_text_layer, is_scanned, attempts_json) rows."""
+
+        models: dict[str, dict[str, EngineModel]] = {"*": {e: EngineModel() for e in ENGINES}}
+        used = 0
+        for page_count, has_text, is_scanned, attempts_json in rows:
+            if page_count is None or not attempts_json:
+                continue
+            try:
+                attempts = json.loads(attempts_json)
+            except ValueError:
+                continue
+            key = bucket_key(page_count=int(page_count), has_text=bool(has_text), is_scanned=bool(is_scanned))
+            bucket = models.setdefault(key, {e: EngineModel() for e in ENGINES})
+            used += 1
+            for attempt in attempts if isinstance(attempts, list) else ():
+                engine, outcome = attempt.get("engine"), attempt.get("outcome")
+                if engine not in ENGINES:
+                    continue
+                ms = int(attempt.get("ms") or 0)
+                if outcome == "cancelled":
+                    # A lost hedge says nothing about success, only that it was this slow.
+                    bucket[engine].add_censored(ms=ms)
+                    models["*"][engine].add_censored(ms=ms)
+                    continue
+                # Text fallbacks end the chain without trying the next engine: not counted.
+                if outcome not in ("ok", "failed", "rejected"):
+                    continue
+                bucket[engine].add(good=outcome == "ok", ms=ms)
+                models["*"][engine].add(good=outcome == "ok", ms=ms)
+        with self._lock:
+            self._models = models
+            self.jobs_used = used
+            self.refreshed_at = datetime.now(timezone.utc)
+
+    def _models_for(self, key: str, engines: list[str]) -> dict[str, EngineModel]:
+        """Models for the engines with enough history in `key` (or across all buckets)."""
+
+        min_samples = max(settings.routing_min_samples, 1)
+        bucket = self._models.get(key, {})
+        overall = self._models.get("*", {})
+        chosen: dict[str, EngineModel] = {}
+        for engine in engines:
+            for candidate in (bucket.get(engine), overall.get(engine)):
+                if candidate is not None and candidate.attempts >= min_samples:
+                    chosen[engine] = candidate
+                    break
+        return chosen
+
+    def best_order(self, key: str, engines: list[str]) -> list[str]:
+        with self._lock:
+            override = self._overrides.get(key) or self._overrides.get("*")
+            models = self._models_for(key, engines)
+        if override:
+            # Overridden engines first; the others stay available as fallbacks.
+            return [e for e in override if e in engines] + [e for e in engines if e not in override]
+        if not engines:
+            return []
+        # The order only weighs time to a gate-passing result, not layout quality: the
+        # configured primary (Adobe when set up) stays first unless it fails too often.
+        primary = models.get(engines[0])
+        demote = primary is not None and primary.failure_rate > settings.routing_primary_max_failure_rate
+        head = [] if demote else [engines[0]]
+        rest = [e for e in engines if e not in head]
+        known = [e for e in rest if e in models]
+        if len(known) < 2:
+            return head + rest
+        # At most 3 engines: trying every permutation is cheap. Ties keep the default order.
+        # Engines without enough history (rarely reached fallbacks) stay last, in default order.
+        best = min(itertools.permutations(known), key=lambda order: expected_sec(list(order), models))
+        return head + list(best) + [e for e in rest if e not in models]
+
+    def engine_order(self, *, page_count: int, has_text: bool, is_scanned: bool, engines: list[str]) -> list[str]:
+        if not settings.routing_enabled or len(engines) < 2:
+            return list(engines)
+        key = bucket_key(page_count=page_count, has_text=has_text, is_scanned=is_scanned)
+        with self._lock:
+            overridden = bool(self._overrides.get(key) or self._overrides.get("*"))
+        if not overridden and random.random() < settings.routing_explore_rate:
+            # Now and then run the default order, so a demoted primary keeps getting samples
+            # instead of waiting for its old ones to age out of the history.
+            order = list(engines)
+            with self._lock:
+                self.routed += 1
+                self.explored += 1
+            return order
+        order = self.best_order(key, engines)
+        with self._lock:
+            self.routed += 1
+            if order != list(engines):
+                self.reordered += 1
+        return order
+
+    def set_override(self, bucket: str, order: list[str] | None) -> None:
+        if bucket != "*" and bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket {bucket!r}")
+        with self._lock:
+            if order:
+                unknown = [e for e in order if e not in ENGINES]
+                if unknown or len(set(order)) != len(order):
+                    raise ValueError(f"Invalid engine order {order!r}; engines: {', '.join(ENGINES)}")
+                self._overrides[bucket] = list(order)
+            else:
+                self._overrides.pop(bucket, None)
+
+    def table(self, engines: list[str]) -> dict:
+        with self._lock:
+            keys = sorted(k for k in self._models if k != "*")
+            overrides = {k: list(v) for k, v in self._overrides.items()}
+            info = {
+                "enabled": settings.routing_enabled,
+                "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+                "refresh_ms": self.refresh_ms,
+                "jobs_used": self.jobs_used,
+                "min_samples": settings.routing_min_samples,
+                "routed": self.routed,
+                "reordered": self.reordered,
+                "explored": self.explored,
+                "overrides": overrides,
+            }
+            models = {k: self._models[k] for k in ["*", *keys] if k in self._models}
+        buckets = {}
+        for key, per_engine in models.items():
+            order = self.best_order(key, engines)
+            with self._lock:
+                usable = self._models_for(key, engines)
+            learned = [e for e in order if e in usable]
+            buckets[key] = {
+                "engines": {e: per_engine[e].stats() for e in ENGINES},
+                "order": order,
+                "expected_sec": round(expected_sec(learned, usable), 2) if learned else None,
+            }
+        return {**info, "engines": list(engines), "buckets": buckets}
+
+
+_router = EngineRouter()
+_refresher: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def get_engine_router() -> EngineRouter:
+    return _router
+
+
+def refresh_routing() -> None:
+    """Recompute the routing table from the latest ROUTING_HISTORY_JOBS pdf-word jobs."""
+
+    from ...db.models import ConversionJob
+    from ...db.session import SessionLocal
+
+    t0 = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(
+                ConversionJob.page_count,
+                ConversionJob.has_text_layer,
+                ConversionJob.is_scanned,
+                ConversionJob.engine_attempts_json,
+            )
+            .filter(ConversionJob.tool_type == "pdf-word", ConversionJob.engine_attempts_json.isnot(None))
+            .order_by(ConversionJob.id.desc())
+            .limit(max(settings.routing_history_jobs, 1))
+            .all()
+        )
+    finally:
+        db.close()
+    _router.load([tuple(r) for r in rows])
+    _router.refresh_ms = int((time.perf_counter() - t0) * 1000)
+
+
+def _refresh_loop(interval_sec: int) -> None:
+    while True:
+        try:
+            refresh_routing()
+        except Exception:  # noqa: BLE001
+            logger.exception("Routing table refresh failed")
+        if _stop.wait(max(int(interval_sec), 10)):
+            return
+
+
+def start_routing_refresher(interval_sec: int | None = None) -> None:
+    """Load the routing table in a background thread now and then every `interval_sec` seconds."""
+
+    global _refresher
+
+    if not settings.routing_enabled:
+        return
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _stop.clear()
+    _refresher = threading.Thread(
+        target=_refresh_loop,
+        args=(interval_sec or settings.routing_refresh_sec,),
+        name="routing-refresher",
+        daemon=True,
+    )
+    _refresher.start()
+
+
+def stop_routing_refresher() -> None:
+    _stop.set()
+
+
+def tier_a_engines() -> list[str]:
+    """Default Tier A order: Adobe when configured, then Aspose.Words, then pdf2docx."""
+
+    adobe = bool(settings.adobe_client_id and settings.adobe_client_secret)
+    return (["adobe"] if adobe else []) + ["aspose", "pdf2docx"]
+
+
+def routing_table() -> dict:
+    return _router.table(tier_a_engines())
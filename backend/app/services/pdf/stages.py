@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+
+# Enough for a chunked Adobe conversion with retries; past this only a count is kept.
+_MAX_STAGES = 200
+
+
+# --- Per-job stage timings ---------------------------------------------------------------
+# Every pipeline step (classification, OCR, each engine and its Adobe phases, post-processing,
+# quality gates, fallbacks) records its start offset, duration, outcome and error into the
+# trace of the current job; the job runner stores it on the conversion_jobs row.
+# Hedges, chunk workers and the Adobe runner loop run in copies of the job's context, so
+# their stages land in the same trace.
+
+
+@dataclass
+class StageTrace:
+    started: float = field(default_factory=time.perf_counter)
+    stages: list[dict] = field(default_factory=list)
+    dropped: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, entry: dict) -> None:
+        with self._lock:
+            if len(self.stages) < _MAX_STAGES:
+                self.stages.append(entry)
+            else:
+                self.dropped += 1
+
+    def offset_ms(self, t: float) -> int:
+        return int((t - self.started) * 1000)
+
+    def stages_json(self) -> str | None:
+        with self._lock:
+            # Stages are added when they end; store them in start order.
+            stages = sorted(self.stages, key=lambda s: s["start_ms"])
+            dropped = self.dropped
+        if not stages:
+            return None
+        if dropped:
+            stages.append({"stage": "dropped", "start_ms": stages[-1]["start_ms"], "ms": 0, "outcome": "ok", "count": dropped})
+        return json.dumps(stages, ensure_ascii=False)
+
+
+_trace: contextvars.ContextVar[StageTrace | None] = contextvars.ContextVar("stage_trace", default=None)
+
+
+@contextmanager
+def track_stages() -> Iterator[StageTrace]:
+    trace = StageTrace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def stage(name: str, *, cancel: threading.Event | None = None, **detail: Any) -> Iterator[dict]:
+    """Time the block as stage `name`.
+
+    Yields the stage entry: the block may add details or set "outcome" (e.g.
+    "rejected"). An exception marks the stage failed (cancelled when `cancel` is set)
+    and is re-raised.
+    """
+
+    trace = _trace.get()
+    entry: dict = {"stage": name, **detail}
+    if trace is None:
+        yield entry
+        return
+    t0 = time.perf_counter()
+    try:
+        yield entry
+    except BaseException as e:
+        entry["outcome"] = "cancelled" if cancel is not None and cancel.is_set() else "failed"
+        entry["error"] = (str(e) or type(e).__name__)[:300]
+        raise
+    finally:
+        entry.setdefault("outcome", "ok")
+        _add(trace, entry, t0)
+
+
+def record_stage(name: str, t0: float, *, outcome: str = "ok", error: str | None = None, **detail: Any) -> None:
+    """Record a stage that started at `t0` (time.perf_counter()) and ends now."""
+
+    trace = _trace.get()
+    if trace is None:
+        return
+    entry: dict = {"stage": name, "outcome": outcome, **detail}
+    if error:
+        entry["error"] = error[:300]
+    _add(trace, entry, t0)
+
+
+def mark_stage(name: str, *, outcome: str = "ok", **detail: Any) -> None:
+    """Record an instant event (a routing decision, a fallback branch firing)."""
+
+    record_stage(name, time.perf_counter(), outcome=outcome, **detail)
+
+
+def _add(trace: StageTrace, entry: dict, t0: float) -> None:
+    entry["start_ms"] = trace.offset_ms(t0)
+    entry["ms"] = int((time.perf_counter() - t0) * 1000)
+    trace.add(entry)
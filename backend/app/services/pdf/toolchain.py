@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import dataclasses
+import importlib.util
+import logging
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from ...core.config import settings
+from ...utils.files import which
+from .ocr import build_ocr_env
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ToolchainCapabilities:
+    """Snapshot of the conversion toolchain available on this server."""
+
+    probed_at: datetime
+    probe_ms: int
+
+    soffice: str | None
+    soffice_version: str | None
+    ocrmypdf: str | None
+    ocrmypdf_version: str | None
+    ghostscript: str | None
+    tesseract: str | None
+    tesseract_version: str | None
+    tesseract_langs: frozenset[str]
+
+    pymupdf: bool
+    pdf2docx: bool
+    aspose_words: bool
+    httpx: bool
+
+    @property
+    def ocr_available(self) -> bool:
+        return bool(self.ocrmypdf and self.tesseract and self.ghostscript)
+
+
+def _module_available(name: str) -> bool:
+    # find_spec locates the module without importing it (aspose.words is very heavy).
+    try:
+        return importlib.util.find_spec(name) is not None
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def _version(cmd: list[str], env: dict[str, str] | None = None) -> str | None:
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=30, env=env)
+    except Exception:  # noqa: BLE001
+        return None
+    out = (proc.stdout or proc.stderr or "").strip()
+    return out.splitlines()[0].strip() if out else None
+
+
+def probe_toolchain() -> ToolchainCapabilities:
+    """Probe binaries, versions, Tesseract languages and engines (slow; spawns processes)."""
+
+    started = datetime.now(timezone.utc)
+
+    soffice = (
+        which("soffice.com", settings.libreoffice_path)
+        or which("soffice.exe", settings.libreoffice_path)
+        or which("soffice", settings.libreoffice_path)
+    )
+    ocrmypdf = which("ocrmypdf", settings.ocrmypdf_path)
+    # Ghostscript (gs) is required by ocrmypdf on Windows and for PDF raster ops
+    gs = which("gs") or which("gswin64c") or which("gswin32c")
+
+    # Resolve Tesseract the same way the OCR subprocesses will see it.
+    ocr_env = build_ocr_env(settings.tesseract_path)
+    tesseract = which("tesseract", settings.tesseract_path) or shutil.which("tesseract", path=ocr_env.get("PATH"))
+
+    langs: frozenset[str] = frozenset()
+    tesseract_version = None
+    if tesseract:
+        tesseract_version = _version([tesseract, "--version"], env=ocr_env)
+        try:
+            proc = subprocess.run(
+                [tesseract, "--list-langs"], capture_output=True, text=True, env=ocr_env, check=True, timeout=30
+            )
+            out = proc.stdout or proc.stderr or ""
+            # First line is a header ("List of available languages ...").
+            langs = frozenset(l.strip() for l in out.splitlines()[1:] if l.strip())
+        except Exception:  # noqa: BLE001
+            langs = frozenset()
+
+    caps = ToolchainCapabilities(
+        probed_at=started,
+        probe_ms=0,
+        soffice=soffice,
+        soffice_version=_version([soffice, "--version"]) if soffice else None,
+        ocrmypdf=ocrmypdf,
+        ocrmypdf_version=_version([ocrmypdf, "--version"]) if ocrmypdf else None,
+        ghostscript=gs,
+        tesseract=tesseract,
+        tesseract_version=tesseract_version,
+        tesseract_langs=langs,
+        pymupdf=_module_available("fitz"),
+        pdf2docx=_module_available("pdf2docx"),
+        aspose_words=_module_available("aspose.words"),
+        httpx=_module_available("httpx"),
+    )
+    elapsed = int((datetime.now(timezone.utc) - started).total_seconds() * 1000)
+    return dataclasses.replace(caps, probe_ms=elapsed)
+
+
+_lock = threading.Lock()
+# Held for the duration of a probe: one probe at a time, and callers that find nothing
+# probed yet wait for the running probe instead of spawning their own subprocesses.
+_probe_lock = threading.Lock()
+_current: ToolchainCapabilities | None = None
+_refresher: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def _probe_and_store() -> ToolchainCapabilities:
+    global _current
+
+    caps = probe_toolchain()
+    with _lock:
+        _current = caps
+    return caps
+
+
+def refresh_toolchain() -> ToolchainCapabilities:
+    with _probe_lock:
+        return _probe_and_store()
+
+
+def get_toolchain() -> ToolchainCapabilities:
+    """Current capabilities; probes synchronously (single-flight) only if nothing was probed yet."""
+
+    with _lock:
+        caps = _current
+    if caps is not None:
+        return caps
+    with _probe_lock:
+        with _lock:
+            caps = _current
+        # The startup probe (or another caller) may have finished while we waited.
+        return caps if caps is not None else _probe_and_store()
+
+
+def _refresh_loop(interval_sec: int) -> None:
+    while True:
+        try:
+            refresh_toolchain()
+        except Exception:  # noqa: BLE001
+            logger.exception("Toolchain probe failed")
+        if _stop.wait(max(int(interval_sec), 10)):
+            return
+
+
+def start_toolchain_refresher(interval_sec: int | None = None) -> None:
+    """Probe in a background thread now and then every `interval_sec` seconds."""
+
+    global _refresher
+
+    with _lock:
+        if _refresher is not None and _refresher.is_alive():
+            return
+        _stop.clear()
+        _refresher = threading.Thread(
+            target=_refresh_loop,
+            args=(interval_sec or settings.toolchain_refresh_sec,),
+            name="toolchain-refresher",
+            daemon=True,
+        )
+        _refresher.start()
+
+
+def stop_toolchain_refresher() -> None:
+    _stop.set()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from ..core.config import settings
+
+
+_lock = threading.Lock()
+_semaphore: threading.Semaphore | None = None
+_local = threading.local()
+_in_use = 0
+_waiting = 0
+
+
+def _get_semaphore() -> threading.Semaphore:
+    global _semaphore
+
+    with _lock:
+        if _semaphore is None:
+            _semaphore = threading.Semaphore(max(settings.conversion_workers, 1))
+        return _semaphore
+
+
+def _acquire() -> None:
+    global _in_use, _waiting
+
+    with _lock:
+        _waiting += 1
+    try:
+        _get_semaphore().acquire()
+    finally:
+        with _lock:
+            _waiting -= 1
+    with _lock:
+        _in_use += 1
+    _local.held = True
+
+
+def _release() -> None:
+    global _in_use
+
+    _local.held = False
+    with _lock:
+        _in_use -= 1
+    _get_semaphore().release()
+
+
+@contextmanager
+def cpu_slot() -> Iterator[None]:
+    """Hold one of CONVERSION_WORKERS slots while running local conversion work."""
+
+    if getattr(_local, "held", False):
+        yield
+        return
+    _acquire()
+    try:
+        yield
+    finally:
+        _release()
+
+
+@contextmanager
+def released_cpu_slot() -> Iterator[None]:
+    """Give the current thread's slot back while it only waits on remote work (Adobe)."""
+
+    if not getattr(_local, "held", False):
+        yield
+        return
+    _release()
+    try:
+        yield
+    finally:
+        _acquire()
+
+
+def cpu_slot_stats() -> dict:
+    with _lock:
+        return {"size": max(settings.conversion_workers, 1), "in_use": _in_use, "waiting": _waiting}
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+
+_pools: dict[str, ProcessPoolExecutor] = {}
+_lock = Lock()
+
+
+def resolve_workers(configured: int) -> int:
+    """0 (or less) means one worker per CPU core."""
+
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+def limit_address_space(max_mb: int) -> None:
+    """Process-pool initializer: cap the worker's virtual memory (RLIMIT_AS).
+
+    Allocations past the cap raise MemoryError inside the worker instead of letting
+    the OOM killer pick a victim (possibly the API process). No-op where `resource`
+    is unavailable (Windows) or when max_mb <= 0.
+    """
+
+    if max_mb <= 0:
+        return
+    try:
+        import resource
+
+        limit = int(max_mb) * 1024 * 1024
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def get_process_pool(name: str, workers: int, *, initializer=None, initargs: tuple = ()) -> ProcessPoolExecutor:
+    """Shared, lazily created process pool for CPU-bound work.
+
+    `workers` only sizes the pool when it is created: pass the configured size, not a
+    per-document count, and bound each job's in-flight tasks on the caller side. Pools
+    are shared by concurrent jobs and are never recreated while in use.
+
+    Pools use the "spawn" start method: forking a process that runs the web server's
+    threads (DB sessions, sockets, PyMuPDF handles) is not safe.
+    """
+
+    with _lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = ProcessPoolExecutor(
+                max_workers=max(int(workers), 1),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+                initargs=initargs,
+            )
+        return pool
+
+
+def discard_process_pool(name: str, pool: ProcessPoolExecutor) -> None:
+    """Drop `pool` after BrokenProcessPool; the next get creates a fresh one.
+
+    Only that pool is dropped: a replacement another job already created stays.
+    """
+
+    with _lock:
+        if _pools.get(name) is pool:
+            del _pools[name]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pools() -> None:
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)